@@ -16,13 +16,28 @@ try:
 except Exception:
     pass
 
+try:
+    from revitio.utils import RunLogger
+    LOG = RunLogger(echo=True)  # console only; the exporter keeps its own file log
+except Exception:
+    class _PrintLogger(object):
+        def _out(self, msg, *args):
+            print(msg.format(*args) if args else msg)
+        debug = info = warning = error = _out
+
+        def flush(self):
+            pass
+    LOG = _PrintLogger()
+
 try:
     from revitio.members_exporter import ExportAnalyticalModel
     from revitio.models import ExportResult
+    from revitio.batch import run_batch, read_manifest
 except Exception as _imp_err:
-    print("Warning: failed to import revitio package ({}). Exporter disabled.".format(_imp_err))
+    LOG.warning("Warning: failed to import revitio package ({}). Exporter disabled.", _imp_err)
     ExportAnalyticalModel = None
     ExportResult = None
+    run_batch = read_manifest = None
 
 try:  # optional, ignore outside Revit
     from Autodesk.Revit.DB import Document
@@ -35,9 +50,23 @@ except Exception:
     doc = None  # no doc
 
 _export_dir = os.environ.get("REVIT_ANALYTICAL_OUT")  # optional override
+_batch_manifest = os.environ.get("REVIT_ANALYTICAL_BATCH")  # optional manifest of model paths
+
+# Batch: a manifest, or several CLI models, are exported in this one session
+_batch_models = None
+if read_manifest is not None:
+    try:
+        if _batch_manifest:
+            _batch_models = read_manifest(_batch_manifest)
+            LOG.info("Batch manifest {0}: {1} models", _batch_manifest, len(_batch_models))
+        elif doc is None and '__models__' in globals() and __models__ and len(__models__) > 1:
+            _batch_models = list(__models__)
+    except Exception as _manifest_ex:
+        LOG.error("Could not read batch manifest {0}: {1}", _batch_manifest, _manifest_ex)
+        _batch_models = []
 
 # CLI model open
-if doc is None:
+if doc is None and _batch_models is None:
     try:
         from pyrevit import HOST_APP  # only available inside pyRevit
     # __models__ injected
@@ -45,45 +74,70 @@ if doc is None:
             _model_path = __models__[0]
             _uidoc = HOST_APP.uiapp.OpenAndActivateDocument(_model_path)
             doc = _uidoc.Document
-            print("Opened model: {0}".format(_model_path))
+            LOG.info("Opened model: {0}", _model_path)
     except Exception as _open_ex:
     # ignore
         pass
 
 if _export_dir:
-    print("Using export directory from REVIT_ANALYTICAL_OUT: {0}".format(_export_dir))
+    LOG.info("Using export directory from REVIT_ANALYTICAL_OUT: {0}", _export_dir)
 else:
-    print("Using default export dir (utils.ensure_output_dir)")
+    LOG.info("Using default export dir (utils.ensure_output_dir)")
 
 def run_export(active_doc):
     """Run export."""
     if ExportAnalyticalModel is None:
-        print("Exporter unavailable; skipping analytical export.")
+        LOG.warning("Exporter unavailable; skipping analytical export.")
         return None
     exporter = ExportAnalyticalModel(active_doc, output_dir=_export_dir)
     try:
-        print("Resolved export directory: {0}".format(exporter.outputDirectory))
+        LOG.info("Resolved export directory: {0}", exporter.outputDirectory)
     except Exception:
         pass
     result = exporter.export()
-    print(result)
+    LOG.debug("{}", result)
+    if getattr(exporter, "snapshot", False):
+        LOG.info("Snapshot written: {0} (build the export with python -m revitio.snapshot)", exporter.lastOutputPath)
+        return result
     try:
-        print("Export complete: {m} members, {n} nodes".format(
-            m=len(result.analytical_members), n=len(result.analytical_nodes)
-        ))
+        # streamed exports leave analytical_members empty; counts has the totals
+        LOG.info("Export complete: {0} members, {1} nodes",
+                 result.counts.members_total, len(result.analytical_nodes) or result.counts.nodes_seen)
     except Exception:
-        print("Export complete.")
+        LOG.info("Export complete.")
     return result
 
+def run_batch_export(models):
+    """Export each model in turn; one model failing does not stop the rest."""
+    try:
+        from pyrevit import HOST_APP
+        app = HOST_APP.app
+    except Exception:
+        try:
+            app = __revit__.Application
+        except Exception:
+            LOG.error("No Revit application, cannot open batch models.")
+            return None
+    batch = run_batch(app, models, output_dir=_export_dir)
+    LOG.info("{0}", batch.summary())
+    return batch
+
 # Auto-run when loaded
-if doc is not None and __name__ != "__main__":
+if _batch_models is not None and __name__ != "__main__":
+    try:
+        run_batch_export(_batch_models)
+    except Exception as _ex:
+        LOG.error("Batch export failed: {}", _ex)
+elif doc is not None and __name__ != "__main__":
     try:
         run_export(doc)
     except Exception as _ex:
-        print("Export failed:", _ex)
+        LOG.error("Export failed: {}", _ex)
 
 if __name__ == "__main__":
-    if doc is None:
-        print("No Revit document (run inside pyRevit)")
+    if _batch_models is not None:
+        run_batch_export(_batch_models)
+    elif doc is None:
+        LOG.warning("No Revit document (run inside pyRevit)")
     else:
         run_export(doc)
@@ -2,54 +2,102 @@
 import os
 import sys
 import json
+import time
 import datetime
+import collections
 
-print('[UpdateSections] script module loading... (__name__={})'.format(__name__))
+# Add lib to path
+try:
+    _this = os.path.dirname(__file__)
+    _root = _this
+    for _i in range(3):
+        _root = os.path.dirname(_root)
+    _lib = os.path.join(_root, 'lib')
+    if os.path.isdir(_lib) and _lib not in sys.path:
+        sys.path.insert(0, _lib)
+except Exception:
+    pass
+
+_REVITIO_ERROR = None  # why revitio could not be imported; run_update refuses to start
+try:
+    from revitio.utils import get_logger, ensure_output_dir as ensureOutputDirectory, eid_to_int, DEBUG
+    from revitio.symbols import symbol_index, get_type_name, get_family_name, _norm
+    from revitio.jsonstream import iter_array
+    from revitio.host_match import collect_host_candidates
+except Exception as _revitio_imp_err:
+    _REVITIO_ERROR = '{}: {}'.format(type(_revitio_imp_err).__name__, _revitio_imp_err)
+    get_logger = symbol_index = iter_array = collect_host_candidates = _norm = None
+    DEBUG = 10
+    def ensureOutputDirectory(p=None):
+        return p or os.getcwd()
+    def eid_to_int(eid):
+        for attr in ('Value', 'IntegerValue'):
+            try:
+                return int(getattr(eid, attr))
+            except Exception:
+                pass
+        return None
+
+# Buffered log beside the exports, echoed to the console.
+# Per-member lines are debug: REVIT_ANALYTICAL_LOG_LEVEL=debug to see them.
+try:
+    LOG_FILE = os.path.join(ensureOutputDirectory(), 'update_sections.log')
+except Exception:
+    LOG_FILE = None
+if get_logger is not None:
+    LOG = get_logger(LOG_FILE, echo=True, prefix='[UpdateSections] ')
+else:
+    class _PrintLogger(object):
+        def _out(self, msg, *args):
+            print('[UpdateSections] ' + (msg.format(*args) if args else msg))
+        info = warning = error = _out
+
+        def debug(self, msg, *args):
+            pass
+
+        def is_enabled(self, level):
+            return level > DEBUG
+
+        def flush(self):
+            pass
+    LOG = _PrintLogger()
+
+LOG.info('script module loading... (__name__={})', __name__)
+if _REVITIO_ERROR is not None:
+    LOG.error('Cannot import revitio from the extension lib folder ({0}); the update will not run.', _REVITIO_ERROR)
 
 # Try Revit API import
 try:
     from Autodesk.Revit.DB import (
-        Transaction, ElementId, FilteredElementCollector, BuiltInCategory, Document,
+        Transaction, TransactionGroup, ElementId, FilteredElementCollector, BuiltInCategory, Document,
         SynchronizeWithCentralOptions, TransactWithCentralOptions, RelinquishOptions, SaveAsOptions,
         BuiltInParameter, Element
     )
 except Exception as _revit_imp_err:
-    Transaction = ElementId = FilteredElementCollector = BuiltInCategory = Document = None
+    Transaction = TransactionGroup = ElementId = FilteredElementCollector = BuiltInCategory = Document = None
     SynchronizeWithCentralOptions = TransactWithCentralOptions = RelinquishOptions = SaveAsOptions = None
     BuiltInParameter = Element = None
-    print("[UpdateSections] Warning: Revit API not available ({}).".format(_revit_imp_err))
+    LOG.warning("Warning: Revit API not available ({}).", _revit_imp_err)
 
 _DEFAULT_INPUT_PATH = os.path.normpath(
     os.path.join(os.path.expanduser('~'), 'Documents', 'revit_analytical_exports', 'Input', 'updated_sections.json')
 )
 # Can override with REVIT_ANALYTICAL_UPDATE_JSON
 INPUT_PATH = os.environ.get("REVIT_ANALYTICAL_UPDATE_JSON", _DEFAULT_INPUT_PATH)
-print('[UpdateSections] Using INPUT_PATH={0}'.format(INPUT_PATH))
-print('[UpdateSections] Env REVIT_ANALYTICAL_AUTO_SAVE={0}'.format(os.environ.get('REVIT_ANALYTICAL_AUTO_SAVE')))
-print('[UpdateSections] Env REVIT_ANALYTICAL_AUTO_SYNC={0}'.format(os.environ.get('REVIT_ANALYTICAL_AUTO_SYNC')))
-print('[UpdateSections] Env REVIT_ANALYTICAL_SAVE_PROMPT={0}'.format(os.environ.get('REVIT_ANALYTICAL_SAVE_PROMPT')))
-print('[UpdateSections] Env REVIT_ANALYTICAL_CLI_SAVE={0}'.format(os.environ.get('REVIT_ANALYTICAL_CLI_SAVE')))
-print('[UpdateSections] Env REVIT_ANALYTICAL_SAVEAS_PATH={0}'.format(os.environ.get('REVIT_ANALYTICAL_SAVEAS_PATH')))
-
-# Add lib to path
-try:
-    _this = os.path.dirname(__file__)
-    _root = _this
-    for _i in range(3):
-        _root = os.path.dirname(_root)
-    _lib = os.path.join(_root, 'lib')
-    if os.path.isdir(_lib) and _lib not in sys.path:
-        sys.path.insert(0, _lib)
-except Exception:
-    pass
-
+LOG.info('Using INPUT_PATH={0}', INPUT_PATH)
+LOG.info('Env REVIT_ANALYTICAL_AUTO_SAVE={0}', os.environ.get('REVIT_ANALYTICAL_AUTO_SAVE'))
+LOG.info('Env REVIT_ANALYTICAL_AUTO_SYNC={0}', os.environ.get('REVIT_ANALYTICAL_AUTO_SYNC'))
+LOG.info('Env REVIT_ANALYTICAL_SAVE_PROMPT={0}', os.environ.get('REVIT_ANALYTICAL_SAVE_PROMPT'))
+LOG.info('Env REVIT_ANALYTICAL_CLI_SAVE={0}', os.environ.get('REVIT_ANALYTICAL_CLI_SAVE'))
+LOG.info('Env REVIT_ANALYTICAL_SAVEAS_PATH={0}', os.environ.get('REVIT_ANALYTICAL_SAVEAS_PATH'))
+# Per-member lines go to the console (info) instead of debug when set
+VERBOSE = (os.environ.get('REVIT_ANALYTICAL_UPDATE_VERBOSE') or '').strip().lower() not in ('', '0', 'false', 'no')
+# Records per Transaction inside one TransactionGroup; 0 keeps a single Transaction
 try:
-    from revitio.utils import log_msg as logMessage, ensure_output_dir as ensureOutputDirectory
-except Exception:
-    def logMessage(msg, log_file=None):
-        print(msg)
-    def ensureOutputDirectory(p=None):
-        return p or os.getcwd()
+    CHUNK_SIZE = max(0, int(os.environ.get('REVIT_ANALYTICAL_CHUNK_SIZE') or 0))
+except ValueError:
+    CHUNK_SIZE = 0
+LOG.info('Env REVIT_ANALYTICAL_CHUNK_SIZE={0}', CHUNK_SIZE)
 
 # Acquire active document if possible
 try:
@@ -69,7 +117,7 @@ if doc is None:
             _model_path = globals()['__models__'][0]
             _uidoc = HOST_APP.uiapp.OpenAndActivateDocument(_model_path)
             doc = _uidoc.Document
-            print('[UpdateSections] Opened model: {0}'.format(_model_path))
+            LOG.info('Opened model: {0}', _model_path)
     except Exception:
         pass
 
@@ -79,111 +127,34 @@ if doc is None:
         from pyrevit import revit
         if getattr(revit, 'doc', None):
             doc = revit.doc
-            print('[UpdateSections] Fallback acquired revit.doc')
+            LOG.info('Fallback acquired revit.doc')
     except Exception:
         pass
 
-print('[UpdateSections] doc acquired? {0}'.format('YES' if doc else 'NO'))
-
-LOG_FILE = None
-
-# ----------------------------
-# Robust name helpers for IronPython
-# ----------------------------
-
-def _norm(s):
-    """Trim and ensure plain str."""
-    try:
-        if s is None:
-            return ""
-        return s.strip()
-    except Exception:
-        return s or ""
-
-def get_type_name(sym):
-    """Return the FamilySymbol type name, robust under IronPython."""
-    # 1, Built in parameter is reliable in IronPython
-    try:
-        if BuiltInParameter is not None:
-            p = sym.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM)
-            if p:
-                v = p.AsString()
-                if v:
-                    return _norm(v)
-    except Exception:
-        pass
-    # 2, Static getter avoids IronPython name binding quirks
-    try:
-        if Element is not None:
-            return _norm(Element.Name.__get__(sym))
-    except Exception:
-        pass
-    # 3, Direct attribute last
-    try:
-        return _norm(sym.Name)
-    except Exception:
-        return ""
-
-def get_family_name(sym):
-    """Return the Family name for a symbol, robust under IronPython."""
-    # 1, Try parameter if available on the symbol
-    try:
-        if BuiltInParameter is not None:
-            # Not all versions expose SYMBOL_FAMILY_NAME_PARAM, guard it
-            p = sym.get_Parameter(getattr(BuiltInParameter, 'SYMBOL_FAMILY_NAME_PARAM', None))
-            if p:
-                v = p.AsString()
-                if v:
-                    return _norm(v)
-    except Exception:
-        pass
-    # 2, Use the Family object
-    try:
-        fam = getattr(sym, 'Family', None)
-        if fam is not None:
-            try:
-                if Element is not None:
-                    return _norm(Element.Name.__get__(fam))
-            except Exception:
-                pass
-            try:
-                return _norm(fam.Name)
-            except Exception:
-                pass
-    except Exception:
-        pass
-    return ""
+LOG.info('doc acquired? {0}', 'YES' if doc else 'NO')
 
 # ----------------------------
 # Core helpers
 # ----------------------------
 
-def _index_symbols_by_names(revit_doc):
-    """Map (family_name, type_name) to symbol, using robust name access."""
-    idx = {}
-    try:
-        fam_syms = (FilteredElementCollector(revit_doc)
-                    .OfCategory(BuiltInCategory.OST_StructuralFraming)
-                    .WhereElementIsElementType()
-                    .ToElements())
-        for s in fam_syms:
-            try:
-                fam_name = get_family_name(s)
-                tname = get_type_name(s)
-                if fam_name and tname:
-                    idx[(fam_name, tname)] = s
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return idx
+def _index_symbols(revit_doc):
+    """Session-cached framing SymbolIndex (see revitio.symbols)."""
+    index, cached = symbol_index(revit_doc)
+    LOG.info('{0} framing symbol index ({1} types)', 'Reusing cached' if cached else 'Built', len(index))
+    return index
+
+# The only member fields the updater reads; the rest is skipped unparsed
+_INPUT_FIELDS = ('id', 'host_id', 'host_unique_id', 'section')
 
-def _load_json(path):
+def _iter_input_records(path, stats):
+    """Stream analytical_members from the input file one record at a time."""
     with open(path, 'r') as fp:
-        return json.load(fp)
+        for rec in iter_array(fp, 'analytical_members', fields=_INPUT_FIELDS):
+            stats['records'] += 1
+            yield rec
 
-def _iter_modified_members(data):
-    for rec in data.get('analytical_members', []):
+def _iter_modified_members(records):
+    for rec in records:
         section = rec.get('section') or {}
         host_id = rec.get('host_id')
         host_uid = rec.get('host_unique_id')
@@ -212,6 +183,47 @@ def _resolve_host(doc, host_id, host_uid):
             e = None
     return e
 
+class _HostMap(object):
+    """Framing and column instances by unique id and int id, collected once.
+
+    Records are resolved from the maps; only references the maps do not
+    hold (other categories, elements added since) go to doc.GetElement.
+    """
+
+    def __init__(self, revit_doc):
+        self.doc = revit_doc
+        self.by_uid = {}
+        self.by_id = {}
+        self.stats = {'map': 0, 'fallback': 0, 'unresolved': 0}
+        try:
+            hosts = collect_host_candidates(revit_doc)
+        except Exception as ex:
+            LOG.warning('Host collection failed, resolving hosts one by one: {0}', ex)
+            hosts = []
+        for e in hosts:
+            try:
+                self.by_id[eid_to_int(e.Id)] = e
+                self.by_uid[e.UniqueId] = e
+            except Exception:
+                continue
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def resolve(self, host_id, host_uid):
+        e = self.by_uid.get(host_uid) if host_uid else None
+        if e is None and host_id is not None:
+            try:
+                e = self.by_id.get(int(host_id))
+            except (TypeError, ValueError):
+                e = None
+        if e is not None:
+            self.stats['map'] += 1
+            return e
+        e = _resolve_host(self.doc, host_id, host_uid)
+        self.stats['fallback' if e is not None else 'unresolved'] += 1
+        return e
+
 def _change_type_if_needed(doc, inst, new_symbol):
     try:
         if inst is None or new_symbol is None:
@@ -231,82 +243,135 @@ def _change_type_if_needed(doc, inst, new_symbol):
     except Exception:
         return False
 
-# ----------------------------
-# Main routine
-# ----------------------------
-
-def run_update():
-    print('[UpdateSections] Starting update routine.')
-    if doc is None:
-        print('[UpdateSections] No active Revit document. Aborting.')
-        return
-    if Transaction is None:
-        print('[UpdateSections] Revit API unavailable, cannot proceed.')
-        return
-    if not os.path.isfile(INPUT_PATH):
-        print('[UpdateSections] Input JSON not found: {0}'.format(INPUT_PATH))
-        return
-
-    print('[UpdateSections] Loading JSON: {0}'.format(INPUT_PATH))
-    data = _load_json(INPUT_PATH)
-    members = data.get('analytical_members', [])
-    print('[UpdateSections] Loaded {0} analytical member records'.format(len(members)))
-
-    sym_index = _index_symbols_by_names(doc)
-    print('[UpdateSections] Indexed {0} framing symbols'.format(len(sym_index)))
-
-    changes = 0
-    total_checked = 0
-    skipped_missing_symbol = 0
-    skipped_no_host = 0
-    unchanged = 0
-
-    t = Transaction(doc, 'Update Host Section Types')
-    t.Start()
-    try:
-        for mid, host_id, host_uid, fam_name, type_name, type_id in _iter_modified_members(data):
-            total_checked += 1
-            if not fam_name or not type_name:
-                print('[UpdateSections] member {0}: missing target family or type, skipping'.format(mid))
-                continue
-
-            sym = sym_index.get((fam_name, type_name))
-            if sym is None:
-                skipped_missing_symbol += 1
-                print('[UpdateSections] member {0}: target symbol not found ({1} :: {2})'.format(mid, fam_name, type_name))
-                continue  # unknown symbol name combination
+def _member_line(msg, *args):
+    if VERBOSE:
+        LOG.info(msg, *args)
+    else:
+        LOG.debug(msg, *args)
+
+def _record_key(mid, host_id, host_uid):
+    """Checkpoint key: member id, else the host reference."""
+    if mid is not None:
+        return str(mid)
+    return 'host:' + str(host_uid or host_id)
+
+def _plan_updates(doc, records, sym_index, counts, completed=None, lookups=None, hosts=None):
+    """Resolve records to (key, mid, host, symbol) and drop those already on the target type.
+
+    Records whose key is in completed (checkpoint) and that are on the
+    target type count as resumed; a checkpointed record the document does
+    not reflect (e.g. Revit restarted without saving) is planned again.
+    No transaction is needed; counts is updated in place. Hosts come from
+    the _HostMap when given, else one GetElement per record.
+    """
+    planned = collections.OrderedDict()  # host id -> (key, mid, host, symbol), last record wins
+    lookups = {} if lookups is None else lookups  # how each symbol was found
+    describe = VERBOSE or LOG.is_enabled(DEBUG)
+    for mid, host_id, host_uid, fam_name, type_name, type_id in _iter_modified_members(records):
+        counts['processed'] += 1
+        key = _record_key(mid, host_id, host_uid)
+        if type_id is None and (not fam_name or not type_name):
+            LOG.warning('member {0}: missing target family or type, skipping', mid)
+            continue
 
+        sym, how = sym_index.lookup(fam_name, type_name, type_id)
+        if sym is None:
+            counts['missing_symbol'] += 1
+            near = sym_index.suggest(fam_name, type_name)
+            LOG.warning('member {0}: target symbol not found ({1} :: {2}, type_id={3}){4}', mid, fam_name, type_name,
+                type_id, ('; did you mean ' + ' | '.join(near)) if near else '')
+            continue  # unknown symbol name combination
+        lookups[how] = lookups.get(how, 0) + 1
+
+        if hosts is not None:
+            host_elem = hosts.resolve(host_id, host_uid)
+        else:
             host_elem = _resolve_host(doc, host_id, host_uid)
-            if host_elem is None:
-                skipped_no_host += 1
-                print('[UpdateSections] member {0}: host element not resolved (host_id={1} host_uid={2})'.format(mid, host_id, host_uid))
-                continue
+        if host_elem is None:
+            counts['no_host'] += 1
+            LOG.warning('member {0}: host element not resolved (host_id={1} host_uid={2})', mid, host_id, host_uid)
+            continue
 
-            # Determine current type names using robust getters
+        host_key = eid_to_int(host_elem.Id)
+        cur_tid = eid_to_int(host_elem.GetTypeId())
+        if describe:
+            # Current type names only cost API calls when they are printed
             try:
                 cur_type_elem = doc.GetElement(host_elem.GetTypeId())
                 cur_tname = get_type_name(cur_type_elem)
-                cur_fname = ""
-                try:
-                    # cur_type_elem is a symbol as well
-                    cur_fname = get_family_name(cur_type_elem)
-                except Exception:
-                    cur_fname = ""
+                cur_fname = get_family_name(cur_type_elem)
             except Exception:
                 cur_tname = cur_fname = ""
+            _member_line('member {0}: host resolved id={1} current=({2} :: {3}) target=({4} :: {5})',
+                mid, host_key, cur_fname, cur_tname, fam_name, type_name)
+
+        if cur_tid is not None and cur_tid == eid_to_int(sym.Id):
+            if planned.pop(host_key, None) is not None:
+                counts['unchanged'] += 1  # earlier record for this host is undone
+            if completed and key in completed:
+                counts['resumed'] += 1
+            else:
+                counts['unchanged'] += 1
+            _member_line('member {0}: type unchanged', mid)
+            continue
+        if completed and key in completed:
+            LOG.warning('member {0}: checkpointed but not applied in this document, reapplying', mid)
+        if host_key in planned:
+            counts['unchanged'] += 1  # superseded by this record
+        planned[host_key] = (key, mid, host_elem, sym)
+    return list(planned.values())
+
+def _input_signature(path):
+    try:
+        st = os.stat(path)
+        return [st.st_size, int(st.st_mtime)]
+    except Exception:
+        return None
 
-            print('[UpdateSections] member {0}: host resolved id={1} current=({2} :: {3}) target=({4} :: {5})'.format(
-                mid,
-                host_elem.Id.IntegerValue if hasattr(host_elem.Id, 'IntegerValue') else host_elem.Id,
-                cur_fname, cur_tname, fam_name, type_name
-            ))
-
+def _load_checkpoint(path, signature):
+    """Completed record keys from a checkpoint written for this same input file."""
+    if not os.path.isfile(path):
+        return set()
+    try:
+        with open(path, 'r') as fp:
+            cp = json.load(fp)
+    except Exception as _cp_ex:
+        LOG.warning('Ignoring unreadable checkpoint {0}: {1}', path, _cp_ex)
+        return set()
+    if cp.get('input_signature') != signature:
+        LOG.warning('Checkpoint {0} is for a different input file, ignoring it.', path)
+        return set()
+    return set(cp.get('completed') or [])
+
+def _write_checkpoint(path, signature, completed, chunks):
+    try:
+        with open(path, 'w') as fp:
+            json.dump({
+                'input_path': INPUT_PATH,
+                'input_signature': signature,
+                'updated_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'completed': sorted(completed),
+                'chunks': chunks,
+            }, fp)
+    except Exception as _cp_ex:
+        LOG.warning('Could not write checkpoint {0}: {1}', path, _cp_ex)
+
+def _apply_chunk(doc, chunk, counts, name):
+    """Apply one list of plan entries inside its own Transaction.
+
+    A rolled back chunk takes its changed/failed counts back with it.
+    """
+    before = (counts['changed'], counts['failed'])
+    t = Transaction(doc, name)
+    t.Start()
+    try:
+        for key, mid, host_elem, sym in chunk:
             if _change_type_if_needed(doc, host_elem, sym):
-                changes += 1
-                print('[UpdateSections] member {0}: type CHANGED'.format(mid))
+                counts['changed'] += 1
+                _member_line('member {0}: type CHANGED', mid)
             else:
-                unchanged += 1
-                print('[UpdateSections] member {0}: type unchanged'.format(mid))
+                counts['failed'] += 1
+                LOG.warning('member {0}: type change failed', mid)
 
         t.Commit()
     except Exception as _tx_ex:
@@ -314,11 +379,152 @@ def run_update():
             t.RollBack()
         except Exception:
             pass
-        print('[UpdateSections] ERROR inside transaction:', _tx_ex)
+        counts['changed'], counts['failed'] = before
+        LOG.error('ERROR inside transaction: {}', _tx_ex)
         raise
 
-    print('[UpdateSections] Summary: processed={0} changed={1} unchanged={2} missing_symbol={3} no_host={4}'.format(
-        total_checked, changes, unchanged, skipped_missing_symbol, skipped_no_host))
+def _apply_chunked(doc, plan, counts, chunk_size, checkpoint_path, signature, completed, chunks=None):
+    """Apply plan in chunks inside a TransactionGroup, checkpointing after each.
+
+    On failure the chunks already committed are kept (group assimilated)
+    and the checkpoint lets the next run resume after them. Returns the
+    per-chunk timing list; pass chunks to have it filled as chunks
+    finish, so the caller still has them when a chunk raises.
+    """
+    if chunks is None:
+        chunks = []
+    tg = TransactionGroup(doc, 'Update Host Section Types')
+    tg.Start()
+    try:
+        for start in range(0, len(plan), chunk_size):
+            chunk = plan[start:start + chunk_size]
+            index = len(chunks)
+            changed_before = counts['changed']
+            _t0 = time.time()
+            _apply_chunk(doc, chunk, counts, 'Update Host Section Types ({0})'.format(index + 1))
+            chunks.append({
+                'index': index,
+                'records': len(chunk),
+                'changed': counts['changed'] - changed_before,
+                'seconds': time.time() - _t0,
+            })
+            completed.update(entry[0] for entry in chunk)
+            _write_checkpoint(checkpoint_path, signature, completed, chunks)
+            LOG.info('Chunk {0}: {1} records in {2:.2f}s', index + 1, len(chunk), chunks[-1]['seconds'])
+        tg.Assimilate()
+    except Exception:
+        try:
+            tg.Assimilate()
+            LOG.error('Kept {0} completed chunks; rerun resumes from {1}', len(chunks), checkpoint_path)
+        except Exception:
+            pass
+        raise
+    return chunks
+
+def _write_status(counts, lookups, hosts, durations, **fields):
+    """Write <input>.update_status.json; fields add to or override the defaults."""
+    try:
+        status_path = INPUT_PATH + '.update_status.json'
+        status_payload = {
+            'input_path': INPUT_PATH,
+            'updated_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'model_title': getattr(doc, 'Title', None),
+            'counts': counts,
+            'symbol_lookup': lookups,
+            'host_resolution': hosts.stats,
+            'durations': durations,
+            'auto_save': True,
+            'auto_sync': False,
+            'cli_mode': '__revit__' not in globals(),
+            'saved': False,
+            'synced': False,
+            'saveas_path': None,
+            'success': True
+        }
+        status_payload.update(fields)
+        with open(status_path, 'w') as sf:
+            json.dump(status_payload, sf, indent=2)
+        LOG.info('Wrote status JSON: {0}', status_path)
+    except Exception as _status_ex:
+        LOG.error('Failed to write status JSON: {}', _status_ex)
+
+# ----------------------------
+# Main routine
+# ----------------------------
+
+def run_update():
+    LOG.info('Starting update routine.')
+    if doc is None:
+        LOG.error('No active Revit document. Aborting.')
+        return
+    if Transaction is None:
+        LOG.error('Revit API unavailable, cannot proceed.')
+        return
+    if _REVITIO_ERROR is not None:
+        LOG.error('revitio could not be imported ({0}); check the extension lib folder. Aborting.', _REVITIO_ERROR)
+        return
+    if not os.path.isfile(INPUT_PATH):
+        LOG.error('Input JSON not found: {0}', INPUT_PATH)
+        return
+
+    _t0 = time.time()
+    sym_index = _index_symbols(doc)
+    durations = {'symbol_index_s': time.time() - _t0}
+    _t0 = time.time()
+    hosts = _HostMap(doc)
+    durations['host_map_s'] = time.time() - _t0
+    LOG.info('Mapped {0} framing/column hosts in {1:.2f}s', len(hosts), durations['host_map_s'])
+
+    counts = {'processed': 0, 'changed': 0, 'unchanged': 0, 'missing_symbol': 0, 'no_host': 0, 'failed': 0,
+              'resumed': 0}
+    lookups = {}
+    checkpoint_path = INPUT_PATH + '.checkpoint.json'
+    signature = _input_signature(INPUT_PATH)
+    completed = _load_checkpoint(checkpoint_path, signature) if CHUNK_SIZE else set()
+    if completed:
+        LOG.info('Resuming: {0} records already completed per {1}', len(completed), checkpoint_path)
+    LOG.info('Streaming JSON: {0}', INPUT_PATH)
+    stats = {'records': 0}
+    _t0 = time.time()
+    plan = _plan_updates(doc, _iter_input_records(INPUT_PATH, stats), sym_index, counts, completed, lookups, hosts)
+    durations['plan_s'] = time.time() - _t0
+    LOG.info('Read {0} analytical member records', stats['records'])
+    LOG.info('Hosts resolved: {0} from map, {1} by fallback lookup, {2} unresolved',
+        hosts.stats['map'], hosts.stats['fallback'], hosts.stats['unresolved'])
+    LOG.info('Planned {0} type changes ({1} records unchanged) in {2:.2f}s',
+        len(plan), counts['unchanged'], durations['plan_s'])
+
+    if plan:
+        _t0 = time.time()
+        chunked = CHUNK_SIZE and TransactionGroup is not None
+        try:
+            if chunked:
+                durations['chunks'] = []
+                _apply_chunked(
+                    doc, plan, counts, CHUNK_SIZE, checkpoint_path, signature, completed, durations['chunks']
+                )
+            else:
+                _apply_chunk(doc, plan, counts, 'Update Host Section Types')
+        except Exception as _apply_ex:
+            # keep the counts and finished chunks of the failed run; nothing is saved
+            durations['apply_s'] = time.time() - _t0
+            _write_status(counts, lookups, hosts, durations, success=False, error=str(_apply_ex),
+                          checkpoint_path=checkpoint_path if chunked else None)
+            raise
+        durations['apply_s'] = time.time() - _t0
+    else:
+        LOG.info('Nothing to change, transaction skipped.')
+    if CHUNK_SIZE and os.path.isfile(checkpoint_path):
+        try:
+            os.remove(checkpoint_path)  # finished; next run starts fresh
+        except Exception:
+            pass
+
+    # resumed records were changed by an earlier run that did not get to save
+    changes = counts['changed'] + counts['resumed']
+    LOG.info('Summary: processed={0} changed={1} unchanged={2} missing_symbol={3} no_host={4} failed={5} resumed={6}',
+        counts['processed'], counts['changed'], counts['unchanged'], counts['missing_symbol'], counts['no_host'],
+        counts['failed'], counts['resumed'])
 
     # Save changes and timestamp copy
     _saved = False
@@ -337,14 +543,14 @@ def run_update():
             if not os.path.isdir(p):
                 os.makedirs(p)
         except Exception as _mk_ex:
-            print('[UpdateSections] Could not ensure directory {0}: {1}'.format(p, _mk_ex))
+            LOG.warning('Could not ensure directory {0}: {1}', p, _mk_ex)
 
     try:
         if changes > 0:
             # If workshared do sync first
             if getattr(doc, 'IsWorkshared', False) and _do_sync and SynchronizeWithCentralOptions and TransactWithCentralOptions:
                 try:
-                    print('[UpdateSections] Attempting SynchronizeWithCentral (pre SaveAs).')
+                    LOG.info('Attempting SynchronizeWithCentral (pre SaveAs).')
                     swc_opts = SynchronizeWithCentralOptions()
                     try:
                         rel_opts = RelinquishOptions(True)
@@ -354,9 +560,9 @@ def run_update():
                     twc_opts = TransactWithCentralOptions()
                     doc.SynchronizeWithCentral(twc_opts, swc_opts)
                     _synced = True
-                    print('[UpdateSections] SynchronizeWithCentral complete.')
+                    LOG.info('SynchronizeWithCentral complete.')
                 except Exception as _sync_ex:
-                    print('[UpdateSections] Sync failed, will still attempt SaveAs:', _sync_ex)
+                    LOG.warning('Sync failed, will still attempt SaveAs: {}', _sync_ex)
 
             # Timestamped SaveAs
             if _force_saveas and SaveAsOptions:
@@ -379,7 +585,7 @@ def run_update():
                     new_filename = '{}_{}.rvt'.format(base_name, ts)
                     _safe_make_dir(_base_save_folder)
                     candidate = os.path.join(_base_save_folder, new_filename)
-                    print('[UpdateSections] Saving timestamped copy: {0}'.format(candidate))
+                    LOG.info('Saving timestamped copy: {0}', candidate)
                     sao = SaveAsOptions()
                     try:
                         sao.OverwriteExistingFile = True
@@ -388,58 +594,34 @@ def run_update():
                     doc.SaveAs(candidate, sao)
                     _saveas_path = candidate
                     _saved = True
-                    print('[UpdateSections] Timestamped SaveAs complete.')
+                    LOG.info('Timestamped SaveAs complete.')
                 except Exception as _saveas_ex:
-                    print('[UpdateSections] Timestamped SaveAs failed:', _saveas_ex)
+                    LOG.warning('Timestamped SaveAs failed: {}', _saveas_ex)
                     # Try plain Save
                     if not _saved:
                         try:
-                            print('[UpdateSections] Attempting fallback Save().')
+                            LOG.info('Attempting fallback Save().')
                             doc.Save()
                             _saved = True
-                            print('[UpdateSections] Fallback Save() succeeded.')
+                            LOG.info('Fallback Save() succeeded.')
                         except Exception as _sv2_ex:
-                            print('[UpdateSections] Fallback Save() failed:', _sv2_ex)
+                            LOG.error('Fallback Save() failed: {}', _sv2_ex)
             elif not _force_saveas:
                 # Direct save
                 try:
-                    print('[UpdateSections] Direct Save (no SaveAs).')
+                    LOG.info('Direct Save (no SaveAs).')
                     doc.Save()
                     _saved = True
                 except Exception as _ds_ex:
-                    print('[UpdateSections] Direct Save failed:', _ds_ex)
+                    LOG.error('Direct Save failed: {}', _ds_ex)
         else:
-            print('[UpdateSections] No changes, no save attempt.')
+            LOG.info('No changes, no save attempt.')
     except Exception as _persist_ex:
-        print('[UpdateSections] Persistence step error:', _persist_ex)
+        LOG.error('Persistence step error: {}', _persist_ex)
 
     # Write status JSON
-    try:
-        status_path = INPUT_PATH + '.update_status.json'
-        status_payload = {
-            'input_path': INPUT_PATH,
-            'updated_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'model_title': getattr(doc, 'Title', None),
-            'counts': {
-                'processed': total_checked,
-                'changed': changes,
-                'unchanged': unchanged,
-                'missing_symbol': skipped_missing_symbol,
-                'no_host': skipped_no_host
-            },
-            'auto_save': True,
-            'auto_sync': _synced,
-            'cli_mode': _cli_mode,
-            'saved': _saved,
-            'synced': _synced,
-            'saveas_path': _saveas_path,
-            'success': True
-        }
-        with open(status_path, 'w') as sf:
-            json.dump(status_payload, sf, indent=2)
-        print('[UpdateSections] Wrote status JSON: {0}'.format(status_path))
-    except Exception as _status_ex:
-        print('[UpdateSections] Failed to write status JSON:', _status_ex)
+    _write_status(counts, lookups, hosts, durations, auto_sync=_synced, cli_mode=_cli_mode, saved=_saved,
+                  synced=_synced, saveas_path=_saveas_path)
 
 _UPDATE_RAN = False
 
@@ -448,14 +630,20 @@ def _maybe_autorun():
     if _UPDATE_RAN:
         return
     if doc is None:
-        print('[UpdateSections] Skipping autorun, doc is None.')
+        LOG.info('Skipping autorun, doc is None.')
         return
-    print('[UpdateSections] Autorun trigger (__name__={}).'.format(__name__))
+    LOG.info('Autorun trigger (__name__={}).', __name__)
     try:
         run_update()
         _UPDATE_RAN = True
     except Exception as _ex:
-        print('[UpdateSections] ERROR during autorun:', _ex)
+        LOG.error('ERROR during autorun: {}', _ex)
+        try:
+            LOG.info('Recent debug lines written to {}', LOG.dump_debug())
+        except Exception:
+            pass
+    finally:
+        LOG.flush()
 
 # Run when imported
 if ('__revit__' in globals()) or (__name__ != '__main__'):
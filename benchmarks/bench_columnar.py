@@ -0,0 +1,159 @@
+"""Size and load time of the columnar (.rvcol) export against JSON.
+
+Builds a synthetic frame ExportResult (no Revit needed), writes it as the
+exporter does (indent=2 JSON, compact JSON, .rvcol) and times loading.
+
+    python benchmarks/bench_columnar.py --members 100000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+_LIB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+if _LIB not in sys.path:
+    sys.path.insert(0, _LIB)
+
+from revitio.models import (  # noqa: E402
+    Node, LineGeom, SectionInfo, SectionProperties, MaterialRef, MaterialInfo,
+    ReleaseCondition, Releases, LocalAxes, MemberRecord, ExportCounts, ExportResult
+)
+from revitio.columnar import write_columnar, read_columns, load_columnar  # noqa: E402
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def synthetic_result(members):
+    """Square grid of columns and beams, roughly `members` long."""
+    bay = 6.0
+    story = 3.5
+    # members ~= stories * (n*n columns + 2*n*(n-1) beams)
+    n = 10
+    per_story = n * n + 2 * n * (n - 1)
+    stories = max(1, members // per_story)
+    nodes = []
+    ids = {}
+    for k in range(stories + 1):
+        for i in range(n):
+            for j in range(n):
+                nid = 100000 + len(nodes)
+                ids[(i, j, k)] = nid
+                nodes.append(Node(nid, "node-{}".format(nid), [i * bay, j * bay, k * story]))
+    sections = [
+        (SectionInfo(900 + s, "W{}x{}".format(12 + 2 * s, 20 + 5 * s), "W Shapes", "IWideFlange"),
+         SectionProperties({"STRUCTURAL_SECTION_AREA": 0.005 + s * 1e-3, "STRUCTURAL_SECTION_COMMON_HEIGHT": 0.3 + s * 0.02}))
+        for s in range(12)
+    ]
+    steel = MaterialRef(501, "Steel ASTM A992")
+    material = MaterialInfo(primary=steel, all_list=[steel])
+    axes = LocalAxes([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])
+    pinned = Releases(ReleaseCondition(False, False, False, False, True, True),
+                      ReleaseCondition(False, False, False, False, True, True))
+
+    pos = dict((n_.id, n_.position) for n_ in nodes)
+    out = []
+
+    def add(a, b, role, sec):
+        mid = 500000 + len(out)
+        pa, pb = pos[a], pos[b]
+        out.append(MemberRecord(
+            id=mid, unique_id="member-{}".format(mid), node_i=a, node_j=b,
+            line=LineGeom(pa, pb), units="meters", status="ok", material=material,
+            section=sections[sec][0], section_properties=sections[sec][1],
+            releases=pinned if role == "Beam" else None, local_axes=axes,
+            structural_role=role, cross_section_rotation_rad=0.0,
+            host_id=mid + 1000000, host_unique_id="host-{}".format(mid),
+        ))
+
+    for k in range(stories):
+        for i in range(n):
+            for j in range(n):
+                add(ids[(i, j, k)], ids[(i, j, k + 1)], "Column", k % 4)
+                if i + 1 < n:
+                    add(ids[(i, j, k + 1)], ids[(i + 1, j, k + 1)], "Beam", 4 + k % 8)
+                if j + 1 < n:
+                    add(ids[(i, j, k + 1)], ids[(i, j + 1, k + 1)], "Beam", 4 + k % 8)
+    return ExportResult("synthetic", "2026-01-01 00:00:00", "meters", 0.015,
+                        ExportCounts(len(out), len(nodes)), nodes, out)
+
+
+def _timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = _clock()
+        fn()
+        dt = _clock() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def run(members, repeat=3, folder=None):
+    folder = folder or tempfile.mkdtemp(prefix="rvcol_bench_")
+    result = synthetic_result(members)
+    paths = {
+        "json": os.path.join(folder, "bench.json"),
+        "json_compact": os.path.join(folder, "bench.compact.json"),
+        "rvcol": os.path.join(folder, "bench.rvcol"),
+    }
+
+    def write_json():
+        with open(paths["json"], "w") as fp:
+            json.dump(result.to_dict(), fp, indent=2)
+
+    def write_compact():
+        with open(paths["json_compact"], "w") as fp:
+            json.dump(result.to_dict(), fp, separators=(",", ":"))
+
+    def load_json(path):
+        with open(path) as fp:
+            return json.load(fp)
+
+    report = {"members": len(result.analytical_members), "nodes": len(result.analytical_nodes), "formats": {}}
+    report["formats"]["json"] = {
+        "write_s": _timed(write_json, repeat),
+        "load_s": _timed(lambda: load_json(paths["json"]), repeat),
+    }
+    report["formats"]["json_compact"] = {
+        "write_s": _timed(write_compact, repeat),
+        "load_s": _timed(lambda: load_json(paths["json_compact"]), repeat),
+    }
+    report["formats"]["rvcol"] = {
+        "write_s": _timed(lambda: write_columnar(result, paths["rvcol"]), repeat),
+        "load_s": _timed(lambda: read_columns(paths["rvcol"]), repeat),
+        "load_result_s": _timed(lambda: load_columnar(paths["rvcol"]), repeat),
+    }
+    try:
+        import numpy  # noqa: F401
+        report["formats"]["rvcol"]["load_numpy_s"] = _timed(lambda: read_columns(paths["rvcol"], use_numpy=True), repeat)
+    except ImportError:
+        pass
+    for name, path in paths.items():
+        report["formats"][name]["bytes"] = os.path.getsize(path)
+    if load_columnar(paths["rvcol"]).to_dict() != result.to_dict():
+        raise AssertionError("columnar round trip differs from source result")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write the report JSON here")
+    args = parser.parse_args(argv)
+    report = run(args.members, args.repeat)
+    base = report["formats"]["json"]
+    print("{} members, {} nodes".format(report["members"], report["nodes"]))
+    print("{:<14}{:>14}{:>10}{:>12}{:>12}".format("format", "bytes", "size", "write_s", "load_s"))
+    for name, fmt in report["formats"].items():
+        print("{:<14}{:>14}{:>9.1%}{:>12.3f}{:>12.3f}".format(
+            name, fmt["bytes"], fmt["bytes"] / float(base["bytes"]), fmt["write_s"], fmt["load_s"]))
+    if args.out:
+        with open(args.out, "w") as fp:
+            json.dump(report, fp, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
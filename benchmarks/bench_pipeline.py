@@ -0,0 +1,232 @@
+"""Export and update pipeline benchmark on generated frames (fake Revit API).
+
+For each size a frame with about that many analytical members is built
+with synthetic.py, exported with ExportAnalyticalModel.export (profiling
+on) and updated with the UpdateModelFeatures script (run_update, every
+10th beam re-sectioned). Recorded per step: wall time, peak traced
+memory (tracemalloc) and fake API calls; per export stage: time, calls
+and API calls; per update phase: the durations from the status JSON.
+
+Results go to benchmarks/results/pipeline_<ts>.json and are compared
+with a stored baseline. Any metric above baseline * (1 + tolerance) plus
+a small absolute slack is a regression and the exit code is 1. API call
+counts are deterministic, so their default tolerance is 0.
+
+    python benchmarks/bench_pipeline.py [--sizes 1000,10000,100000] [--update-baseline]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import tempfile
+import contextlib
+
+try:
+    import tracemalloc
+except ImportError:  # IronPython
+    tracemalloc = None
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_LIB = os.path.join(_ROOT, "lib")
+BASELINE = os.path.join(_HERE, "baseline.json")
+RESULTS_DIR = os.path.join(_HERE, "results")
+for _p in (_HERE, _LIB):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import fakerevit  # noqa: E402
+from run_fake import run_update_script  # noqa: E402  (installs the fake API)
+import synthetic  # noqa: E402
+from revitio import timing  # noqa: E402
+from revitio.members_exporter import ExportAnalyticalModel  # noqa: E402
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# metric kind -> (relative tolerance, absolute slack)
+DEFAULT_TOLERANCES = {"seconds": (0.5, 0.1), "peak_mb": (0.25, 1.0), "api_calls": (0.0, 0)}
+
+
+def _attribute_api_calls():
+    """Make exporter stages (StageTimer) the current fakerevit stage while they run."""
+    enter, exit_ = timing._Stage.__enter__, timing._Stage.__exit__
+
+    def __enter__(self):
+        fakerevit.push_stage(self.name)
+        return enter(self)
+
+    def __exit__(self, exc_type, exc, tb):
+        fakerevit.pop_stage()
+        return exit_(self, exc_type, exc, tb)
+
+    timing._Stage.__enter__ = __enter__
+    timing._Stage.__exit__ = __exit__
+
+
+class _Step(object):
+    """Wall time, traced peak memory and API calls of one pipeline step."""
+
+    def __init__(self, name, trace_memory):
+        self.name = name
+        self.trace_memory = trace_memory and tracemalloc is not None
+        self.result = {}
+
+    def __enter__(self):
+        fakerevit.reset_calls()
+        fakerevit.push_stage(None)
+        if self.trace_memory:
+            tracemalloc.start()
+        self.started = _clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = _clock() - self.started
+        fakerevit.pop_stage()
+        self.result = {"seconds": round(seconds, 4), "api_calls": sum(fakerevit.CALLS.values())}
+        if self.trace_memory:
+            self.result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            tracemalloc.stop()
+        self.result["api_by_method"] = dict(fakerevit.CALLS)
+        self.stage_calls = dict(fakerevit.STAGE_CALLS)
+        return False
+
+
+def bench_size(members, out_dir, trace_memory=True, every=10):
+    os.environ["REVIT_ANALYTICAL_OUT"] = out_dir
+    os.environ["REVIT_ANALYTICAL_SAVEAS_PATH"] = out_dir
+    with _Step("build", trace_memory) as build:
+        doc = synthetic.frame_for_members(members)
+    with _Step("export", trace_memory) as export:
+        exporter = ExportAnalyticalModel(doc, output_dir=out_dir, profile=True)
+        result = exporter.export()
+    stages = {}
+    for name, data in exporter.timer.to_dict()["stages"].items():
+        stages[name] = {"seconds": round(data["total_s"], 4), "calls": data["calls"],
+                        "api_calls": export.stage_calls.get(name, 0)}
+    export.result["stages"] = stages
+    export.result["api_calls_outside_stages"] = export.stage_calls.get(None, 0)
+
+    input_path = os.path.join(out_dir, "updated_sections_{}.json".format(members))
+    synthetic.update_input(doc, every, input_path)
+    with _Step("update", trace_memory) as update:
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = run_update_script(doc, input_path)
+    update.result["stages"] = dict(
+        (name, {"seconds": round(value, 4)}) for name, value in status["durations"].items() if name != "chunks")
+    update.result["counts"] = status["counts"]
+    return {
+        "members": len(result.analytical_members),
+        "nodes": len(result.analytical_nodes),
+        "build": build.result,
+        "export": export.result,
+        "update": update.result,
+    }
+
+
+def _metrics(size_result):
+    """Flat {"export.seconds": v, "export.stages.section.api_calls": v, ...} of compared values."""
+    out = {}
+    for step in ("export", "update"):
+        data = size_result.get(step) or {}
+        for kind in DEFAULT_TOLERANCES:
+            if kind in data:
+                out["{}.{}".format(step, kind)] = data[kind]
+        for stage, values in (data.get("stages") or {}).items():
+            for kind in DEFAULT_TOLERANCES:
+                if kind in values:
+                    out["{}.stages.{}.{}".format(step, stage, kind)] = values[kind]
+    return out
+
+
+def compare(results, baseline, tolerances):
+    """(regressions, improvements) as lists of (size, metric, baseline, current)."""
+    regressions = []
+    improvements = []
+    for size, current in results["sizes"].items():
+        base = (baseline.get("sizes") or {}).get(size)
+        if base is None:
+            continue
+        base_metrics = _metrics(base)
+        for metric, value in sorted(_metrics(current).items()):
+            old = base_metrics.get(metric)
+            if old is None:
+                continue
+            rel, slack = tolerances[metric.rsplit(".", 1)[1]]
+            if value > old * (1.0 + rel) + slack:
+                regressions.append((size, metric, old, value))
+            elif value < old * (1.0 - rel) - slack:
+                improvements.append((size, metric, old, value))
+    return regressions, improvements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark export and update on generated frames.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated member counts")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--out", help="results JSON path (default benchmarks/results/pipeline_<ts>.json)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak_mb)")
+    for kind, (rel, _) in sorted(DEFAULT_TOLERANCES.items()):
+        parser.add_argument("--{}-tolerance".format(kind.replace("_", "-")), type=float, default=rel,
+                            help="relative tolerance for {} (default {})".format(kind, rel))
+    args = parser.parse_args(argv)
+    tolerances = dict(
+        (kind, (getattr(args, "{}_tolerance".format(kind)), slack))
+        for kind, (_, slack) in DEFAULT_TOLERANCES.items()
+    )
+    _attribute_api_calls()
+
+    work = tempfile.mkdtemp(prefix="revitio_bench_")
+    results = {
+        "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "trace_memory": not args.no_memory,
+        "sizes": {},
+    }
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        out_dir = os.path.join(work, str(size))
+        os.makedirs(out_dir)
+        res = results["sizes"][str(size)] = bench_size(size, out_dir, trace_memory=not args.no_memory)
+        print("{:>7} members  export {:>8.2f}s {:>8} MB {:>9} API   update {:>7.2f}s {:>8} MB {:>7} API".format(
+            res["members"], res["export"]["seconds"], res["export"].get("peak_mb", "-"), res["export"]["api_calls"],
+            res["update"]["seconds"], res["update"].get("peak_mb", "-"), res["update"]["api_calls"]))
+
+    out = args.out
+    if not out:
+        if not os.path.isdir(RESULTS_DIR):
+            os.makedirs(RESULTS_DIR)
+        out = os.path.join(RESULTS_DIR, "pipeline_{}.json".format(datetime.datetime.now().strftime("%Y%m%d_%H%M%S")))
+    with open(out, "w") as fp:
+        json.dump(results, fp, indent=2, sort_keys=True)
+    print("results -> {}".format(out))
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+        print("baseline updated -> {}".format(args.baseline))
+        return 0
+    if not os.path.isfile(args.baseline):
+        print("no baseline at {} (run with --update-baseline to store one)".format(args.baseline))
+        return 0
+    with open(args.baseline, "r") as fp:
+        baseline = json.load(fp)
+    if baseline.get("trace_memory") != results["trace_memory"]:
+        print("baseline was recorded with trace_memory={}; times are not comparable".format(
+            baseline.get("trace_memory")))
+    regressions, improvements = compare(results, baseline, tolerances)
+    for size, metric, old, new in improvements:
+        print("improved   {:>7} {:<50} {} -> {}".format(size, metric, old, new))
+    for size, metric, old, new in regressions:
+        print("REGRESSION {:>7} {:<50} {} -> {}".format(size, metric, old, new))
+    if regressions:
+        print("{} regressions against {}".format(len(regressions), args.baseline))
+        return 1
+    print("no regressions against {}".format(args.baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
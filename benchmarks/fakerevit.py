@@ -0,0 +1,734 @@
+"""In-memory stand-in for the parts of Autodesk.Revit.DB that revitio uses.
+
+install() registers Autodesk, Autodesk.Revit, Autodesk.Revit.DB and
+Autodesk.Revit.DB.Structure in sys.modules; it has to run before revitio
+(or a pushbutton script) is imported, because those modules bind the API
+names at import time. Documents are plain Python: elements live in a
+dict, collectors filter it, and type changes need an open Transaction
+(rolled back on RollBack) like in Revit.
+
+Every API method bumps a counter in CALLS ("Document.GetElement",
+"Element.get_Parameter", ...) and one in STAGE_CALLS for the innermost
+stage opened with push_stage, so a run can report how many API calls
+each stage made. See synthetic.py for a frame model generator.
+"""
+import sys
+import math
+import types
+import collections
+
+CALLS = collections.Counter()
+STAGE_CALLS = collections.Counter()  # stage name -> API calls made while it was innermost
+_STAGES = [None]
+
+
+def reset_calls():
+    CALLS.clear()
+    STAGE_CALLS.clear()
+
+
+def push_stage(name):
+    _STAGES.append(name)
+
+
+def pop_stage():
+    if len(_STAGES) > 1:
+        _STAGES.pop()
+
+
+def calls():
+    """Copy of the API call counters."""
+    return dict(CALLS)
+
+
+def _counted(name):
+    def wrap(fn):
+        def inner(*args, **kwargs):
+            CALLS[name] += 1
+            STAGE_CALLS[_STAGES[-1]] += 1
+            return fn(*args, **kwargs)
+        inner.__name__ = fn.__name__
+        inner.__doc__ = fn.__doc__
+        return inner
+    return wrap
+
+
+class ModificationOutsideTransactionException(Exception):
+    pass
+
+
+class _Enum(object):
+    """Enum member that prints as its name, as .NET enums do."""
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    __repr__ = __str__
+
+
+def _enum(cls_name, names):
+    return type(cls_name, (object,), dict((n, _Enum(n)) for n in names))
+
+
+# ---------------------------------------------------------------- geometry
+
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, k):
+        return XYZ(self.X * k, self.Y * k, self.Z * k)
+
+    def GetLength(self):
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def Normalize(self):
+        length = self.GetLength()
+        if length == 0.0:
+            return XYZ()
+        return XYZ(self.X / length, self.Y / length, self.Z / length)
+
+    def DotProduct(self, other):
+        return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def __repr__(self):
+        return "XYZ({}, {}, {})".format(self.X, self.Y, self.Z)
+
+
+class Curve(object):
+    def __init__(self, a, b):
+        self._ends = (a, b)
+
+    @_counted("Curve.GetEndPoint")
+    def GetEndPoint(self, index):
+        return self._ends[index]
+
+    @property
+    def Length(self):
+        return self._ends[0].DistanceTo(self._ends[1])
+
+
+class Line(Curve):
+    @staticmethod
+    def CreateBound(a, b):
+        return Line(a, b)
+
+
+class Transform(object):
+    def __init__(self, basis_x, basis_y, basis_z, origin=None):
+        self.BasisX = basis_x
+        self.BasisY = basis_y
+        self.BasisZ = basis_z
+        self.Origin = origin or XYZ()
+
+
+class LocationCurve(object):
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+class LocationPoint(object):
+    def __init__(self, point):
+        self.Point = point
+
+
+class Options(object):
+    def __init__(self):
+        CALLS["Options"] += 1
+        STAGE_CALLS[_STAGES[-1]] += 1
+
+
+# ---------------------------------------------------------------- ids, parameters
+
+class ElementId(object):
+    __slots__ = ("Value",)
+
+    def __init__(self, value):
+        self.Value = int(value)
+
+    @property
+    def IntegerValue(self):
+        return self.Value
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other.Value == self.Value
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.Value)
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "ElementId({})".format(self.Value)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+StorageType = _enum("StorageType", ["None", "Integer", "Double", "String", "ElementId"])
+
+
+class _Definition(object):
+    def __init__(self, name):
+        self.Name = name
+
+
+class Parameter(object):
+    def __init__(self, name, value):
+        self.Definition = _Definition(name)
+        self.value = value
+
+    @property
+    def HasValue(self):
+        return self.value is not None
+
+    @property
+    def StorageType(self):
+        v = self.value
+        if isinstance(v, ElementId):
+            return StorageType.ElementId
+        if isinstance(v, bool) or isinstance(v, int):
+            return StorageType.Integer
+        if isinstance(v, float):
+            return StorageType.Double
+        return StorageType.String
+
+    @_counted("Parameter.AsDouble")
+    def AsDouble(self):
+        return float(self.value)
+
+    @_counted("Parameter.AsInteger")
+    def AsInteger(self):
+        return int(self.value)
+
+    @_counted("Parameter.AsString")
+    def AsString(self):
+        return self.value if isinstance(self.value, str) else None
+
+    @_counted("Parameter.AsElementId")
+    def AsElementId(self):
+        return self.value if isinstance(self.value, ElementId) else ElementId.InvalidElementId
+
+
+_SECTION_PARAMS = [
+    "STRUCTURAL_SECTION_AREA", "STRUCTURAL_SECTION_COMMON_WIDTH", "STRUCTURAL_SECTION_COMMON_HEIGHT",
+    "STRUCTURAL_SECTION_COMMON_DIAMETER", "STRUCTURAL_SECTION_COMMON_PERIMETER",
+    "STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_STRONG_AXIS", "STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_WEAK_AXIS",
+    "STRUCTURAL_SECTION_COMMON_SHEAR_AREA_STRONG_AXIS", "STRUCTURAL_SECTION_COMMON_SHEAR_AREA_WEAK_AXIS",
+    "STRUCTURAL_SECTION_COMMON_TORSIONAL_MODULUS", "STRUCTURAL_SECTION_ISHAPE_WEBHEIGHT",
+    "STRUCTURAL_SECTION_ISHAPE_WEBTHICKNESS", "STRUCTURAL_SECTION_FLANGE_THICKNESS",
+    "STRUCTURAL_SECTION_IWELDED_TOPFLANGEWIDTH", "STRUCTURAL_SECTION_IWELDED_TOPFLANGETHICKNESS",
+    "STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGEWIDTH", "STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGETHICKNESS",
+    "STRUCTURAL_SECTION_HSS_OUTERFILLET", "STRUCTURAL_SECTION_HSS_INNERFILLET",
+    "STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_STRONG_AXIS", "STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_WEAK_AXIS",
+    "STRUCTURAL_SECTION_COMMON_TORSIONAL_MOMENT_OF_INERTIA", "STRUCTURAL_SECTION_COMMON_WARPING_CONSTANT",
+]
+
+BuiltInParameter = _enum("BuiltInParameter", [
+    "SYMBOL_NAME_PARAM", "SYMBOL_FAMILY_NAME_PARAM", "ALL_MODEL_TYPE_NAME", "STRUCTURAL_MATERIAL_PARAM",
+] + _SECTION_PARAMS)
+
+BuiltInCategory = _enum("BuiltInCategory", [
+    "OST_AnalyticalNodes", "OST_StructuralFraming", "OST_StructuralColumns", "OST_Materials",
+    "OST_AnalyticalMember",
+])
+
+
+class ForgeTypeId(object):
+    def __init__(self, name, per_foot):
+        self.name = name
+        self.per_foot = per_foot  # output units per internal unit
+
+
+# internal units are feet (and their powers)
+UnitTypeId = type("UnitTypeId", (object,), {
+    "Meters": ForgeTypeId("Meters", 0.3048),
+    "Centimeters": ForgeTypeId("Centimeters", 30.48),
+    "Millimeters": ForgeTypeId("Millimeters", 304.8),
+    "Feet": ForgeTypeId("Feet", 1.0),
+    "Inches": ForgeTypeId("Inches", 12.0),
+    "SquareMeters": ForgeTypeId("SquareMeters", 0.3048 ** 2),
+    "CubicMeters": ForgeTypeId("CubicMeters", 0.3048 ** 3),
+    "MetersToTheFourthPower": ForgeTypeId("MetersToTheFourthPower", 0.3048 ** 4),
+    "MetersToTheSixthPower": ForgeTypeId("MetersToTheSixthPower", 0.3048 ** 6),
+})
+
+
+class UnitUtils(object):
+    @staticmethod
+    @_counted("UnitUtils.ConvertFromInternalUnits")
+    def ConvertFromInternalUnits(value, unit):
+        return value * unit.per_foot
+
+    @staticmethod
+    @_counted("UnitUtils.ConvertToInternalUnits")
+    def ConvertToInternalUnits(value, unit):
+        return value / unit.per_foot
+
+
+# ---------------------------------------------------------------- elements
+
+class Element(object):
+    """Base element: id, unique id, parameters by BuiltInParameter name."""
+
+    category = None
+    is_type = False
+
+    def __init__(self, doc, name=None):
+        self.Document = doc
+        self.Id = ElementId(doc._next_id())
+        self.UniqueId = "{}-{:08x}".format(doc.guid, self.Id.Value)
+        self._name = name
+        self._params = {}
+        self._version = 0
+        self.type_id = ElementId.InvalidElementId
+        doc._add(self)
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def VersionGuid(self):
+        return "{}-v{}".format(self.UniqueId, self._version)
+
+    @property
+    def Category(self):
+        return self.category
+
+    def set_param(self, bip, value):
+        self._params[str(bip)] = Parameter(str(bip), value)
+
+    @_counted("Element.get_Parameter")
+    def get_Parameter(self, bip):
+        if bip is None:
+            return None
+        return self._params.get(str(bip))
+
+    @property
+    def Parameters(self):
+        return list(self._params.values())
+
+    @_counted("Element.GetTypeId")
+    def GetTypeId(self):
+        return self.type_id
+
+    def _touch(self):
+        self.Document._check_transaction()
+        self._version += 1
+
+
+class Material(Element):
+    category = BuiltInCategory.OST_Materials
+
+
+class Family(Element):
+    pass
+
+
+class ElementType(Element):
+    is_type = True
+
+
+class FamilySymbol(ElementType):
+    def __init__(self, doc, family, name, category):
+        ElementType.__init__(self, doc, name)
+        self.Family = family
+        self.category = category
+        self.set_param(BuiltInParameter.SYMBOL_NAME_PARAM, name)
+        self.set_param(BuiltInParameter.SYMBOL_FAMILY_NAME_PARAM, family.Name)
+        self.set_param(BuiltInParameter.ALL_MODEL_TYPE_NAME, name)
+
+
+class FamilyInstance(Element):
+    def __init__(self, doc, symbol, curve, category, material=None):
+        Element.__init__(self, doc, symbol.Name)
+        self.category = category
+        self.Location = LocationCurve(curve)
+        self.type_id = symbol.Id
+        self._materials = [material.Id] if material is not None else []
+        self._analytical = []  # associated analytical members follow type changes
+
+    @property
+    def Symbol(self):
+        return self.Document._elements[self.type_id.Value]
+
+    @Symbol.setter
+    def Symbol(self, symbol):
+        self.ChangeTypeId(symbol.Id)
+
+    @property
+    def Name(self):
+        return self.Symbol.Name
+
+    @_counted("Element.ChangeTypeId")
+    def ChangeTypeId(self, type_id):
+        self._touch()
+        old = self.type_id
+        self.type_id = type_id
+        self.Document._undo.append(lambda: setattr(self, "type_id", old))
+        for member in self._analytical:
+            member._touch()
+            self.Document._undo.append(lambda m=member, t=member.SectionTypeId: setattr(m, "SectionTypeId", t))
+            member.SectionTypeId = type_id
+        return self.Id
+
+    @_counted("Element.GetMaterialIds")
+    def GetMaterialIds(self, paint):
+        return [] if paint else list(self._materials)
+
+
+class ReleaseConditions(object):
+    def __init__(self, start, fx=False, fy=False, fz=False, mx=False, my=False, mz=False):
+        self.Start = start
+        self.Fx, self.Fy, self.Fz = fx, fy, fz
+        self.Mx, self.My, self.Mz = mx, my, mz
+
+
+class AnalyticalElement(Element):
+    pass
+
+
+class AnalyticalNode(AnalyticalElement):
+    category = BuiltInCategory.OST_AnalyticalNodes
+
+    def __init__(self, doc, point):
+        AnalyticalElement.__init__(self, doc, "Analytical Node")
+        self.Location = LocationPoint(point)
+
+
+class AnalyticalMember(AnalyticalElement):
+    category = BuiltInCategory.OST_AnalyticalMember
+
+    def __init__(self, doc, curve, section_type, material=None, role="Beam", host=None, releases=None,
+                 rotation=0.0, shape="IWideFlange", single_curve=True):
+        AnalyticalElement.__init__(self, doc, "Analytical Member")
+        self._curve = curve
+        self._single_curve = single_curve  # False sends endpoint reads to get_Geometry
+        self.SectionTypeId = section_type.Id
+        self.MaterialId = material.Id if material is not None else ElementId.InvalidElementId
+        self.StructuralRole = role
+        self.StructuralSectionShape = shape
+        self.CrossSectionRotation = rotation
+        self._host = host.Id if host is not None else ElementId.InvalidElementId
+        if host is not None:
+            host._analytical.append(self)
+        self._releases = releases or []
+
+    @_counted("AnalyticalMember.IsSingleCurve")
+    def IsSingleCurve(self):
+        return self._single_curve
+
+    @_counted("AnalyticalMember.GetCurve")
+    def GetCurve(self):
+        return self._curve
+
+    @_counted("AnalyticalMember.GetElementId")
+    def GetElementId(self):
+        return self._host
+
+    @_counted("AnalyticalMember.GetReleaseConditions")
+    def GetReleaseConditions(self):
+        return list(self._releases)
+
+    @_counted("AnalyticalMember.GetTransform")
+    def GetTransform(self):
+        a, b = self._curve.GetEndPoint(0), self._curve.GetEndPoint(1)
+        x = (b - a).Normalize()
+        up = XYZ(0.0, 0.0, 1.0) if abs(x.Z) < 0.99 else XYZ(1.0, 0.0, 0.0)
+        y = XYZ(up.Y * x.Z - up.Z * x.Y, up.Z * x.X - up.X * x.Z, up.X * x.Y - up.Y * x.X).Normalize()
+        z = XYZ(x.Y * y.Z - x.Z * y.Y, x.Z * y.X - x.X * y.Z, x.X * y.Y - x.Y * y.X)
+        return Transform(x, y, z, a)
+
+    @_counted("Element.get_Geometry")
+    def get_Geometry(self, options):
+        return [self._curve]
+
+
+# ---------------------------------------------------------------- document, collectors, transactions
+
+class Document(object):
+    _count = 0
+
+    def __init__(self, title="FakeModel", path=""):
+        Document._count += 1
+        self.guid = "{:08x}-fake".format(Document._count)
+        self.Title = title
+        self.PathName = path
+        self.IsWorkshared = False
+        self._elements = collections.OrderedDict()
+        self._by_uid = {}
+        self._id = 100000
+        self._transaction = None
+        self._undo = []
+        self.saved_as = []
+        self.closed = False
+
+    def _next_id(self):
+        self._id += 1
+        return self._id
+
+    def _add(self, elem):
+        self._elements[elem.Id.Value] = elem
+        self._by_uid[elem.UniqueId] = elem
+
+    def _check_transaction(self):
+        if self._transaction is None:
+            raise ModificationOutsideTransactionException("Attempt to modify the model outside of a transaction.")
+
+    @_counted("Document.GetElement")
+    def GetElement(self, ref):
+        if isinstance(ref, ElementId):
+            return self._elements.get(ref.Value)
+        if isinstance(ref, str):
+            return self._by_uid.get(ref)
+        raise TypeError("GetElement expects an ElementId or a UniqueId string")
+
+    def GetHashCode(self):
+        return id(self)
+
+    @_counted("Document.SaveAs")
+    def SaveAs(self, path, options=None):
+        self.saved_as.append(path)
+
+    @_counted("Document.Save")
+    def Save(self):
+        pass
+
+    @_counted("Document.Close")
+    def Close(self, save=False):
+        self.closed = True
+        return True
+
+    def elements(self):
+        return list(self._elements.values())
+
+    def __len__(self):
+        return len(self._elements)
+
+
+class FilteredElementCollector(object):
+    def __init__(self, doc):
+        CALLS["FilteredElementCollector"] += 1
+        STAGE_CALLS[_STAGES[-1]] += 1
+        self._doc = doc
+        self._filters = []
+
+    def OfClass(self, cls):
+        self._filters.append(lambda e: isinstance(e, cls))
+        return self
+
+    def OfCategory(self, category):
+        self._filters.append(lambda e: e.category is category)
+        return self
+
+    def WhereElementIsNotElementType(self):
+        self._filters.append(lambda e: not e.is_type)
+        return self
+
+    def WhereElementIsElementType(self):
+        self._filters.append(lambda e: e.is_type)
+        return self
+
+    def _elements(self):
+        filters = self._filters
+        return [e for e in self._doc._elements.values() if all(f(e) for f in filters)]
+
+    @_counted("FilteredElementCollector.ToElements")
+    def ToElements(self):
+        return self._elements()
+
+    @_counted("FilteredElementCollector.ToElementIds")
+    def ToElementIds(self):
+        return [e.Id for e in self._elements()]
+
+    def __iter__(self):
+        return iter(self._elements())
+
+
+class Transaction(object):
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self.name = name
+        self._mark = None
+
+    @_counted("Transaction.Start")
+    def Start(self):
+        if self._doc._transaction is not None:
+            raise RuntimeError("A transaction is already open")
+        self._doc._transaction = self
+        self._mark = len(self._doc._undo)
+
+    @_counted("Transaction.Commit")
+    def Commit(self):
+        self._doc._transaction = None
+
+    @_counted("Transaction.RollBack")
+    def RollBack(self):
+        undo = self._doc._undo
+        while len(undo) > self._mark:
+            undo.pop()()
+        self._doc._transaction = None
+
+
+class TransactionGroup(object):
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self.name = name
+        self._mark = None
+
+    @_counted("TransactionGroup.Start")
+    def Start(self):
+        self._mark = len(self._doc._undo)
+
+    @_counted("TransactionGroup.Assimilate")
+    def Assimilate(self):
+        pass
+
+    @_counted("TransactionGroup.RollBack")
+    def RollBack(self):
+        undo = self._doc._undo
+        while len(undo) > self._mark:
+            undo.pop()()
+
+
+class _Options(object):
+    """Option bags the scripts construct and set attributes on."""
+
+    def __init__(self, *args):
+        self.args = args
+
+    def SetRelinquishOptions(self, options):
+        self.relinquish = options
+
+
+class SaveAsOptions(_Options):
+    pass
+
+
+class SynchronizeWithCentralOptions(_Options):
+    pass
+
+
+class TransactWithCentralOptions(_Options):
+    pass
+
+
+class RelinquishOptions(_Options):
+    pass
+
+
+class OpenOptions(_Options):
+    pass
+
+
+DetachFromCentralOption = _enum("DetachFromCentralOption", ["DoNotDetach", "DetachAndPreserveWorksets"])
+
+
+class ModelPathUtils(object):
+    @staticmethod
+    def ConvertUserVisiblePathToModelPath(path):
+        return path
+
+
+class Application(object):
+    """Opens documents registered with add_model (path -> factory or Document)."""
+
+    def __init__(self):
+        self.models = {}
+        self.Documents = []
+
+    def add_model(self, path, factory):
+        self.models[path] = factory
+
+    @_counted("Application.OpenDocumentFile")
+    def OpenDocumentFile(self, model_path, options=None):
+        factory = self.models.get(model_path)
+        if factory is None:
+            raise IOError("cannot open {}".format(model_path))
+        doc = factory() if callable(factory) else factory
+        doc.PathName = model_path
+        return doc
+
+
+class UIDocument(object):
+    def __init__(self, doc):
+        self.Document = doc
+
+
+class UIApplication(object):
+    """What pyRevit injects as __revit__."""
+
+    def __init__(self, doc=None, app=None):
+        self.Application = app or Application()
+        self.ActiveUIDocument = UIDocument(doc) if doc is not None else None
+
+
+_DB_NAMES = [
+    "XYZ", "Curve", "Line", "Transform", "LocationCurve", "LocationPoint", "Options", "ElementId", "StorageType",
+    "Parameter", "BuiltInParameter", "BuiltInCategory", "ForgeTypeId", "UnitTypeId", "UnitUtils", "Element",
+    "ElementType", "Material", "Family", "FamilySymbol", "FamilyInstance", "Document", "FilteredElementCollector",
+    "Transaction", "TransactionGroup", "SaveAsOptions", "SynchronizeWithCentralOptions",
+    "TransactWithCentralOptions", "RelinquishOptions", "OpenOptions", "DetachFromCentralOption", "ModelPathUtils",
+]
+_STRUCTURE_NAMES = ["AnalyticalElement", "AnalyticalMember", "AnalyticalNode", "ReleaseConditions"]
+
+
+def install():
+    """Register the fake API modules; returns the Autodesk.Revit.DB module."""
+    loaded = [m for m in sys.modules if m == "revitio" or m.startswith("revitio.")]
+    if loaded:
+        raise RuntimeError("install() must run before revitio is imported ({} already loaded)".format(loaded[0]))
+    if "Autodesk.Revit.DB" in sys.modules and getattr(sys.modules["Autodesk.Revit.DB"], "__fake__", False):
+        return sys.modules["Autodesk.Revit.DB"]
+    here = sys.modules[__name__]
+    autodesk = types.ModuleType("Autodesk")
+    revit = types.ModuleType("Autodesk.Revit")
+    db = types.ModuleType("Autodesk.Revit.DB")
+    structure = types.ModuleType("Autodesk.Revit.DB.Structure")
+    for name in _DB_NAMES:
+        setattr(db, name, getattr(here, name))
+    for name in _STRUCTURE_NAMES:
+        setattr(structure, name, getattr(here, name))
+    exceptions = types.ModuleType("Autodesk.Revit.Exceptions")
+    exceptions.ModificationOutsideTransactionException = ModificationOutsideTransactionException
+    db.__fake__ = True
+    db.Structure = structure
+    revit.DB = db
+    revit.Exceptions = exceptions
+    autodesk.Revit = revit
+    sys.modules.update({
+        "Autodesk": autodesk,
+        "Autodesk.Revit": revit,
+        "Autodesk.Revit.DB": db,
+        "Autodesk.Revit.DB.Structure": structure,
+        "Autodesk.Revit.Exceptions": exceptions,
+    })
+    return db
+
+
+__all__ = ["install", "CALLS", "STAGE_CALLS", "calls", "reset_calls", "push_stage", "pop_stage"] + _DB_NAMES + [
+    "Application", "UIApplication", "UIDocument", "ModificationOutsideTransactionException",
+] + _STRUCTURE_NAMES
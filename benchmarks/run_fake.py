@@ -0,0 +1,91 @@
+"""Export and update a synthetic frame end-to-end on the fake Revit API.
+
+Builds a frame with about --members analytical members, runs
+ExportAnalyticalModel on it, writes an update input that re-sections
+every --every-th beam, runs the UpdateModelFeatures pushbutton script
+against the same document, then exports again and checks the new
+sections landed. Prints timings and the API call counts of each step.
+
+    python benchmarks/run_fake.py --members 5000 [--out DIR]
+"""
+import os
+import sys
+import json
+import time
+import runpy
+import argparse
+import tempfile
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_LIB = os.path.join(_ROOT, "lib")
+UPDATE_SCRIPT = os.path.join(_ROOT, "PullAnalyticalModel.tab", "Exports.panel", "UpdateModelFeatures.pushbutton",
+                             "script.py")
+for _p in (_HERE, _LIB):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import fakerevit  # noqa: E402
+
+fakerevit.install()
+
+import synthetic  # noqa: E402
+from revitio.members_exporter import ExportAnalyticalModel  # noqa: E402
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def run_update_script(doc, input_path):
+    """Run the pushbutton script as pyRevit would, with doc active; returns its status JSON."""
+    os.environ["REVIT_ANALYTICAL_UPDATE_JSON"] = input_path
+    runpy.run_path(UPDATE_SCRIPT, init_globals={"__revit__": fakerevit.UIApplication(doc)}, run_name="__revit__")
+    with open(input_path + ".update_status.json", "r") as fp:
+        return json.load(fp)
+
+
+def step(name, fn, report):
+    fakerevit.reset_calls()
+    started = _clock()
+    value = fn()
+    report[name] = {"seconds": round(_clock() - started, 3), "api_calls": sum(fakerevit.CALLS.values()),
+                    "top_calls": fakerevit.CALLS.most_common(5)}
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=10, help="re-section every n-th beam")
+    parser.add_argument("--out", help="output folder (default a temp folder)")
+    args = parser.parse_args(argv)
+    out = args.out or tempfile.mkdtemp(prefix="revitio_fake_")
+    os.environ["REVIT_ANALYTICAL_OUT"] = out
+    os.environ["REVIT_ANALYTICAL_SAVEAS_PATH"] = out
+    report = {}
+
+    doc = step("build", lambda: synthetic.frame_for_members(args.members), report)
+    exporter = ExportAnalyticalModel(doc, output_dir=out)
+    first = step("export", exporter.export, report)
+    input_path = os.path.join(out, "updated_sections.json")
+    wanted = dict((r["host_id"], r["section"]["type_id"])
+                  for r in synthetic.update_input(doc, args.every, input_path)["analytical_members"])
+    status = step("update", lambda: run_update_script(doc, input_path), report)
+    second = step("reexport", ExportAnalyticalModel(doc, output_dir=out).export, report)
+
+    # only members tied to their host (GetElementId) follow its type in Revit
+    linked = [m for m in second.analytical_members
+              if m.host_id in wanted and doc.GetElement(fakerevit.ElementId(m.id)).GetElementId().Value == m.host_id]
+    landed = sum(1 for m in linked if m.section is not None and m.section.type_id == wanted[m.host_id])
+    print("members {}, nodes {}".format(len(first.analytical_members), len(first.analytical_nodes)))
+    print("update counts {}".format(json.dumps(status["counts"], sort_keys=True)))
+    print("re-sectioned linked members on the new type in the re-export: {}/{}".format(landed, len(linked)))
+    for name in ("build", "export", "update", "reexport"):
+        print("{:<9} {:>8.3f}s {:>9} API calls  {}".format(
+            name, report[name]["seconds"], report[name]["api_calls"],
+            ", ".join("{} {}".format(k, v) for k, v in report[name]["top_calls"])))
+    print("output in {}".format(out))
+    return 0 if status["counts"]["failed"] == 0 and landed == len(linked) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
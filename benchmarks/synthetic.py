@@ -0,0 +1,134 @@
+"""Parametric steel frame models on the fakerevit API.
+
+build_frame(bays_x, bays_y, stories) makes a regular grid: an analytical
+node at every grid point, a column per point and story, and beams along
+both axes on every floor. Each analytical member has a physical framing
+or column instance; `linked` of them are tied to it directly
+(GetElementId), the rest have to be found by the host heuristic. Beams
+are pinned at both ends.
+
+frame_for_members(n) picks a square grid whose member count is close to
+n. Only fakerevit is needed here; call fakerevit.install() before
+importing revitio to run the exporter on the result.
+"""
+import json
+import math
+import random
+
+import fakerevit as fr
+
+FT_PER_M = 1.0 / 0.3048
+
+_BEAMS = [("W Shapes", "W{}x{}".format(d, w)) for d, w in ((12, 26), (14, 30), (16, 36), (18, 40), (21, 44),
+                                                           (24, 55))]
+_COLUMNS = [("W Shapes-Column", "W{}x{}".format(d, w)) for d, w in ((10, 49), (12, 65), (14, 90))]
+
+
+def _section(doc, family, name, category, k):
+    sym = fr.FamilySymbol(doc, family, name, category)
+    depth_m = 0.3 + 0.05 * k
+    area_m2 = 0.004 + 0.0012 * k
+    # stored in internal units (feet powers), as Revit does
+    sym.set_param(fr.BuiltInParameter.STRUCTURAL_SECTION_AREA, area_m2 * FT_PER_M ** 2)
+    sym.set_param(fr.BuiltInParameter.STRUCTURAL_SECTION_COMMON_HEIGHT, depth_m * FT_PER_M)
+    sym.set_param(fr.BuiltInParameter.STRUCTURAL_SECTION_COMMON_WIDTH, (0.15 + 0.02 * k) * FT_PER_M)
+    sym.set_param(fr.BuiltInParameter.STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_STRONG_AXIS,
+                  area_m2 * depth_m ** 2 / 8.0 * FT_PER_M ** 4)
+    return sym
+
+
+def build_frame(bays_x=4, bays_y=4, stories=3, bay_m=6.0, story_m=3.5, linked=0.5, seed=0, title=None):
+    """fakerevit Document with a bays_x x bays_y x stories steel frame."""
+    rnd = random.Random(seed)
+    doc = fr.Document(title or "Frame_{}x{}x{}".format(bays_x, bays_y, stories))
+    steel = fr.Material(doc, "Steel ASTM A992")
+    fr.Material(doc, "Concrete 4000 psi")
+    framing = fr.BuiltInCategory.OST_StructuralFraming
+    columns = fr.BuiltInCategory.OST_StructuralColumns
+    beam_family = fr.Family(doc, _BEAMS[0][0])
+    column_family = fr.Family(doc, _COLUMNS[0][0])
+    beam_types = [_section(doc, beam_family, name, framing, k) for k, (_, name) in enumerate(_BEAMS)]
+    column_types = [_section(doc, column_family, name, columns, k + 4) for k, (_, name) in enumerate(_COLUMNS)]
+    for sym in beam_types + column_types:
+        sym.set_param(fr.BuiltInParameter.STRUCTURAL_MATERIAL_PARAM, steel.Id)
+
+    bay = bay_m * FT_PER_M
+    story = story_m * FT_PER_M
+    points = {}
+    for k in range(stories + 1):
+        for i in range(bays_x + 1):
+            for j in range(bays_y + 1):
+                p = fr.XYZ(i * bay, j * bay, k * story)
+                points[(i, j, k)] = p
+                fr.AnalyticalNode(doc, p)
+
+    pinned = [fr.ReleaseConditions(True, my=True, mz=True), fr.ReleaseConditions(False, my=True, mz=True)]
+
+    def member(a, b, sym, category, role):
+        pa, pb = points[a], points[b]
+        host = fr.FamilyInstance(doc, sym, fr.Line.CreateBound(pa, pb), category, steel)
+        host.set_param(fr.BuiltInParameter.STRUCTURAL_MATERIAL_PARAM, fr.ElementId.InvalidElementId)
+        direct = rnd.random() < linked
+        fr.AnalyticalMember(
+            doc, fr.Line.CreateBound(fr.XYZ(pa.X, pa.Y, pa.Z), fr.XYZ(pb.X, pb.Y, pb.Z)), sym,
+            material=steel if rnd.random() < 0.5 else None, role=role,
+            host=host if direct else None, releases=pinned if role == "Beam" else None,
+        )
+
+    for k in range(1, stories + 1):
+        col = column_types[min(len(column_types) - 1, (stories - k) * len(column_types) // max(stories, 1))]
+        for i in range(bays_x + 1):
+            for j in range(bays_y + 1):
+                member((i, j, k - 1), (i, j, k), col, columns, "Column")
+        for i in range(bays_x + 1):
+            for j in range(bays_y + 1):
+                if i < bays_x:
+                    member((i, j, k), (i + 1, j, k), beam_types[rnd.randrange(len(beam_types))], framing, "Beam")
+                if j < bays_y:
+                    member((i, j, k), (i, j + 1, k), beam_types[rnd.randrange(len(beam_types))], framing, "Beam")
+    return doc
+
+
+def members_per_story(bays_x, bays_y):
+    return (bays_x + 1) * (bays_y + 1) + bays_x * (bays_y + 1) + bays_y * (bays_x + 1)
+
+
+def frame_for_members(n, stories=None, **options):
+    """build_frame sized to about n analytical members."""
+    if stories is None:
+        stories = max(1, int(round(n ** (1.0 / 3) / 2)))
+    per_story = max(1.0, float(n) / stories)
+    # per story ~ 3 * bays^2 for a square grid
+    bays = max(1, int(round(math.sqrt(per_story / 3.0))))
+    return build_frame(bays, bays, stories, **options)
+
+
+def update_input(doc, every=10, path=None):
+    """analytical_members records giving every n-th hosted beam the next beam type.
+
+    Returns the dict (also written to path when given), in the format
+    UpdateModelFeatures reads.
+    """
+    framing = fr.BuiltInCategory.OST_StructuralFraming
+    beam_types = [e for e in doc.elements() if isinstance(e, fr.FamilySymbol) and e.category is framing]
+    records = []
+    beams = [e for e in doc.elements() if isinstance(e, fr.FamilyInstance) and e.category is framing]
+    for n, host in enumerate(beams):
+        if n % every:
+            continue
+        cur = beam_types.index(host.Symbol)
+        target = beam_types[(cur + 1) % len(beam_types)]
+        records.append({
+            "id": None,
+            "host_id": host.Id.Value,
+            "host_unique_id": host.UniqueId,
+            "section": {"family_name": target.Family.Name, "type_name": target.Name, "type_id": target.Id.Value},
+        })
+    data = {"analytical_members": records}
+    if path:
+        with open(path, "w") as fp:
+            json.dump(data, fp, indent=2)
+    return data
+
+
+__all__ = ["build_frame", "frame_for_members", "members_per_story", "update_input"]
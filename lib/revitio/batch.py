@@ -0,0 +1,219 @@
+"""Batch export of several models in one Revit session.
+
+A manifest lists model paths, either as plain text (one path per line,
+# comments allowed) or as JSON: a list of paths / {"path", "output_dir"}
+entries, or {"models": [...]} with the same entries. Relative model
+paths and output_dirs are taken from the manifest folder; server paths
+(RSN://) go to Revit as given, cloud paths (BIM 360://, Autodesk Docs://)
+are rejected since they cannot be opened from a user-visible path. Each model is
+opened in the background, exported and closed without saving; a failure
+is recorded and the batch moves on. The run manifest
+(batch_<ts>.json in the output folder) is rewritten after every model,
+so an interrupted batch still leaves what it finished.
+"""
+import os
+import json
+import time
+import datetime
+import traceback
+
+try:
+    from Autodesk.Revit.DB import ModelPathUtils, OpenOptions, DetachFromCentralOption
+except Exception:  # allow outside Revit
+    ModelPathUtils = OpenOptions = DetachFromCentralOption = None
+
+from .utils import ensure_output_dir, get_logger, model_name
+from .members_exporter import ExportAnalyticalModel
+from .options import ExportOptions
+
+
+def read_manifest(path):
+    """List of {"path", "output_dir"} dicts from a text or JSON manifest."""
+    with open(path, "r") as fp:
+        text = fp.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [line.strip() for line in text.splitlines()]
+        data = [line for line in data if line and not line.startswith("#")]
+    if isinstance(data, dict):
+        data = data.get("models") or []
+    base = os.path.dirname(os.path.abspath(path))
+    entries = []
+    for item in data:
+        if isinstance(item, dict):
+            model_path, output_dir = item.get("path"), item.get("output_dir")
+        else:
+            model_path, output_dir = item, None
+        if not model_path:
+            continue
+        # relative file paths are relative to the manifest; server/cloud paths are kept as given
+        if "://" not in model_path and not os.path.isabs(model_path):
+            model_path = os.path.join(base, model_path)
+        if output_dir and not os.path.isabs(os.path.expanduser(output_dir)):
+            output_dir = os.path.join(base, output_dir)
+        entries.append({"path": model_path, "output_dir": output_dir})
+    return entries
+
+
+def is_cloud_path(path):
+    """True for cloud model paths (BIM 360://, Autodesk Docs://); RSN:// is a server path."""
+    scheme, sep, _ = path.partition("://")
+    return bool(sep) and scheme.strip().upper() != "RSN"
+
+
+def open_model(app, path, detach=True):
+    """Open path without activating it; workshared centrals are detached (worksets kept).
+
+    Cloud models need their project and model GUIDs (ModelPathUtils.
+    ConvertCloudGUIDsToCloudPath), which a manifest path does not carry,
+    so they raise ValueError.
+    """
+    if is_cloud_path(path):
+        raise ValueError("cloud model paths cannot be opened from a manifest: {}".format(path))
+    model_path = ModelPathUtils.ConvertUserVisiblePathToModelPath(path)
+    options = OpenOptions()
+    if detach:
+        try:
+            options.DetachFromCentralOption = DetachFromCentralOption.DetachAndPreserveWorksets
+        except Exception:
+            pass
+    return app.OpenDocumentFile(model_path, options)
+
+
+def close_model(doc):
+    doc.Close(False)
+
+
+def _already_open(app, path):
+    """Document in the session whose PathName is path, or None."""
+    target = os.path.normcase(os.path.abspath(path))
+    try:
+        docs = list(app.Documents)
+    except Exception:
+        return None
+    for d in docs:
+        try:
+            if d.PathName and os.path.normcase(os.path.abspath(d.PathName)) == target:
+                return d
+        except Exception:
+            continue
+    return None
+
+
+class BatchExport(object):
+    """Export each manifest model in turn, recording one entry per model.
+
+    exporter_options are passed to ExportAnalyticalModel: an ExportOptions,
+    or a dict of its keywords (units, stream, incremental, ...).
+    open_fn/close_fn default to open_model/close_model.
+    """
+
+    def __init__(self, app, models, output_dir=None, exporter_options=None, detach=True,
+                 open_fn=None, close_fn=None):
+        self.app = app
+        self.models = [m if isinstance(m, dict) else {"path": m, "output_dir": None} for m in models]
+        self.output_dir = ensure_output_dir(output_dir)
+        if isinstance(exporter_options, ExportOptions):
+            exporter_options = {"options": exporter_options}
+        self.exporter_options = exporter_options or {}
+        self.detach = detach
+        self.open_fn = open_fn or open_model
+        self.close_fn = close_fn or close_model
+        self.log = get_logger(self.output_dir + "/export_batch.log")
+        self.manifest_path = self.output_dir + "/batch_{}.json".format(
+            datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.started_at = None
+        self.entries = []
+
+    def export_one(self, entry):
+        path = entry["path"]
+        record = {
+            "path": path,
+            "model": None,
+            "status": "failed",
+            "duration_s": None,
+            "members": None,
+            "nodes": None,
+            "output_path": None,
+            "error": None,
+        }
+        started = time.time()
+        doc = None
+        opened = False
+        try:
+            if "://" not in path and not os.path.isfile(path):  # server (RSN://) paths are left to Revit
+                raise IOError("model not found: {}".format(path))
+            doc = _already_open(self.app, path)
+            if doc is None:
+                doc = self.open_fn(self.app, path, self.detach)
+                opened = True
+            record["model"] = model_name(doc)
+            exporter = ExportAnalyticalModel(doc, output_dir=entry.get("output_dir") or self.output_dir,
+                                             **self.exporter_options)
+            result = exporter.export()
+            record["members"] = result.counts.members_total
+            record["nodes"] = len(result.analytical_nodes)
+            record["output_path"] = exporter.lastOutputPath
+            record["status"] = "ok"
+        except Exception as ex:
+            record["error"] = "{}: {}".format(type(ex).__name__, ex)
+            self.log.error("{} failed: {}", path, record["error"])
+            self.log.debug("{}", traceback.format_exc())
+        finally:
+            if opened and doc is not None:
+                try:
+                    self.close_fn(doc)
+                except Exception as ex:
+                    self.log.warning("{} could not be closed: {}", path, ex)
+            record["duration_s"] = round(time.time() - started, 3)
+        return record
+
+    def run(self):
+        self.started_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.entries = []
+        self.log.info("Batch export of {} models -> {}", len(self.models), self.output_dir)
+        for n, entry in enumerate(self.models):
+            self.log.info("[{}/{}] {}", n + 1, len(self.models), entry["path"])
+            record = self.export_one(entry)
+            self.entries.append(record)
+            self.log.info("[{}/{}] {} in {}s ({} members, {} nodes)", n + 1, len(self.models),
+                          record["status"], record["duration_s"], record["members"], record["nodes"])
+            self.write_manifest()
+            self.log.flush()
+        self.log.info(self.summary())
+        self.log.flush()
+        return self.entries
+
+    def to_dict(self):
+        ok = [e for e in self.entries if e["status"] == "ok"]
+        return {
+            "started_at": self.started_at,
+            "output_dir": self.output_dir,
+            "models_total": len(self.models),
+            "models_done": len(self.entries),
+            "succeeded": len(ok),
+            "failed": len(self.entries) - len(ok),
+            "duration_s": round(sum(e["duration_s"] or 0.0 for e in self.entries), 3),
+            "models": self.entries,
+        }
+
+    def write_manifest(self):
+        with open(self.manifest_path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+        return self.manifest_path
+
+    def summary(self):
+        data = self.to_dict()
+        return "Batch export: {} ok, {} failed of {} in {}s; run manifest {}".format(
+            data["succeeded"], data["failed"], data["models_total"], data["duration_s"], self.manifest_path)
+
+
+def run_batch(app, models, output_dir=None, **options):
+    """Export every model in models (paths or manifest entries); returns the BatchExport."""
+    batch = BatchExport(app, models, output_dir=output_dir, **options)
+    batch.run()
+    return batch
+
+
+__all__ = ["BatchExport", "run_batch", "read_manifest", "is_cloud_path", "open_model", "close_model"]
@@ -0,0 +1,401 @@
+"""Columnar binary export (.rvcol) beside the JSON.
+
+Pure Python (struct + array) so it can be written inside Revit without
+NumPy. Layout, all little-endian:
+
+    magic        8 bytes   b"RVCOLMN1"
+    header_len   uint32    byte length of the header JSON
+    header       utf-8 JSON, padded with spaces to a multiple of 8 bytes
+    data         column blobs, each starting on an 8 byte boundary
+
+The header holds the export scalars (model, exported_at, units,
+snap_tolerance_m, counts), the node_consolidation section when nodes
+were consolidated, the topology section without its csr arrays, the
+de-duplicated tables and a column
+directory: [{"name", "type", "shape", "offset", "nbytes"}] where type is
+an array typecode (q int64, i int32, B uint8, d float64) and offset is
+relative to the start of the data block.
+
+Tables: "strings" (unique ids, units, status, structural role),
+"sections" and "materials" (each entry the JSON text of the member's
+section/section_properties pair or material dict). Columns reference
+them by int32 index, -1 for None.
+
+Nodes:   node_id q[N], node_unique_id i[N], node_units i[N],
+         node_status i[N], node_xyz d[N,3]
+Members: member_id q[M], member_unique_id i[M], member_units i[M],
+         member_status i[M], member_role i[M], member_node_i i[M] and
+         member_node_j i[M] (row index into the node columns),
+         member_endpoints d[M,6] (i xyz, j xyz), member_local_axes d[M,9]
+         (x, y, z basis), member_rotation d[M], member_release_start B[M]
+         and member_release_end B[M], member_section i[M],
+         member_material i[M], member_host_id q[M],
+         member_host_unique_id i[M]
+
+Topology (only with a topology section): topology_node_ids q[N],
+         topology_member_ends i[M,2], topology_node_offsets i[N+1],
+         topology_node_members i[K], the section's csr arrays
+
+Release masks: bit 0..5 = fx, fy, fz, mx, my, mz, bit 7 = present.
+Missing ints are INT_NONE (-2**63), missing floats NaN.
+"""
+import sys
+import json
+import math
+import struct
+from array import array
+
+from .models import (
+    Node, LineGeom, SectionInfo, SectionProperties, MaterialRef, MaterialInfo,
+    ReleaseCondition, Releases, LocalAxes, MemberRecord, ExportCounts, ExportResult
+)
+from .utils import get_logger
+
+MAGIC = b"RVCOLMN1"
+INT_NONE = -2 ** 63
+_NAN = float("nan")
+_RELEASE_FIELDS = ("fx", "fy", "fz", "mx", "my", "mz")
+_PRESENT = 0x80
+
+_NODE_COLUMNS = (
+    ("node_id", "q", 1), ("node_unique_id", "i", 1), ("node_units", "i", 1),
+    ("node_status", "i", 1), ("node_xyz", "d", 3),
+)
+_MEMBER_COLUMNS = (
+    ("member_id", "q", 1), ("member_unique_id", "i", 1), ("member_units", "i", 1),
+    ("member_status", "i", 1), ("member_role", "i", 1),
+    ("member_node_i", "i", 1), ("member_node_j", "i", 1),
+    ("member_endpoints", "d", 6), ("member_local_axes", "d", 9), ("member_rotation", "d", 1),
+    ("member_release_start", "B", 1), ("member_release_end", "B", 1),
+    ("member_section", "i", 1), ("member_material", "i", 1),
+    ("member_host_id", "q", 1), ("member_host_unique_id", "i", 1),
+)
+_TOPOLOGY_COLUMNS = (
+    ("topology_node_ids", "q", 1, "node_ids"), ("topology_member_ends", "i", 2, "member_ends"),
+    ("topology_node_offsets", "i", 1, "node_offsets"), ("topology_node_members", "i", 1, "node_members"),
+)
+
+
+class _Table(object):
+    """Append-only de-duplicated value table."""
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def index(self, value):
+        if value is None:
+            return -1
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._index[value] = idx
+            self.values.append(value)
+        return idx
+
+
+def _int_or_none(v):
+    return INT_NONE if v is None else int(v)
+
+
+def _float_or_nan(v):
+    return _NAN if v is None else float(v)
+
+
+def _release_mask(rc):
+    if rc is None:
+        return 0
+    mask = _PRESENT
+    for bit, name in enumerate(_RELEASE_FIELDS):
+        if getattr(rc, name):
+            mask |= 1 << bit
+    return mask
+
+
+def _canonical(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+class ColumnarBuilder(object):
+    """Accumulates nodes and members into typed arrays.
+
+    Members can be added one at a time, so a streaming export can tee its
+    records through add_member without keeping MemberRecord objects.
+    A member end whose node is not in analytical_nodes is written as -1
+    (like None) with a warning in log_file.
+    """
+
+    def __init__(self, result, log_file=None):
+        self.result = result
+        self.log_file = log_file
+        self.strings = _Table()
+        self.sections = _Table()
+        self.materials = _Table()
+        self.columns = dict((name, array(code)) for name, code, _ in _NODE_COLUMNS + _MEMBER_COLUMNS)
+        self._node_rows = {}
+        for node in result.analytical_nodes:
+            self.add_node(node)
+
+    def add_node(self, node):
+        c = self.columns
+        if node.id is not None:
+            self._node_rows[node.id] = len(c["node_id"])
+        c["node_id"].append(_int_or_none(node.id))
+        c["node_unique_id"].append(self.strings.index(node.unique_id))
+        c["node_units"].append(self.strings.index(node.units))
+        c["node_status"].append(self.strings.index(node.status))
+        c["node_xyz"].extend(node.position)
+
+    def _node_row(self, nid):
+        if nid is None:
+            return -1
+        row = self._node_rows.get(nid)
+        if row is None:
+            get_logger(self.log_file).warning("Member references node {} missing from analytical_nodes", nid)
+            return -1
+        return row
+
+    def add_member(self, rec):
+        c = self.columns
+        strings = self.strings
+        c["member_id"].append(_int_or_none(rec.id))
+        c["member_unique_id"].append(strings.index(rec.unique_id))
+        c["member_units"].append(strings.index(rec.units))
+        c["member_status"].append(strings.index(rec.status))
+        c["member_role"].append(strings.index(rec.structural_role))
+        c["member_node_i"].append(self._node_row(rec.node_i))
+        c["member_node_j"].append(self._node_row(rec.node_j))
+        if rec.line is not None:
+            c["member_endpoints"].extend(rec.line.point_i)
+            c["member_endpoints"].extend(rec.line.point_j)
+        else:
+            c["member_endpoints"].extend((_NAN,) * 6)
+        if rec.local_axes is not None:
+            c["member_local_axes"].extend(rec.local_axes.x)
+            c["member_local_axes"].extend(rec.local_axes.y)
+            c["member_local_axes"].extend(rec.local_axes.z)
+        else:
+            c["member_local_axes"].extend((_NAN,) * 9)
+        c["member_rotation"].append(_float_or_nan(rec.cross_section_rotation_rad))
+        releases = rec.releases
+        c["member_release_start"].append(_release_mask(releases.start if releases else None))
+        c["member_release_end"].append(_release_mask(releases.end if releases else None))
+        section = rec.section.to_dict() if rec.section else None
+        props = rec.section_properties.to_dict() if rec.section_properties else None
+        c["member_section"].append(
+            self.sections.index(_canonical([section, props]) if (section is not None or props is not None) else None)
+        )
+        material = rec.material.to_dict() if rec.material else None
+        c["member_material"].append(self.materials.index(_canonical(material) if material is not None else None))
+        c["member_host_id"].append(_int_or_none(rec.host_id))
+        c["member_host_unique_id"].append(strings.index(rec.host_unique_id))
+
+    def tee(self, records):
+        """Pass records through, adding each one."""
+        for rec in records:
+            self.add_member(rec)
+            yield rec
+
+    def write(self, path, members_total=None):
+        result = self.result
+        counts = result.counts.to_dict() if result.counts is not None else {}
+        if members_total is not None:
+            counts["members_total"] = members_total
+        columns = [(name, code, width, self.columns[name]) for name, code, width in _NODE_COLUMNS + _MEMBER_COLUMNS]
+        topology = result.topology
+        if topology is not None:
+            if not isinstance(topology, dict):
+                topology = topology.to_dict()
+            csr = topology["csr"]
+            topology = dict((k, v) for k, v in topology.items() if k != "csr")
+            for name, code, width, key in _TOPOLOGY_COLUMNS:
+                columns.append((name, code, width, array(code, csr[key])))
+        directory = []
+        blobs = []
+        offset = 0
+        for name, code, width, arr in columns:
+            if sys.byteorder != "little":
+                arr = array(code, arr)
+                arr.byteswap()
+            blob = arr.tobytes()
+            pad = (-len(blob)) % 8
+            directory.append({
+                "name": name, "type": code,
+                "shape": [len(arr) // width, width] if width > 1 else [len(arr)],
+                "offset": offset, "nbytes": len(blob),
+            })
+            blobs.append(blob + b"\0" * pad)
+            offset += len(blob) + pad
+        header = {
+            "model": result.model,
+            "exported_at": result.exported_at,
+            "units": result.units,
+            "snap_tolerance_m": result.snap_tolerance_m,
+            "counts": counts,
+            "tables": {
+                "strings": self.strings.values,
+                "sections": self.sections.values,
+                "materials": self.materials.values,
+            },
+            "columns": directory,
+        }
+        if result.node_consolidation is not None:
+            header["node_consolidation"] = result.node_consolidation
+        if topology is not None:
+            header["topology"] = topology
+        head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        head += b" " * ((-len(head)) % 8)
+        with open(path, "wb") as fp:
+            fp.write(MAGIC)
+            fp.write(struct.pack("<I", len(head)))
+            fp.write(head)
+            for blob in blobs:
+                fp.write(blob)
+        return path
+
+
+def write_columnar(result, path, log_file=None):
+    """Write result (nodes + members) as a .rvcol file."""
+    builder = ColumnarBuilder(result, log_file)
+    for rec in result.analytical_members:
+        builder.add_member(rec)
+    return builder.write(path)
+
+
+def read_columns(path, use_numpy=False):
+    """Return (header, {name: array}); arrays are flat unless use_numpy.
+
+    With use_numpy the columns come back as shaped NumPy arrays.
+    """
+    with open(path, "rb") as fp:
+        data = fp.read()
+    if data[:8] != MAGIC:
+        raise ValueError("Not a columnar export: {}".format(path))
+    (hlen,) = struct.unpack("<I", data[8:12])
+    header = json.loads(data[12:12 + hlen].decode("utf-8"))
+    base = 12 + hlen
+    columns = {}
+    np = None
+    if use_numpy:
+        import numpy as np
+    for col in header["columns"]:
+        start = base + col["offset"]
+        raw = data[start:start + col["nbytes"]]
+        if np is not None:
+            dtype = np.dtype(col["type"]).newbyteorder("<")
+            columns[col["name"]] = np.frombuffer(raw, dtype=dtype).reshape(col["shape"])
+        else:
+            arr = array(col["type"])
+            arr.frombytes(raw)
+            if sys.byteorder != "little":
+                arr.byteswap()
+            columns[col["name"]] = arr
+    return header, columns
+
+
+def _release_from_mask(mask):
+    if not mask & _PRESENT:
+        return None
+    return ReleaseCondition(*[bool(mask & (1 << bit)) for bit in range(len(_RELEASE_FIELDS))])
+
+
+def _opt_int(v):
+    return None if v == INT_NONE else v
+
+
+def _opt_float(v):
+    return None if math.isnan(v) else v
+
+
+def load_columnar(path):
+    """Rebuild the ExportResult written by write_columnar."""
+    header, c = read_columns(path)
+    tables = header["tables"]
+    strings = tables["strings"]
+
+    def s(idx):
+        return strings[idx] if idx >= 0 else None
+
+    sections = []
+    for text in tables["sections"]:
+        section, props = json.loads(text)
+        sections.append((
+            SectionInfo(**section) if section is not None else None,
+            SectionProperties(values=props) if props is not None else None,
+        ))
+    materials = []
+    for text in tables["materials"]:
+        d = json.loads(text)
+        primary = d.get("primary")
+        materials.append(MaterialInfo(
+            primary=MaterialRef(primary["id"], primary["name"]) if primary else None,
+            all_list=[MaterialRef(m["id"], m["name"]) for m in d.get("all") or []],
+        ))
+
+    nodes = []
+    node_ids = c["node_id"]
+    xyz = c["node_xyz"]
+    for row in range(len(node_ids)):
+        nodes.append(Node(
+            id=_opt_int(node_ids[row]),
+            unique_id=s(c["node_unique_id"][row]),
+            position=list(xyz[row * 3:row * 3 + 3]),
+            units=s(c["node_units"][row]),
+            status=s(c["node_status"][row]),
+        ))
+
+    def node_id(row):
+        return nodes[row].id if row >= 0 else None
+
+    members = []
+    ends = c["member_endpoints"]
+    axes = c["member_local_axes"]
+    for row in range(len(c["member_id"])):
+        e = ends[row * 6:row * 6 + 6]
+        units = s(c["member_units"][row])
+        line = None if math.isnan(e[0]) else LineGeom(list(e[0:3]), list(e[3:6]), units=units)
+        a = axes[row * 9:row * 9 + 9]
+        local_axes = None if math.isnan(a[0]) else LocalAxes(list(a[0:3]), list(a[3:6]), list(a[6:9]))
+        start = _release_from_mask(c["member_release_start"][row])
+        end = _release_from_mask(c["member_release_end"][row])
+        section, props = sections[c["member_section"][row]] if c["member_section"][row] >= 0 else (None, None)
+        mat_idx = c["member_material"][row]
+        members.append(MemberRecord(
+            id=_opt_int(c["member_id"][row]),
+            unique_id=s(c["member_unique_id"][row]),
+            node_i=node_id(c["member_node_i"][row]),
+            node_j=node_id(c["member_node_j"][row]),
+            line=line,
+            units=units,
+            status=s(c["member_status"][row]),
+            material=materials[mat_idx] if mat_idx >= 0 else None,
+            section=section,
+            section_properties=props,
+            releases=Releases(start, end) if (start is not None or end is not None) else None,
+            local_axes=local_axes,
+            structural_role=s(c["member_role"][row]),
+            cross_section_rotation_rad=_opt_float(c["member_rotation"][row]),
+            host_id=_opt_int(c["member_host_id"][row]),
+            host_unique_id=s(c["member_host_unique_id"][row]),
+        ))
+
+    topology = header.get("topology")
+    if topology is not None:
+        topology = dict(topology)
+        topology["csr"] = dict((key, list(c[name])) for name, _, _, key in _TOPOLOGY_COLUMNS)
+
+    counts = header.get("counts") or {}
+    return ExportResult(
+        model=header.get("model"),
+        exported_at=header.get("exported_at"),
+        units=header.get("units"),
+        snap_tolerance_m=header.get("snap_tolerance_m"),
+        counts=ExportCounts(members_total=counts.get("members_total"), nodes_seen=counts.get("nodes_seen")),
+        analytical_nodes=nodes,
+        analytical_members=members,
+        node_consolidation=header.get("node_consolidation"),
+        topology=topology,
+    )
+
+
+__all__ = ["ColumnarBuilder", "write_columnar", "read_columns", "load_columnar", "INT_NONE"]
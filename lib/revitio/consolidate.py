@@ -0,0 +1,179 @@
+"""Node consolidation: merge coincident nodes, give orphan member ends a node.
+
+Real analytical nodes within tolerance of each other are joined with a
+union-find over a uniform grid (cell = tolerance, 27 neighbour cells per
+point), so the pass stays near-linear. Each cluster is represented by its
+lowest node id; the others go to the merge map. Member ends snap to the
+closest real node as before and take that node's representative. Ends
+with no node in reach are clustered the same way among themselves and
+each cluster becomes a virtual node (negative id, position at the mean
+of its ends), so every member with a curve gets both node ids.
+
+Clustering is single linkage: a chain of points each within tolerance
+of the next ends up as one node.
+"""
+import math
+
+from .nodes import NodeIndex, _CELL_PAD
+from .models import Node
+
+
+class UnionFind(object):
+    """Disjoint sets over 0..n-1 (union by size, path halving)."""
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        ra = self.find(a)
+        rb = self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def __len__(self):
+        return len(self.parent)
+
+
+def cluster_points(points, tol):
+    """UnionFind over points ((x, y, z) sequence) joining every pair within tol."""
+    uf = UnionFind(len(points))
+    if tol is None or tol <= 0:
+        return uf
+    inv = 1.0 / (tol * _CELL_PAD)
+    tol2 = tol * tol
+    floor = math.floor
+    cells = {}
+    for n, (x, y, z) in enumerate(points):
+        ci, cj, ck = int(floor(x * inv)), int(floor(y * inv)), int(floor(z * inv))
+        for i in (ci - 1, ci, ci + 1):
+            for j in (cj - 1, cj, cj + 1):
+                for k in (ck - 1, ck, ck + 1):
+                    bucket = cells.get((i, j, k))
+                    if not bucket:
+                        continue
+                    for m in bucket:
+                        px, py, pz = points[m]
+                        dx = x - px
+                        dy = y - py
+                        dz = z - pz
+                        if dx*dx + dy*dy + dz*dz <= tol2:
+                            uf.union(n, m)
+        cells.setdefault((ci, cj, ck), []).append(n)
+    return uf
+
+
+class NodeConsolidation(object):
+    """Result of consolidate(): representatives, merge map, virtual nodes, per-member node ids."""
+
+    def __init__(self, tol_ft):
+        self.tol_ft = tol_ft
+        self.canonical = {}     # real node id -> representative id
+        self.merged = {}        # merged (dropped) node id -> representative id
+        self.virtual = []       # [id, x, y, z, ends] in internal units
+        self.member_nodes = []  # (node_i, node_j) per member, None without a curve
+        self.orphan_ends = 0
+
+    def node_ids(self, n):
+        return self.member_nodes[n]
+
+    def nodes(self, node_objects, factor, units):
+        """node_objects without merged nodes, then the virtual nodes (positions times factor)."""
+        merged = self.merged
+        out = [node for node in node_objects if node.id not in merged]
+        for v in self.virtual:
+            out.append(Node(id=v[0], unique_id=None, position=[v[1] * factor, v[2] * factor, v[3] * factor],
+                            units=units, status="virtual"))
+        return out
+
+    def summary(self):
+        return "Node consolidation: {} nodes merged into {}, {} virtual nodes for {} orphan ends".format(
+            len(self.merged), len(set(self.merged.values())), len(self.virtual), self.orphan_ends)
+
+    def to_dict(self, tol_m=None):
+        return {
+            "tolerance_m": tol_m,
+            "merged": [[nid, self.merged[nid]] for nid in sorted(self.merged)],
+            "virtual": [{"id": v[0], "ends": v[4]} for v in self.virtual],
+            "orphan_ends": self.orphan_ends,
+        }
+
+
+def consolidate(node_map, endpoints, tol_ft):
+    """NodeConsolidation for a NodeIndex (or id -> XYZ map) and per-member endpoints.
+
+    endpoints holds (start XYZ, end XYZ) per member, or None when the
+    member has no curve. Members keep their order in member_nodes.
+    """
+    result = NodeConsolidation(tol_ft)
+    ids = list(node_map.keys())
+    points = [(p.X, p.Y, p.Z) for p in (node_map[nid] for nid in ids)]
+    uf = cluster_points(points, tol_ft)
+    rep = {}
+    for n, nid in enumerate(ids):
+        root = uf.find(n)
+        if root not in rep or nid < rep[root]:
+            rep[root] = nid
+    canonical = result.canonical
+    for n, nid in enumerate(ids):
+        canonical[nid] = rep[uf.find(n)]
+        if canonical[nid] != nid:
+            result.merged[nid] = canonical[nid]
+
+    index = node_map
+    if not isinstance(index, NodeIndex):
+        index = NodeIndex(tol_ft)
+        for nid in ids:
+            index.add(nid, node_map[nid])
+
+    orphans = []  # (member, end, point) per end without a node in reach
+    member_nodes = result.member_nodes
+    for n, ends in enumerate(endpoints):
+        if ends is None or ends[0] is None or ends[1] is None:
+            member_nodes.append(None)
+            continue
+        pair = []
+        for e, pt in enumerate(ends):
+            nid = index.closest(pt.X, pt.Y, pt.Z, tol_ft)
+            if nid is None:
+                orphans.append((n, e, (pt.X, pt.Y, pt.Z)))
+            pair.append(None if nid is None else canonical[nid])
+        member_nodes.append(pair)
+    result.orphan_ends = len(orphans)
+
+    uf = cluster_points([o[2] for o in orphans], tol_ft)
+    virtual_ids = {}
+    sums = result.virtual
+    for n, (member, end, (x, y, z)) in enumerate(orphans):
+        root = uf.find(n)
+        row = virtual_ids.get(root)
+        if row is None:
+            row = virtual_ids[root] = len(sums)
+            sums.append([-(row + 1), 0.0, 0.0, 0.0, 0])
+        v = sums[row]
+        v[1] += x
+        v[2] += y
+        v[3] += z
+        v[4] += 1
+        member_nodes[member][end] = v[0]
+    for v in sums:
+        v[1] /= v[4]
+        v[2] /= v[4]
+        v[3] /= v[4]
+    result.member_nodes = [tuple(p) if p is not None else None for p in member_nodes]
+    return result
+
+
+__all__ = ["UnionFind", "cluster_points", "NodeConsolidation", "consolidate"]
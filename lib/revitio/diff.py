@@ -0,0 +1,262 @@
+"""Export-to-export diff.
+
+Indexes two members_*.json exports by unique_id, one pass each, keeping
+only a small tuple per member, and classifies members as added, removed,
+moved (endpoint shift above tolerance), resectioned, rematerialed or
+rereleased. A member can land in several of the changed lists. The
+resectioned subset can be written in the analytical_members format
+UpdateModelFeatures reads.
+
+    python -m revitio.diff old.json new.json [--tolerance T] [--changeset PATH] [--report PATH]
+"""
+import sys
+import json
+import math
+import argparse
+
+from .utils import UnitScale, SNAP_TOLERANCE_METERS
+from .jsonstream import iter_object
+
+# summary tuple slots
+_ID, _HOST_ID, _HOST_UID, _ENDS, _SECTION, _MATERIAL, _RELEASES = range(7)
+
+
+def _section_key(section):
+    if not section:
+        return None
+    return (section.get("family_name"), section.get("type_name"), section.get("type_id"))
+
+
+def _material_key(material):
+    if not material:
+        return None
+    refs = material.get("all") or []
+    primary = material.get("primary") or {}
+    return ((primary.get("id"), primary.get("name")),) + tuple((r.get("id"), r.get("name")) for r in refs)
+
+
+def _release_flags(rc):
+    if rc is None:
+        return None
+    get = rc.get
+    return (get("fx"), get("fy"), get("fz"), get("mx"), get("my"), get("mz"))
+
+
+def _releases_key(releases):
+    if not releases:
+        return None
+    return (_release_flags(releases.get("start")), _release_flags(releases.get("end")))
+
+
+def _ends(rec):
+    ep = rec.get("endpoints")
+    if not ep:
+        return None
+    return tuple(ep["i"]) + tuple(ep["j"])
+
+
+def summarize(rec, shared=None):
+    """Compact tuple of what the diff compares for one member dict.
+
+    Section, material and release keys repeat across members; pass the
+    same shared dict for a whole export to keep one copy of each.
+    """
+    section = _section_key(rec.get("section"))
+    material = _material_key(rec.get("material"))
+    releases = _releases_key(rec.get("releases"))
+    if shared is not None:
+        section = shared.setdefault(section, section)
+        material = shared.setdefault(material, material)
+        releases = shared.setdefault(releases, releases)
+    return (
+        rec.get("id"),
+        rec.get("host_id"),
+        rec.get("host_unique_id"),
+        _ends(rec),
+        section,
+        material,
+        releases,
+    )
+
+
+# header fields index_export keeps; nodes, topology and node_consolidation are skipped unbuilt
+_HEADER_KEYS = ("model", "exported_at", "units", "snap_tolerance_m", "counts")
+
+
+def index_export(path):
+    """(header dict, {unique_id: summary}) for one export JSON.
+
+    Members are streamed, so only one member dict is alive at a time next
+    to the summaries; other large sections are skipped without decoding.
+    """
+    header = {}
+    index = {}
+    shared = {}
+    with open(path, "r") as fp:
+        for key, value in iter_object(fp, stream=("analytical_members",), keep=_HEADER_KEYS):
+            if key == "analytical_members":
+                uid = value.get("unique_id")
+                if uid is not None:
+                    index[uid] = summarize(value, shared)
+            else:
+                header[key] = value
+    return header, index
+
+
+def _shift(a, b):
+    """Largest endpoint displacement between two (i + j) 6-tuples."""
+    di = math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+    dj = math.sqrt((a[3] - b[3]) ** 2 + (a[4] - b[4]) ** 2 + (a[5] - b[5]) ** 2)
+    return max(di, dj)
+
+
+def default_tolerance(units):
+    """SNAP_TOLERANCE_METERS expressed in the export's units."""
+    scale = UnitScale(units or "meters")
+    return SNAP_TOLERANCE_METERS * scale.internal_per_meter * scale.factor
+
+
+class ExportDiff(object):
+    """Member-level differences between an old and a new export."""
+
+    def __init__(self, old_path, new_path, tolerance=None):
+        self.old_path = old_path
+        self.new_path = new_path
+        old_header, old = index_export(old_path)
+        new_header, new = index_export(new_path)
+        units = new_header.get("units")
+        if old_header.get("units") != units:
+            raise ValueError("Exports use different units: {} vs {}".format(old_header.get("units"), units))
+        self.units = units
+        self.tolerance = default_tolerance(units) if tolerance is None else float(tolerance)
+        self.added = []
+        self.removed = []
+        self.moved = []          # (uid, shift)
+        self.resectioned = []    # (uid, old section key, new section key)
+        self.rematerialed = []
+        self.rereleased = []
+        self.unchanged = 0
+        self._new = new
+        self._compare(old, new)
+
+    def _compare(self, old, new):
+        tol = self.tolerance
+        for uid, cur in new.items():
+            prev = old.pop(uid, None)
+            if prev is None:
+                self.added.append(uid)
+                continue
+            changed = False
+            a, b = prev[_ENDS], cur[_ENDS]
+            if a != b:
+                shift = _shift(a, b) if a is not None and b is not None else None
+                if shift is None or shift > tol:
+                    self.moved.append((uid, shift))
+                    changed = True
+            if prev[_SECTION] != cur[_SECTION]:
+                self.resectioned.append((uid, prev[_SECTION], cur[_SECTION]))
+                changed = True
+            if prev[_MATERIAL] != cur[_MATERIAL]:
+                self.rematerialed.append((uid, prev[_MATERIAL], cur[_MATERIAL]))
+                changed = True
+            if prev[_RELEASES] != cur[_RELEASES]:
+                self.rereleased.append(uid)
+                changed = True
+            if not changed:
+                self.unchanged += 1
+        # whatever is left in old was not seen in new
+        self.removed = list(old)
+
+    def counts(self):
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "moved": len(self.moved),
+            "resectioned": len(self.resectioned),
+            "rematerialed": len(self.rematerialed),
+            "rereleased": len(self.rereleased),
+            "unchanged": self.unchanged,
+        }
+
+    def to_dict(self):
+        def section(key):
+            return None if key is None else {"family_name": key[0], "type_name": key[1], "type_id": key[2]}
+
+        def material(key):
+            if key is None:
+                return None
+            return {"primary": {"id": key[0][0], "name": key[0][1]}, "all": [{"id": i, "name": n} for i, n in key[1:]]}
+
+        return {
+            "old": self.old_path,
+            "new": self.new_path,
+            "units": self.units,
+            "tolerance": self.tolerance,
+            "counts": self.counts(),
+            "added": self.added,
+            "removed": self.removed,
+            "moved": [{"unique_id": uid, "shift": shift} for uid, shift in self.moved],
+            "resectioned": [
+                {"unique_id": uid, "from": section(a), "to": section(b)} for uid, a, b in self.resectioned
+            ],
+            "rematerialed": [
+                {"unique_id": uid, "from": material(a), "to": material(b)} for uid, a, b in self.rematerialed
+            ],
+            "rereleased": self.rereleased,
+        }
+
+    def changeset(self):
+        """Resectioned members in UpdateModelFeatures input format (hosted ones only)."""
+        out = []
+        for uid, _, key in self.resectioned:
+            cur = self._new[uid]
+            if key is None or (cur[_HOST_ID] is None and cur[_HOST_UID] is None):
+                continue
+            out.append({
+                "id": cur[_ID],
+                "unique_id": uid,
+                "host_id": cur[_HOST_ID],
+                "host_unique_id": cur[_HOST_UID],
+                "section": {"family_name": key[0], "type_name": key[1], "type_id": key[2]},
+            })
+        return {"analytical_members": out}
+
+    def write_changeset(self, path):
+        data = self.changeset()
+        with open(path, "w") as fp:
+            json.dump(data, fp, indent=2)
+        return len(data["analytical_members"])
+
+    def write_report(self, path):
+        with open(path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+        return path
+
+
+def diff_exports(old_path, new_path, tolerance=None):
+    return ExportDiff(old_path, new_path, tolerance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two analytical member exports.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="endpoint shift counted as a move, in export units (default snap tolerance)")
+    parser.add_argument("--changeset", help="write resectioned members as UpdateModelFeatures input")
+    parser.add_argument("--report", help="write the full diff as JSON")
+    args = parser.parse_args(argv)
+    diff = ExportDiff(args.old, args.new, args.tolerance)
+    print(json.dumps(diff.counts(), sort_keys=True))
+    if args.changeset:
+        print("changeset: {} members -> {}".format(diff.write_changeset(args.changeset), args.changeset))
+    if args.report:
+        print("report -> {}".format(diff.write_report(args.report)))
+    return 0
+
+
+__all__ = ["ExportDiff", "diff_exports", "index_export", "summarize"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
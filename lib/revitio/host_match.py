@@ -6,7 +6,18 @@ try:
 except Exception:  # allow outside Revit
     FilteredElementCollector = BuiltInCategory = Curve = XYZ = Element = object
 
-from .utils import meters_to_internal, HOST_MATCH_TOL_METERS, log_msg
+try:  # optional, only used by BatchHostMatcher
+    import numpy as np
+except Exception:
+    np = None
+
+from .utils import meters_to_internal, HOST_MATCH_TOL_METERS, get_logger
+
+_MAX_ANGLE_RAD = math.radians(10.0)
+# Unit-vector grid for the direction buckets. Two directions within 10deg
+# are at most 2*sin(5deg) ~= 0.174 apart, so neighbouring 0.2 cells cover it.
+_DIR_CELL = 0.2
+_CELL_PAD = 1.0 + 1e-9
 
 
 def angle_between(v1, v2):
@@ -19,28 +30,334 @@ def angle_between(v1, v2):
         return math.pi
 
 
-def find_physical_host_for_member(doc, pi, pj, log_file=None):
-    """Heuristic host match (angle<=10deg, mid<=3x tol, score<=6x tol)."""
+def _unit(vx, vy, vz):
+    length = math.sqrt(vx*vx + vy*vy + vz*vz)
+    if length <= 0.0:
+        return None
+    return vx / length, vy / length, vz / length
+
+
+def _dir_key(u):
+    return (int(math.floor(u[0] / _DIR_CELL)), int(math.floor(u[1] / _DIR_CELL)), int(math.floor(u[2] / _DIR_CELL)))
+
+
+def _dist(ax, ay, az, bx, by, bz):
+    dx = ax - bx
+    dy = ay - by
+    dz = az - bz
+    return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+
+def collect_host_candidates(doc):
+    """Structural framing then columns (collector order)."""
+    frames = (
+        FilteredElementCollector(doc)
+        .OfCategory(BuiltInCategory.OST_StructuralFraming)
+        .WhereElementIsNotElementType()
+        .ToElements()
+    )
+    cols = (
+        FilteredElementCollector(doc)
+        .OfCategory(BuiltInCategory.OST_StructuralColumns)
+        .WhereElementIsNotElementType()
+        .ToElements()
+    )
+    return list(frames) + list(cols)
+
+
+class HostMatchIndex(object):
+    """Physical host curves bucketed by midpoint and direction.
+
+    Built once per export. Endpoints are held as plain float tuples so a
+    query never touches the API; tolerances and tie-breaking match the
+    old per-member collector scan.
+    """
+
+    def __init__(self, tol_ft):
+        self.tol_ft = tol_ft
+        self.mid_cell = tol_ft * 3.0 * _CELL_PAD
+        self._inv = 1.0 / self.mid_cell if self.mid_cell > 0 else 0.0
+        self._cells = {}  # mid key -> {dir key: [entry]}
+        self._count = 0
+
+    @classmethod
+    def from_document(cls, doc, tol_ft=None):
+        if tol_ft is None:
+            tol_ft = meters_to_internal(HOST_MATCH_TOL_METERS)
+        index = cls(tol_ft)
+        try:
+            candidates = collect_host_candidates(doc)
+        except Exception:
+            candidates = []
+        for inst in candidates:
+            try:
+                loc = getattr(inst, "Location", None)
+                if loc is None or not hasattr(loc, "Curve"):
+                    continue
+                crv = loc.Curve
+                if not isinstance(crv, Curve):
+                    continue
+                a = crv.GetEndPoint(0)
+                b = crv.GetEndPoint(1)
+                index.add(inst, (a.X, a.Y, a.Z), (b.X, b.Y, b.Z))
+            except Exception:
+                continue
+        return index
+
+    def __len__(self):
+        return self._count
+
+    def entries(self):
+        """(host, a, b) for every indexed curve in insertion order."""
+        out = [e for dirs in self._cells.values() for bucket in dirs.values() for e in bucket]
+        out.sort(key=lambda e: e[0])
+        return [(e[1], e[2], e[3]) for e in out]
+
+    def _mid_key(self, x, y, z):
+        inv = self._inv
+        return (int(math.floor(x * inv)), int(math.floor(y * inv)), int(math.floor(z * inv)))
+
+    def add(self, host, a, b):
+        """Add host with curve endpoints a, b (x, y, z tuples)."""
+        u = _unit(b[0] - a[0], b[1] - a[1], b[2] - a[2])
+        if u is None:
+            # zero-length curve can never pass the angle test
+            return
+        entry = (
+            self._count, host, a, b,
+            ((a[0] + b[0]) * 0.5, (a[1] + b[1]) * 0.5, (a[2] + b[2]) * 0.5),
+            u,
+        )
+        self._count += 1
+        mid_key = self._mid_key(*entry[4])
+        self._cells.setdefault(mid_key, {}).setdefault(_dir_key(u), []).append(entry)
+
+    def match(self, pi, pj):
+        """Best host for member ends pi, pj (x, y, z tuples) or None."""
+        if not self._inv:
+            return None
+        u = _unit(pj[0] - pi[0], pj[1] - pi[1], pj[2] - pi[2])
+        if u is None:
+            return None
+        tol_ft = self.tol_ft
+        mid = ((pi[0] + pj[0]) * 0.5, (pi[1] + pj[1]) * 0.5, (pi[2] + pj[2]) * 0.5)
+        ci, cj, ck = self._mid_key(*mid)
+        di, dj, dk = _dir_key(u)
+        best = None
+        best_score = None
+        best_seq = None
+        for i in (ci - 1, ci, ci + 1):
+            for j in (cj - 1, cj, cj + 1):
+                for k in (ck - 1, ck, ck + 1):
+                    dir_buckets = self._cells.get((i, j, k))
+                    if not dir_buckets:
+                        continue
+                    for key, bucket in dir_buckets.items():
+                        if abs(key[0] - di) > 1 or abs(key[1] - dj) > 1 or abs(key[2] - dk) > 1:
+                            continue
+                        for seq, host, a, b, ph_mid, v in bucket:
+                            dot = max(min(u[0]*v[0] + u[1]*v[1] + u[2]*v[2], 1.0), -1.0)
+                            if math.acos(dot) > _MAX_ANGLE_RAD:
+                                continue
+                            if _dist(mid[0], mid[1], mid[2], ph_mid[0], ph_mid[1], ph_mid[2]) > tol_ft * 3.0:
+                                continue
+                            score = min(
+                                _dist(pi[0], pi[1], pi[2], a[0], a[1], a[2]) + _dist(pj[0], pj[1], pj[2], b[0], b[1], b[2]),
+                                _dist(pi[0], pi[1], pi[2], b[0], b[1], b[2]) + _dist(pj[0], pj[1], pj[2], a[0], a[1], a[2]),
+                            )
+                            # Collector scan kept the first of equal scores
+                            if best is None or score < best_score or (score == best_score and seq < best_seq):
+                                best = host
+                                best_score = score
+                                best_seq = seq
+        if best is not None and best_score <= tol_ft * 6.0:
+            return best
+        return None
+
+
+class BatchHostMatcher(object):
+    """HostMatchIndex.match for many members at once, vectorised with NumPy.
+
+    The index's curves are loaded once into N x 3 arrays sorted by
+    midpoint cell. Each member is paired with the curves in its 27
+    neighbouring cells (searchsorted per cell offset) and all pairs are
+    scored in one pass: angle <= 10deg, midpoints <= 3x tol, best end
+    pairing sum <= 6x tol, ties to the first indexed curve. Without NumPy
+    (or use_numpy=False) match_many loops over index.match instead.
+    """
+
+    def __init__(self, index, use_numpy=None, chunk_size=50000):
+        self.index = index
+        self.use_numpy = np is not None and (use_numpy is None or bool(use_numpy)) and index._inv > 0
+        self.chunk_size = chunk_size
+        if self.use_numpy:
+            self._load()
+
+    def _load(self):
+        entries = sorted(e for dirs in self.index._cells.values() for bucket in dirs.values() for e in bucket)
+        self.hosts = [e[1] for e in entries]
+        n = len(entries)
+        self.seq = np.array([e[0] for e in entries], dtype=np.int64)
+        self.a = np.array([e[2] for e in entries], dtype=float).reshape(n, 3)
+        self.b = np.array([e[3] for e in entries], dtype=float).reshape(n, 3)
+        self.mid = np.array([e[4] for e in entries], dtype=float).reshape(n, 3)
+        self.u = np.array([e[5] for e in entries], dtype=float).reshape(n, 3)
+        cells = np.floor(self.mid * self.index._inv).astype(np.int64)
+        # pack cell keys into one int64, with a one cell margin for neighbours
+        self.cell_min = cells.min(axis=0) - 1 if n else np.zeros(3, dtype=np.int64)
+        self.cell_span = (cells.max(axis=0) + 2 - self.cell_min) if n else np.ones(3, dtype=np.int64)
+        keys = self._pack(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def _pack(self, cells):
+        rel = cells - self.cell_min
+        return (rel[:, 0] * self.cell_span[1] + rel[:, 1]) * self.cell_span[2] + rel[:, 2]
+
+    def _pairs(self, cells):
+        """(member row, curve row) for every curve in the 27 cells around each member."""
+        span = self.cell_span
+        rel = cells - self.cell_min
+        # members outside the padded curve box have no curve nearby
+        rows = np.nonzero(np.all((rel >= 0) & (rel < span), axis=1))[0]
+        empty = np.zeros(0, dtype=np.int64)
+        if not len(rows):
+            return empty, empty
+        keys = self._pack(cells[rows])
+        by_key = np.argsort(keys, kind="stable")
+        rows = rows[by_key]
+        keys = keys[by_key]
+        members = []
+        curves = []
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for dk in (-1, 0, 1):
+                    # packed keys are linear in the cell, so a neighbour is a fixed
+                    # offset and the queries stay sorted; cells wrapped at the box
+                    # edge only add pairs the distance test drops
+                    near = keys + ((di * span[1] + dj) * span[2] + dk)
+                    lo = np.searchsorted(self.keys, near, side="left")
+                    counts = np.searchsorted(self.keys, near, side="right") - lo
+                    total = int(counts.sum())
+                    if not total:
+                        continue
+                    starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+                    members.append(np.repeat(rows, counts))
+                    curves.append(self.order[starts + np.arange(total)])
+        if not members:
+            return empty, empty
+        return np.concatenate(members), np.concatenate(curves)
+
+    def _match_chunk(self, pi, pj):
+        """Curve row per member (-1 for none) for M x 3 end arrays."""
+        tol_ft = self.index.tol_ft
+        best = np.full(len(pi), -1, dtype=np.int64)
+        v = pj - pi
+        length = np.sqrt(v[:, 0]*v[:, 0] + v[:, 1]*v[:, 1] + v[:, 2]*v[:, 2])
+        ok = length > 0.0
+        if not ok.any() or not len(self.hosts):
+            return best
+        rows = np.nonzero(ok)[0]
+        pi = pi[rows]
+        pj = pj[rows]
+        u = v[rows] / length[rows][:, None]
+        mid = (pi + pj) * 0.5
+        m, c = self._pairs(np.floor(mid * self.index._inv).astype(np.int64))
+        if not len(m):
+            return best
+        uc = self.u[c]
+        um = u[m]
+        dot = np.clip(um[:, 0]*uc[:, 0] + um[:, 1]*uc[:, 1] + um[:, 2]*uc[:, 2], -1.0, 1.0)
+        keep = (np.arccos(dot) <= _MAX_ANGLE_RAD) & (_norm(mid[m] - self.mid[c]) <= tol_ft * 3.0)
+        m = m[keep]
+        c = c[keep]
+        a = self.a[c]
+        b = self.b[c]
+        score = np.minimum(
+            _norm(pi[m] - a) + _norm(pj[m] - b),
+            _norm(pi[m] - b) + _norm(pj[m] - a),
+        )
+        # lowest score per member, then the first indexed curve
+        order = np.lexsort((self.seq[c], score, m))
+        m = m[order]
+        first = np.ones(len(m), dtype=bool)
+        first[1:] = m[1:] != m[:-1]
+        pick = order[first]
+        good = score[pick] <= tol_ft * 6.0
+        best[rows[m[first][good]]] = c[pick][good]
+        return best
+
+    def match_many(self, ends):
+        """Host or None per member; ends holds (pi, pj) XYZ/tuple pairs or None."""
+        if not self.use_numpy:
+            out = []
+            for pair in ends:
+                if pair is None or pair[0] is None or pair[1] is None:
+                    out.append(None)
+                else:
+                    pi, pj = pair
+                    pi = (pi.X, pi.Y, pi.Z) if hasattr(pi, "X") else tuple(pi)
+                    pj = (pj.X, pj.Y, pj.Z) if hasattr(pj, "X") else tuple(pj)
+                    out.append(self.index.match(pi, pj))
+            return out
+        rows = []
+        coords = []
+        for n, pair in enumerate(ends):
+            if pair is None or pair[0] is None or pair[1] is None:
+                continue
+            pi, pj = pair
+            if hasattr(pi, "X"):
+                coords.append((pi.X, pi.Y, pi.Z, pj.X, pj.Y, pj.Z))
+            else:
+                coords.append(tuple(pi) + tuple(pj))
+            rows.append(n)
+        return self._match_rows(np.array(coords, dtype=float).reshape(len(rows), 6), rows, len(ends))
+
+    def match_array(self, ends, skip=None):
+        """Host or None per row of an M x 6 end array (NaN rows have no curve); NumPy only.
+
+        Rows flagged true in skip (one flag per row) are not scored and give None.
+        """
+        ends = np.asarray(ends, dtype=float).reshape(-1, 6)
+        scored = ~np.isnan(ends).any(axis=1)
+        if skip is not None:
+            scored &= ~np.asarray(skip, dtype=bool)
+        rows = np.nonzero(scored)[0]
+        return self._match_rows(ends[rows], rows, len(ends))
+
+    def _match_rows(self, coords, rows, total):
+        out = [None] * total
+        hosts = self.hosts
+        for start in range(0, len(rows), self.chunk_size):
+            block = coords[start:start + self.chunk_size]
+            best = self._match_chunk(block[:, 0:3], block[:, 3:6])
+            for k in np.nonzero(best >= 0)[0]:
+                out[rows[start + k]] = hosts[best[k]]
+        return out
+
+
+def _norm(d):
+    return np.sqrt(d[:, 0]*d[:, 0] + d[:, 1]*d[:, 1] + d[:, 2]*d[:, 2])
+
+
+def find_physical_host_for_member(doc, pi, pj, log_file=None, index=None):
+    """Heuristic host match (angle<=10deg, mid<=3x tol, score<=6x tol).
+
+    Uses a prebuilt HostMatchIndex when given, else scans the document.
+    """
     if pi is None or pj is None:
         return None
+    if index is not None:
+        best = index.match((pi.X, pi.Y, pi.Z), (pj.X, pj.Y, pj.Z))
+        if best is None and log_file:
+            get_logger(log_file).debug("No physical host matched within tolerance")
+        return best
     tol_ft = meters_to_internal(HOST_MATCH_TOL_METERS)
     line_vec = pj - pi
     mid = XYZ((pi.X + pj.X) * 0.5, (pi.Y + pj.Y) * 0.5, (pi.Z + pj.Z) * 0.5)
     candidates = []
     try:
-        frames = (
-            FilteredElementCollector(doc)
-            .OfCategory(BuiltInCategory.OST_StructuralFraming)
-            .WhereElementIsNotElementType()
-            .ToElements()
-        )
-        cols = (
-            FilteredElementCollector(doc)
-            .OfCategory(BuiltInCategory.OST_StructuralColumns)
-            .WhereElementIsNotElementType()
-            .ToElements()
-        )
-        candidates = list(frames) + list(cols)
+        candidates = collect_host_candidates(doc)
     except Exception:
         candidates = []
     best = None
@@ -75,7 +392,7 @@ def find_physical_host_for_member(doc, pi, pj, log_file=None):
     if best is not None and best_score is not None and best_score <= tol_ft * 6.0:
         return best
     if log_file:
-        log_msg("No physical host matched within tolerance", log_file)
+        get_logger(log_file).debug("No physical host matched within tolerance")
     return None
 
-__all__ = ["find_physical_host_for_member"]
+__all__ = ["HostMatchIndex", "BatchHostMatcher", "collect_host_candidates", "find_physical_host_for_member"]
@@ -0,0 +1,294 @@
+"""Dirty tracking for incremental re-exports.
+
+A state sidecar (export_state_<model>.json) keeps the path of the last
+export plus one fingerprint per analytical member, node, physical host
+and material. On the next run a member record is reused from the last export
+only when its own fingerprint (element, section type, direct host,
+endpoints) is unchanged, no changed node lands within snap tolerance of
+its ends, no changed host would now pass the host match for it, and the
+host and materials it references are unchanged. Everything else is
+rebuilt, so the output matches a full export.
+
+Fingerprints use Element.VersionGuid where the API has it (2024+) and
+fall back to hashing parameter values.
+"""
+import os
+import json
+import hashlib
+
+try:
+    from Autodesk.Revit.DB import FilteredElementCollector, Material
+except Exception:  # allow outside Revit
+    FilteredElementCollector = Material = object
+
+from .utils import eid_to_int, eid_positive
+from .nodes import NodeIndex
+from .host_match import HostMatchIndex
+from .models import MemberRecord
+from .jsonstream import iter_array
+
+STATE_FORMAT = 1
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:20]
+
+
+def _param_value(p):
+    st = str(getattr(p, "StorageType", ""))
+    try:
+        if st.endswith("Double"):
+            return repr(p.AsDouble())
+        if st.endswith("Integer"):
+            return str(p.AsInteger())
+        if st.endswith("String"):
+            return p.AsString()
+        if st.endswith("ElementId"):
+            return str(eid_to_int(p.AsElementId()))
+    except Exception:
+        pass
+    return None
+
+
+def element_fingerprint(elem):
+    """VersionGuid when available, else a hash of name and parameter values."""
+    if elem is None:
+        return None
+    try:
+        guid = getattr(elem, "VersionGuid", None)
+        if guid is not None:
+            return str(guid)
+    except Exception:
+        pass
+    items = []
+    try:
+        for p in elem.Parameters:
+            try:
+                items.append((p.Definition.Name, str(_param_value(p))))
+            except Exception:
+                continue
+    except Exception:
+        pass
+    items.sort()
+    return _digest((getattr(elem, "Name", None), items))
+
+
+def direct_host_id(member):
+    """Int id of the member's associated physical element, or None."""
+    try:
+        if hasattr(member, "GetElementId"):
+            pid = member.GetElementId()
+            if eid_positive(pid):
+                return eid_to_int(pid)
+    except Exception:
+        pass
+    return None
+
+
+def load_state(path):
+    """Previous state dict or None when missing/unreadable/other format."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as fp:
+            state = json.load(fp)
+    except Exception:
+        return None
+    if not isinstance(state, dict) or state.get("format") != STATE_FORMAT:
+        return None
+    return state
+
+
+def load_members(path):
+    """unique_id -> MemberRecord of an export JSON, streamed one member at a time."""
+    members = {}
+    with open(path, "r") as fp:
+        for d in iter_array(fp, "analytical_members"):
+            rec = MemberRecord.from_dict(d)
+            members[rec.unique_id] = rec
+    return members
+
+
+class DirtyTracker(object):
+    """Decides per member whether the previous record can be reused.
+
+    settings holds everything that changes every record (units, tolerances);
+    any difference from the stored state forces a full rebuild.
+    """
+
+    def __init__(self, doc, state=None, settings=None):
+        self.doc = doc
+        self.settings = settings or {}
+        self.state = state
+        self.previous = {}       # unique_id -> MemberRecord from the last export
+        self.full_reason = None  # why nothing can be reused, if so
+        self._changed_nodes = None
+        self._removed_nodes = set()
+        self._changed_hosts = None
+        self._changed_host_uids = set()
+        self._changed_materials = set()
+        self._type_fps = {}
+        self._host_fps = {}
+        self.new_members = {}
+        self.new_nodes = {}
+        self.new_hosts = {}
+        self.new_materials = {}
+        self.reused = 0
+        self.rebuilt = {}        # reason -> count
+
+    def prepare(self, node_objects, node_map, host_index):
+        """Diff nodes, hosts and materials against the stored state."""
+        state = self.state
+        if state is None:
+            self.full_reason = "no previous state"
+        elif state.get("settings") != self.settings:
+            self.full_reason = "export settings changed"
+        else:
+            try:
+                self.previous = load_members(state.get("export"))
+            except Exception:
+                self.full_reason = "previous export unreadable"
+        self._diff_nodes(node_objects, node_map)
+        self._diff_hosts(host_index)
+        self._diff_materials()
+        return self
+
+    def _diff_nodes(self, node_objects, node_map):
+        prev = dict((self.state or {}).get("nodes") or {})
+        changed = NodeIndex(node_map.cell_size if isinstance(node_map, NodeIndex) else 0.0)
+        for n in node_objects:
+            key = str(n.id)
+            fp = self.new_nodes[key] = _digest(n.to_dict())
+            if prev.pop(key, None) != fp and n.id in node_map:
+                changed.add(n.id, node_map[n.id])
+        self._removed_nodes = set(int(k) for k in prev if k != "None") | set(changed.keys())
+        self._changed_nodes = changed
+
+    def _diff_hosts(self, host_index):
+        prev = (self.state or {}).get("hosts") or {}
+        changed = HostMatchIndex(host_index.tol_ft)
+        for host, a, b in host_index.entries():
+            uid = host.UniqueId
+            fp = _digest((self.host_fingerprint(host), a, b))
+            self.new_hosts[uid] = fp
+            if prev.get(uid) != fp:
+                changed.add(host, a, b)
+                self._changed_host_uids.add(uid)
+        self._changed_host_uids.update(uid for uid in prev if uid not in self.new_hosts)
+        self._changed_hosts = changed
+
+    def _diff_materials(self):
+        prev = (self.state or {}).get("materials") or {}
+        try:
+            mats = FilteredElementCollector(self.doc).OfClass(Material).ToElements()
+        except Exception:
+            mats = []
+        for me in mats:
+            key = str(eid_to_int(me.Id))
+            fp = element_fingerprint(me)
+            self.new_materials[key] = fp
+            if prev.get(key) != fp:
+                self._changed_materials.add(key)
+        self._changed_materials.update(k for k in prev if k not in self.new_materials)
+
+    def type_fingerprint(self, type_id):
+        key = eid_to_int(type_id)
+        fp = self._type_fps.get(key)
+        if fp is None and key not in self._type_fps:
+            fp = element_fingerprint(self.doc.GetElement(type_id)) if eid_positive(type_id) else None
+            self._type_fps[key] = fp
+        return fp
+
+    def host_fingerprint(self, host):
+        key = eid_to_int(host.Id)
+        fp = self._host_fps.get(key)
+        if fp is None:
+            try:
+                type_fp = self.type_fingerprint(host.GetTypeId())
+            except Exception:
+                type_fp = None
+            fp = self._host_fps[key] = _digest((element_fingerprint(host), type_fp))
+        return fp
+
+    def member_fingerprint(self, member, pi, pj):
+        try:
+            type_fp = self.type_fingerprint(member.SectionTypeId) if hasattr(member, "SectionTypeId") else None
+        except Exception:
+            type_fp = None
+        pid = direct_host_id(member)
+        host_fp = None
+        if pid is not None:
+            host = self.doc.GetElement(member.GetElementId())
+            host_fp = self.host_fingerprint(host) if host is not None else None
+        ends = None if pi is None or pj is None else ((pi.X, pi.Y, pi.Z), (pj.X, pj.Y, pj.Z))
+        return _digest((element_fingerprint(member), type_fp, pid, host_fp, ends))
+
+    def _dirty_reason(self, record, pi, pj, tol_ft):
+        if record.node_i in self._removed_nodes or record.node_j in self._removed_nodes:
+            return "node"
+        if pi is None or pj is None:
+            return None
+        ends = ((pi.X, pi.Y, pi.Z), (pj.X, pj.Y, pj.Z))
+        changed = self._changed_nodes
+        if len(changed) and (changed.closest(pi.X, pi.Y, pi.Z, tol_ft) is not None
+                             or changed.closest(pj.X, pj.Y, pj.Z, tol_ft) is not None):
+            return "node"
+        if record.host_unique_id in self._changed_host_uids:
+            return "host"
+        if len(self._changed_hosts) and self._changed_hosts.match(ends[0], ends[1]) is not None:
+            return "host"
+        if record.material is not None and self._changed_materials:
+            refs = list(record.material.all)
+            if record.material.primary is not None:
+                refs.append(record.material.primary)
+            if any(str(r.id) in self._changed_materials for r in refs):
+                return "material"
+        return None
+
+    def reuse(self, member, pi, pj, tol_ft):
+        """Previous MemberRecord if still valid, else None (caller rebuilds)."""
+        uid = member.UniqueId
+        fp = self.new_members[uid] = self.member_fingerprint(member, pi, pj)
+        if self.full_reason is not None:
+            reason = "full"
+        else:
+            record = self.previous.get(uid)
+            prev_fp = self.state["members"].get(uid)
+            if record is None or prev_fp is None:
+                reason = "new"
+            elif prev_fp != fp:
+                reason = "member"
+            else:
+                reason = self._dirty_reason(record, pi, pj, tol_ft)
+                if reason is None:
+                    self.reused += 1
+                    return record
+        self.rebuilt[reason] = self.rebuilt.get(reason, 0) + 1
+        return None
+
+    def save(self, path, export_path):
+        state = {
+            "format": STATE_FORMAT,
+            "export": os.path.abspath(export_path),
+            "settings": self.settings,
+            "members": self.new_members,
+            "nodes": self.new_nodes,
+            "hosts": self.new_hosts,
+            "materials": self.new_materials,
+        }
+        with open(path, "w") as fp:
+            json.dump(state, fp, separators=(",", ":"))
+        return path
+
+    def summary(self):
+        rebuilt = sum(self.rebuilt.values())
+        detail = ", ".join("{} {}".format(k, self.rebuilt[k]) for k in sorted(self.rebuilt))
+        text = "Incremental export: {} reused, {} rebuilt".format(self.reused, rebuilt)
+        if detail:
+            text += " ({})".format(detail)
+        if self.full_reason:
+            text += "; full rebuild: " + self.full_reason
+        return text
+
+
+__all__ = ["DirtyTracker", "load_state", "load_members", "element_fingerprint", "direct_host_id"]
@@ -0,0 +1,281 @@
+"""Incremental JSON writer and reader for exports.
+
+Output with compact=False is byte-identical to
+json.dump(result.to_dict(), fp, indent=2); compact=True drops all
+whitespace. Members are written as they are produced, so only one
+member dict is alive at a time. iter_object / iter_array read the same
+files back one array element at a time, optionally keeping only some
+fields; skipped values are scanned, never built. Pure Python (re and
+json only), so it runs under IronPython too.
+"""
+import re
+import json
+
+try:  # CPython's C scanner; IronPython has only the pure-Python one
+    from json.scanner import c_make_scanner as _c_scanner
+except Exception:
+    _c_scanner = None
+
+_COMPACT = (",", ":")
+_WS = re.compile(r"[ \t\n\r]*")
+_AFTER_VALUE = frozenset(" \t\n\r,:]}")
+_STRUCT = re.compile(r'[\[\]{}"]')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+
+
+class JsonStreamWriter(object):
+    """Writes one top-level JSON object field by field."""
+
+    def __init__(self, fp, compact=False):
+        self.fp = fp
+        self.compact = compact
+        self._fields = 0
+        self._items = 0
+
+    def _dumps(self, value, pad):
+        if self.compact:
+            return json.dumps(value, separators=_COMPACT)
+        text = json.dumps(value, indent=2)
+        return text.replace("\n", "\n" + pad) if "\n" in text else text
+
+    def _key(self, key):
+        if self.compact:
+            sep = "," if self._fields else ""
+            self.fp.write(sep + json.dumps(key) + ":")
+        else:
+            sep = ",\n  " if self._fields else "\n  "
+            self.fp.write(sep + json.dumps(key) + ": ")
+        self._fields += 1
+
+    def begin(self):
+        self.fp.write("{")
+
+    def field(self, key, value):
+        self._key(key)
+        self.fp.write(self._dumps(value, "  "))
+
+    def begin_array(self, key):
+        self._key(key)
+        self.fp.write("[")
+        self._items = 0
+
+    def item(self, value):
+        if self.compact:
+            self.fp.write(("," if self._items else "") + self._dumps(value, ""))
+        else:
+            self.fp.write((",\n    " if self._items else "\n    ") + self._dumps(value, "    "))
+        self._items += 1
+
+    def end_array(self):
+        if self._items and not self.compact:
+            self.fp.write("\n  ]")
+        else:
+            self.fp.write("]")
+        return self._items
+
+    def end(self):
+        if self._fields and not self.compact:
+            self.fp.write("\n}")
+        else:
+            self.fp.write("}")
+
+
+def write_export_stream(fp, result, members, compact=False):
+    """Write result header, nodes, then each record from members.
+
+    members is any iterable of MemberRecord (typically a generator).
+    When result.counts.members_total is None the real count is written
+    in a trailing counts field after the members instead. Returns the
+    number of members written.
+    """
+    writer = JsonStreamWriter(fp, compact=compact)
+    writer.begin()
+    writer.field("model", result.model)
+    writer.field("exported_at", result.exported_at)
+    writer.field("units", result.units)
+    writer.field("snap_tolerance_m", result.snap_tolerance_m)
+    counts_known = result.counts is not None and result.counts.members_total is not None
+    if counts_known:
+        writer.field("counts", result.counts.to_dict())
+    if getattr(result, "node_consolidation", None) is not None:
+        writer.field("node_consolidation", result.node_consolidation)
+    writer.begin_array("analytical_nodes")
+    for node in result.analytical_nodes:
+        writer.item(node.to_dict())
+    writer.end_array()
+    writer.begin_array("analytical_members")
+    for rec in members:
+        writer.item(rec.to_dict())
+    written = writer.end_array()
+    if not counts_known:
+        nodes_seen = result.counts.nodes_seen if result.counts is not None else len(result.analytical_nodes)
+        writer.field("counts", {"members_total": written, "nodes_seen": nodes_seen})
+    topology = getattr(result, "topology", None)
+    if topology is not None:
+        # filled while the members went by (ConnectivityGraph.tee)
+        writer.field("topology", topology if isinstance(topology, dict) else topology.to_dict())
+    writer.end()
+    return written
+
+
+class _Buffer(object):
+    """Text window over fp; decodes values with the C scanner, reading more on demand."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decode = json.JSONDecoder().raw_decode
+
+    def more(self, size=None):
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace char (not consumed), '' at end of input."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError("Expected {!r} at offset {} of buffer".format(char, self.pos))
+        self.pos += 1
+
+    def skip(self):
+        """Consume one value without building it."""
+        if self.peek() not in ("[", "{"):
+            self.value()  # scalars are cheap to decode
+            return
+        depth = 0
+        pos = self.pos
+        while True:
+            m = _STRUCT.search(self.buf, pos)
+            if m is None:
+                self.pos = len(self.buf)  # nothing structural left, drop it
+                if not self.more():
+                    raise ValueError("Truncated JSON value")
+                pos = 0
+                continue
+            ch = m.group()
+            if ch == '"':
+                sm = _STRING.match(self.buf, m.start())
+                if sm is None:
+                    self.pos = m.start()  # string runs past the buffer
+                    if not self.more():
+                        raise ValueError("Truncated JSON string")
+                    pos = 0
+                    continue
+                pos = sm.end()
+                continue
+            depth += 1 if ch in "[{" else -1
+            pos = m.end()
+            if depth == 0:
+                self.pos = pos
+                return
+
+    def fields(self, names):
+        """Decode one object keeping only keys in names; other values are skipped.
+
+        With the C scanner decoding the whole element and picking keys is
+        faster than walking it key by key, and still only one element is
+        alive at a time.
+        """
+        if self.peek() != "{":
+            return self.value()
+        if _c_scanner is not None:
+            rec = self.value()
+            return dict((k, rec[k]) for k in names if k in rec)
+        self.pos += 1
+        out = {}
+        if self.peek() == "}":
+            self.pos += 1
+            return out
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key in names:
+                out[key] = self.value()
+            else:
+                self.skip()
+            if self.peek() != ",":
+                break
+            self.pos += 1
+        self.expect("}")
+        return out
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                val, end = self._decode(self.buf, self.pos)
+            except ValueError:
+                end = None
+            # a number cut by the buffer edge decodes short; valid JSON
+            # always follows a value (or key) with whitespace or , : ] }
+            if end is not None and (self.eof or (end < len(self.buf) and self.buf[end] in _AFTER_VALUE)):
+                self.pos = end
+                return val
+            size *= 2
+            if not self.more(size):
+                if end is None:
+                    raise ValueError("Truncated JSON value")
+                self.pos = end
+                return val
+
+
+def iter_object(fp, stream=(), chunk_size=1 << 16, keep=None, fields=None):
+    """Walk a top-level JSON object without loading it whole.
+
+    Yields (key, value) per field; array fields named in stream yield
+    (key, element) once per element instead, so only one element is
+    alive at a time. With keep, other non-stream fields are skipped
+    without being built; with fields, streamed object elements keep
+    only those keys.
+    """
+    reader = _Buffer(fp, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in stream and reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() != "]":
+                while True:
+                    yield key, (reader.value() if fields is None else reader.fields(fields))
+                    if reader.peek() != ",":
+                        break
+                    reader.pos += 1
+            reader.expect("]")
+        elif keep is not None and key not in keep and key not in stream:
+            reader.skip()
+        else:
+            yield key, reader.value()
+        if reader.peek() != ",":
+            break
+        reader.pos += 1
+    reader.expect("}")
+
+
+def iter_array(fp, key, fields=None, chunk_size=1 << 16):
+    """Elements of one top-level array field; everything else is skipped."""
+    for _, value in iter_object(fp, stream=(key,), chunk_size=chunk_size, keep=(), fields=fields):
+        yield value
+
+
+__all__ = ["JsonStreamWriter", "write_export_stream", "iter_object", "iter_array"]
@@ -1,3 +1,7 @@
+import math
+from array import array
+from collections import namedtuple
+
 try:
     from Autodesk.Revit.DB import Options, Curve, Transform, XYZ
     from Autodesk.Revit.DB.Structure import AnalyticalElement
@@ -5,27 +9,39 @@ except Exception:  # allow outside Revit
     Options = Curve = Transform = XYZ = AnalyticalElement = object
 
 from .models import LocalAxes
-from .utils import log_msg, eid_to_int
+from .utils import get_logger, eid_to_int
 
+try:  # optional, only used by MemberGeometry.as_numpy
+    import numpy as np
+except Exception:
+    np = None
 
-def get_member_endpoints(member, log_file):
-    """Return (start,end) XYZ. Try single curve then longest."""
+# Plain endpoint read back from MemberGeometry (x, y, z in internal units)
+Point = namedtuple("Point", "X Y Z")
+
+_NAN = float("nan")
+
+
+def _member_id(member):
+    try:
+        return eid_to_int(member.Id)
+    except Exception:
+        return None
+
+
+def _endpoints(member, log_file, options=None):
+    """(start, end, used geometry fallback); ends are None when nothing was found."""
     try:
         if isinstance(member, AnalyticalElement) and hasattr(member, 'IsSingleCurve') and member.IsSingleCurve():
             c = member.GetCurve()
             if isinstance(c, Curve):
-                return c.GetEndPoint(0), c.GetEndPoint(1)
+                return c.GetEndPoint(0), c.GetEndPoint(1), False
     except Exception as ex:
-        try:
-            mid = eid_to_int(member.Id)
-        except Exception:
-            mid = None
-        log_msg("GetCurve failed on member {}: {}".format(mid, ex), log_file)
+        get_logger(log_file).warning("GetCurve failed on member {}: {}", _member_id(member), ex)
 
     # Fallback: choose longest curve in geometry
     try:
-        opts = Options()
-        geo = member.get_Geometry(opts)
+        geo = member.get_Geometry(options if options is not None else Options())
         longest = None
         maxlen = -1.0
         if geo:
@@ -39,14 +55,16 @@ def get_member_endpoints(member, log_file):
                 except Exception:
                     continue
         if longest is not None:
-            return longest.GetEndPoint(0), longest.GetEndPoint(1)
+            return longest.GetEndPoint(0), longest.GetEndPoint(1), True
     except Exception as ex:
-        try:
-            mid = eid_to_int(member.Id)
-        except Exception:
-            mid = None
-        log_msg("Geometry fallback failed on member {}: {}".format(mid, ex), log_file)
-    return None, None
+        get_logger(log_file).warning("Geometry fallback failed on member {}: {}", _member_id(member), ex)
+    return None, None, True
+
+
+def get_member_endpoints(member, log_file, options=None):
+    """Return (start,end) XYZ. Try single curve then longest."""
+    start, end, _ = _endpoints(member, log_file, options)
+    return start, end
 
 
 def get_local_axes(member):
@@ -63,4 +81,88 @@ def get_local_axes(member):
         return None
     return None
 
-__all__ = ["get_member_endpoints", "get_local_axes"]
+
+class MemberGeometry(object):
+    """Endpoints, local axes and rotation of many members in flat float arrays.
+
+    Row n belongs to the n-th member passed to extract():
+        ends      d[6N]  start xyz, end xyz (internal units)
+        axes      d[9N]  basis x, y, z
+        rotation  d[N]   cross section rotation (rad)
+    Missing values are NaN. fallback lists the rows whose endpoints needed
+    the get_Geometry fallback; one Options instance serves all of them.
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.ends = array("d", [_NAN]) * (6 * count)
+        self.axes = array("d", [_NAN]) * (9 * count)
+        self.rotation = array("d", [_NAN]) * count
+        self.fallback = []
+
+    @classmethod
+    def extract(cls, members, log_file=None):
+        """One pass over members filling every row."""
+        geometry = cls(len(members))
+        ends = geometry.ends
+        axes = geometry.axes
+        rotation = geometry.rotation
+        options = Options()
+        for n, member in enumerate(members):
+            a, b, fallback = _endpoints(member, log_file, options)
+            if fallback:
+                geometry.fallback.append(n)
+            if a is None or b is None:
+                continue  # records without a curve carry no axes or rotation
+            ends[6 * n:6 * n + 6] = array("d", (a.X, a.Y, a.Z, b.X, b.Y, b.Z))
+            try:
+                t = member.GetTransform()
+                if isinstance(t, Transform):
+                    bx, by, bz = t.BasisX, t.BasisY, t.BasisZ
+                    axes[9 * n:9 * n + 9] = array("d", (bx.X, bx.Y, bx.Z, by.X, by.Y, by.Z, bz.X, bz.Y, bz.Z))
+            except Exception:
+                pass
+            try:
+                if hasattr(member, "CrossSectionRotation"):
+                    rotation[n] = float(getattr(member, "CrossSectionRotation", 0.0))
+            except Exception:
+                pass
+        return geometry
+
+    def __len__(self):
+        return self.count
+
+    def endpoints(self, n):
+        """(start, end) Points of row n, (None, None) without a curve."""
+        e = self.ends
+        base = 6 * n
+        if math.isnan(e[base]):
+            return None, None
+        return Point(e[base], e[base + 1], e[base + 2]), Point(e[base + 3], e[base + 4], e[base + 5])
+
+    def endpoint_pairs(self):
+        return [self.endpoints(n) for n in range(self.count)]
+
+    def local_axes(self, n):
+        a = self.axes
+        base = 9 * n
+        if math.isnan(a[base]):
+            return None
+        return LocalAxes(x=list(a[base:base + 3]), y=list(a[base + 3:base + 6]), z=list(a[base + 6:base + 9]))
+
+    def cross_section_rotation(self, n):
+        value = self.rotation[n]
+        return None if math.isnan(value) else value
+
+    def as_numpy(self):
+        """(ends N x 6, axes N x 9, rotation N) NumPy views of the arrays (no copy)."""
+        if np is None:
+            raise ImportError("numpy is required for MemberGeometry.as_numpy")
+        return (
+            np.frombuffer(self.ends, dtype=float).reshape(self.count, 6),
+            np.frombuffer(self.axes, dtype=float).reshape(self.count, 9),
+            np.frombuffer(self.rotation, dtype=float),
+        )
+
+
+__all__ = ["get_member_endpoints", "get_local_axes", "MemberGeometry", "Point"]
@@ -1,18 +1,20 @@
 import json
 import datetime
 
-from Autodesk.Revit.DB import FilteredElementCollector
-from Autodesk.Revit.DB.Structure import AnalyticalMember
+try:
+    from Autodesk.Revit.DB import FilteredElementCollector
+    from Autodesk.Revit.DB.Structure import AnalyticalMember
+except Exception:  # allow outside Revit
+    FilteredElementCollector = AnalyticalMember = object
 
 from .utils import (
     ensure_output_dir as ensureOutputDirectory,
-    log_msg as logMessage,
-    meters_to_internal as metersToInternal,
-    UNIT_OUT,
+    get_logger as getLogger,
+    UnitScale,
     SNAP_TOLERANCE_METERS,
+    HOST_MATCH_TOL_METERS,
     model_name as modelName,
     eid_to_int as elementIdToInt,
-    xyz_to_out as xyzToOut,
 )
 from .nodes import (
     collect_nodes as collectNodes,
@@ -21,35 +23,72 @@ from .nodes import (
 from .sections_materials import (
     section_info_for_member as sectionInfoForMember,
     material_info as materialInfo,
+    SectionCache,
+    MaterialResolver,
 )
 from .member_geometry import (
     get_member_endpoints as getMemberEndpoints,
     get_local_axes as getLocalAxes,
+    MemberGeometry,
+)
+from .host_match import (
+    find_physical_host_for_member as findPhysicalHostForMember,
+    HostMatchIndex,
+    BatchHostMatcher,
 )
-from .host_match import find_physical_host_for_member as findPhysicalHostForMember
 from .releases import read_releases as readReleases
+from .timing import StageTimer
+from .jsonstream import write_export_stream as writeExportStream
+from .columnar import ColumnarBuilder
+from .incremental import DirtyTracker, load_state, direct_host_id as directHostId
+from .consolidate import consolidate as consolidateNodes
+from .topology import ConnectivityGraph
+from .snapshot import extract as extractSnapshot, write_snapshot as writeSnapshot, snapshot_result as snapshotResult
+from .options import ExportOptions
 from .models import (
     LineGeom, SectionProperties, MemberRecord, ExportCounts, ExportResult
 )
 
 
+# heuristic host not matched up front (matchHosts)
+_NOT_MATCHED = object()
+
 
 class ExportAnalyticalModel(object):
 
-    def __init__(self, doc, output_dir=None):
+    def __init__(self, doc, output_dir=None, units=None, options=None, **flags):
+        """options: ExportOptions; flags (profile=, stream=, ...) override it, see revitio.options."""
         self.doc = doc
+        # On/off switches, unset ones from their REVIT_ANALYTICAL_* variables;
+        # ValueError for combinations that cannot all apply
+        self.options = ExportOptions.resolve(options, **flags)
+        # Output unit for this run (arg, REVIT_ANALYTICAL_UNITS, UNIT_OUT)
+        self.unitScale = UnitScale(units)
         # Delegate output directory resolution/creation to utils helper
         self.outputDirectory = ensureOutputDirectory(output_dir)
         self.logFile = self.outputDirectory + "/export_members.log"
-        logMessage("Initialized ExportAnalyticalModel", self.logFile)
-
-    def collectNodes(self):
-        """Collect nodes (map,list,total)."""
-        node_map, node_objects, total_node_count, missing = collectNodes(self.doc, self.logFile)
-        logMessage(
-            "Members pass sees {} nodes ({} missing positions)".format(total_node_count, missing),
-            self.logFile,
+        # Buffered; per-member lines are debug (REVIT_ANALYTICAL_LOG_LEVEL=debug)
+        self.log = getLogger(self.logFile)
+        self.sectionCache = SectionCache()
+        self.materialResolver = MaterialResolver(doc)
+        # Flat copies of the switches (self.stream, self.snapshot, ...)
+        for name, value in self.options.to_dict().items():
+            setattr(self, name, value)
+        # Stage timings, written beside the JSON
+        self.timer = StageTimer(enabled=self.profile)
+        self.tracker = None
+        self.graph = None
+        self.geometry = None  # MemberGeometry of the current runExport
+        self.scaledEnds = None  # its ends in output units, flat (6 per member)
+        self.lastOutputPath = None  # JSON written by the last export()
+        self.log.info("Initialized ExportAnalyticalModel")
+
+    def collectNodes(self, snapToleranceFeet=None):
+        """Collect nodes (index,list,total)."""
+        node_map, node_objects, total_node_count, missing = collectNodes(
+            self.doc, self.logFile, snapToleranceFeet, scale=self.unitScale
         )
+        self.log.info("Members pass sees {} nodes ({} missing positions)", total_node_count, missing)
         return node_map, node_objects, total_node_count
 
     def iterateAnalyticalMembers(self):
@@ -59,22 +98,82 @@ class ExportAnalyticalModel(object):
             .WhereElementIsNotElementType()
             .ToElements()
         )
-        logMessage("Found {} AnalyticalMember elements".format(len(members)), self.logFile)
+        self.log.info("Found {} AnalyticalMember elements", len(members))
         return members
 
-    def buildMemberRecord(self, memberElement, nodeMap, snapToleranceFeet):
+    def buildHostIndex(self):
+        """Index framing/column curves once for heuristic host matching."""
+        hostIndex = HostMatchIndex.from_document(
+            self.doc, self.unitScale.meters_to_internal(HOST_MATCH_TOL_METERS)
+        )
+        self.log.info("Host match index holds {} physical curves", len(hostIndex))
+        return hostIndex
+
+    def memberEndpoints(self, memberElement):
+        with self.timer.stage("endpoints"):
+            return getMemberEndpoints(memberElement, self.logFile)
+
+    def extractGeometry(self, memberElements):
+        """MemberGeometry of every member from one pass over the API.
+
+        Also sets scaledEnds, all endpoints in output units from one
+        UnitScale.array call.
+        """
+        geometry = MemberGeometry.extract(memberElements, self.logFile)
+        self.scaledEnds = self.unitScale.array(geometry.ends)
+        self.timer.count("geometry_fallback", len(geometry.fallback))
+        if geometry.fallback:
+            self.log.info("{} members needed the geometry fallback for their endpoints", len(geometry.fallback))
+        return geometry
+
+    def consolidateNodes(self, memberElements, nodeMap, snapToleranceFeet, endpoints=None):
+        """Endpoints of every member and the NodeConsolidation built from them."""
+        if endpoints is None:
+            endpoints = [self.memberEndpoints(m) for m in memberElements]
+        with self.timer.stage("consolidateNodes"):
+            consolidation = consolidateNodes(nodeMap, endpoints, snapToleranceFeet)
+        self.log.info(consolidation.summary())
+        return endpoints, consolidation
+
+    def matchHosts(self, memberElements, hostIndex, endpoints=None, geometry=None):
+        """(endpoints, heuristic host per member) from one vectorised pass.
+
+        Returns (endpoints, None) without NumPy; records then match one
+        at a time. Only members without a direct host (GetElementId) are
+        scored; the others get _NOT_MATCHED, so one whose direct host
+        cannot be fetched still falls back to a per-member match. A
+        MemberGeometry feeds the matcher its end array directly.
+        """
+        matcher = BatchHostMatcher(hostIndex)
+        if not matcher.use_numpy or not len(hostIndex):
+            return endpoints, None
+        if geometry is None and endpoints is None:
+            endpoints = [self.memberEndpoints(m) for m in memberElements]
+        with self.timer.stage("hostBatch"):
+            direct = [directHostId(m) is not None for m in memberElements]
+            if geometry is not None:
+                hostMatches = matcher.match_array(geometry.as_numpy()[0], skip=direct)
+            else:
+                hostMatches = matcher.match_many([None if d else e for d, e in zip(direct, endpoints)])
+            hostMatches = [_NOT_MATCHED if d else h for d, h in zip(direct, hostMatches)]
+        return endpoints, hostMatches
+
+    def buildMemberRecord(self, memberElement, nodeMap, snapToleranceFeet, hostIndex=None, endpoints=None,
+                          nodeIds=None, heuristicHost=_NOT_MATCHED, row=None):
+        timer = self.timer
         memberIdInt = elementIdToInt(memberElement.Id)
-        startPoint, endPoint = getMemberEndpoints(memberElement, self.logFile)
+        startPoint, endPoint = endpoints if endpoints is not None else self.memberEndpoints(memberElement)
 
         # If geometry is missing, return minimal record
         if startPoint is None or endPoint is None:
+            timer.count("no_curve")
             return MemberRecord(
                 id=memberIdInt,
                 unique_id=memberElement.UniqueId,
                 node_i=None,
                 node_j=None,
                 line=None,
-                units=UNIT_OUT.lower(),
+                units=self.unitScale.name,
                 status="no_curve",
                 material=None,
                 section=None,
@@ -87,38 +186,66 @@ class ExportAnalyticalModel(object):
                 host_unique_id=None,
             )
 
-        # Node association
-        nodeIdStart = findClosestNodeId(startPoint, nodeMap, snapToleranceFeet)
-        nodeIdEnd = findClosestNodeId(endPoint, nodeMap, snapToleranceFeet)
+        # Node association (already done when nodes were consolidated)
+        if nodeIds is not None:
+            nodeIdStart, nodeIdEnd = nodeIds
+        else:
+            with timer.stage("nodeSnap"):
+                nodeIdStart = findClosestNodeId(startPoint, nodeMap, snapToleranceFeet)
+                nodeIdEnd = findClosestNodeId(endPoint, nodeMap, snapToleranceFeet)
 
         # Section / type info
-        sectionInfo, sectionProps, _ = sectionInfoForMember(self.doc, memberElement, startPoint, endPoint, self.logFile)
+        with timer.stage("section"):
+            sectionInfo, sectionProps, _ = sectionInfoForMember(
+                self.doc, memberElement, startPoint, endPoint, self.logFile, cache=self.sectionCache
+            )
 
         # 1. Try direct API association (preferred & reliable if available)
         hostElement = None
         _direct_host = False
-        try:
-            if hasattr(memberElement, 'GetElementId'):
-                pid = memberElement.GetElementId()
-                if pid and getattr(pid, 'IntegerValue', 0) > 0:
-                    he = self.doc.GetElement(pid)
-                    if he is not None:
-                        hostElement = he
-                        _direct_host = True
-        except Exception:
-            hostElement = None
+        with timer.stage("hostDirect"):
+            try:
+                if hasattr(memberElement, 'GetElementId'):
+                    pid = memberElement.GetElementId()
+                    if pid and getattr(pid, 'IntegerValue', 0) > 0:
+                        he = self.doc.GetElement(pid)
+                        if he is not None:
+                            hostElement = he
+                            _direct_host = True
+            except Exception:
+                hostElement = None
 
         # 2. Fallback: heuristic spatial match if direct association not found
         if hostElement is None:
-            hostElement = findPhysicalHostForMember(self.doc, startPoint, endPoint, self.logFile)
+            with timer.stage("hostHeuristic"):
+                if heuristicHost is _NOT_MATCHED:
+                    hostElement = findPhysicalHostForMember(
+                        self.doc, startPoint, endPoint, self.logFile, index=hostIndex
+                    )
+                else:
+                    hostElement = heuristicHost
             _heuristic_host = hostElement is not None
+            timer.count("host_heuristic" if _heuristic_host else "host_none")
         else:
             _heuristic_host = False
+            timer.count("host_direct")
 
-        materialData = materialInfo(self.doc, memberElement, hostElement)
-        releaseData = readReleases(memberElement)
-        localAxes = getLocalAxes(memberElement)
-        lineGeometry = LineGeom(point_i=xyzToOut(startPoint), point_j=xyzToOut(endPoint), units=UNIT_OUT.lower())
+        with timer.stage("material"):
+            materialData = materialInfo(self.doc, memberElement, hostElement, resolver=self.materialResolver)
+        with timer.stage("releases"):
+            releaseData = readReleases(memberElement)
+        geometry = self.geometry if row is not None else None
+        if geometry is not None:
+            localAxes = geometry.local_axes(row)
+            rotation = geometry.cross_section_rotation(row)
+            ends = self.scaledEnds
+            pointI, pointJ = ends[6 * row:6 * row + 3], ends[6 * row + 3:6 * row + 6]
+        else:
+            with timer.stage("localAxes"):
+                localAxes = getLocalAxes(memberElement)
+            rotation = float(getattr(memberElement, "CrossSectionRotation", 0.0)) if hasattr(memberElement, "CrossSectionRotation") else None
+            pointI, pointJ = self.unitScale.points((startPoint, endPoint))
+        lineGeometry = LineGeom(point_i=pointI, point_j=pointJ, units=self.unitScale.name)
         status = (
             "ok" if (nodeIdStart is not None and nodeIdEnd is not None)
             else ("no_node_i" if nodeIdStart is None else "no_node_j")
@@ -126,12 +253,10 @@ class ExportAnalyticalModel(object):
         host_id = elementIdToInt(hostElement.Id) if hostElement else None
         host_unique_id = hostElement.UniqueId if hostElement else None
 
-        try:
-            print("[AnalyticalExport] member_id={0} unique_id={1} direct_host={2} heuristic_host={3} host_id={4} host_unique_id={5}".format(
-                memberIdInt, memberElement.UniqueId, _direct_host, _heuristic_host, host_id, host_unique_id
-            ))
-        except Exception:
-            pass
+        self.log.debug(
+            "[AnalyticalExport] member_id={0} unique_id={1} direct_host={2} heuristic_host={3} host_id={4} host_unique_id={5}",
+            memberIdInt, memberElement.UniqueId, _direct_host, _heuristic_host, host_id, host_unique_id
+        )
 
         return MemberRecord(
             id=memberIdInt,
@@ -139,7 +264,7 @@ class ExportAnalyticalModel(object):
             node_i=nodeIdStart,
             node_j=nodeIdEnd,
             line=lineGeometry,
-            units=UNIT_OUT.lower(),
+            units=self.unitScale.name,
             status=status,
             material=materialData,
             section=sectionInfo,
@@ -147,48 +272,227 @@ class ExportAnalyticalModel(object):
             releases=releaseData,
             local_axes=localAxes,
             structural_role=str(getattr(memberElement, "StructuralRole", None)) if hasattr(memberElement, "StructuralRole") else None,
-            cross_section_rotation_rad=float(getattr(memberElement, "CrossSectionRotation", 0.0)) if hasattr(memberElement, "CrossSectionRotation") else None,
+            cross_section_rotation_rad=rotation,
             host_id=host_id,
             host_unique_id=host_unique_id,
         )
 
-    def writeOutput(self, result):
+    def memberRecord(self, memberElement, nodeMap, snapToleranceFeet, hostIndex=None, endpoints=None,
+                     nodeIds=None, heuristicHost=_NOT_MATCHED, row=None):
+        """Previous record when the tracker allows it, else a fresh one."""
+        tracker = self.tracker
+        if tracker is None:
+            return self.buildMemberRecord(
+                memberElement, nodeMap, snapToleranceFeet, hostIndex, endpoints, nodeIds, heuristicHost, row
+            )
+        if endpoints is None:
+            endpoints = self.memberEndpoints(memberElement)
+        with self.timer.stage("dirtyCheck"):
+            record = tracker.reuse(memberElement, endpoints[0], endpoints[1], snapToleranceFeet)
+        if record is None:
+            record = self.buildMemberRecord(
+                memberElement, nodeMap, snapToleranceFeet, hostIndex, endpoints, nodeIds, heuristicHost, row
+            )
+        elif nodeIds is not None:
+            # virtual node ids are numbered per run
+            record.node_i, record.node_j = nodeIds
+        return record
+
+    def iterMemberRecords(self, memberElements, nodeMap, snapToleranceFeet, hostIndex=None, endpoints=None,
+                          consolidation=None, hostMatches=None):
+        """Yield one MemberRecord per element, timing each when profiling.
+
+        Row n of self.geometry, when set, describes memberElements[n].
+        """
+        timer = self.timer
+        geometry = self.geometry
+        for n, memberElement in enumerate(memberElements):
+            row = n if geometry is not None else None
+            ends = endpoints[n] if endpoints is not None else None
+            nodeIds = consolidation.member_nodes[n] if consolidation is not None else None
+            host = hostMatches[n] if hostMatches is not None else _NOT_MATCHED
+            if timer.enabled:
+                started = timer.now()
+                record = self.memberRecord(memberElement, nodeMap, snapToleranceFeet, hostIndex, ends, nodeIds, host, row)
+                timer.member(record.id, timer.now() - started)
+            else:
+                record = self.memberRecord(memberElement, nodeMap, snapToleranceFeet, hostIndex, ends, nodeIds, host, row)
+            yield record
+
+    def outputPath(self):
         fileName = "members_{model}_{ts}.json".format(
             model=modelName(self.doc),
             ts=datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
         )
-        filePath = self.outputDirectory + "/" + fileName
+        return self.outputDirectory + "/" + fileName
+
+    def writeOutput(self, result):
+        filePath = self.outputPath()
+        with self.timer.stage("writeOutput"):
+            with open(filePath, "w") as fp:
+                if self.compact:
+                    json.dump(result.to_dict(), fp, separators=(",", ":"))
+                else:
+                    json.dump(result.to_dict(), fp, indent=2)
+        self.log.info("Members metadata export complete, JSON saved to: {}", filePath)
+        return filePath
+
+    def writeOutputStream(self, result, memberRecords):
+        """Write header and nodes, then each record as memberRecords yields it."""
+        filePath = self.outputPath()
         with open(filePath, "w") as fp:
-            json.dump(result.to_dict(), fp, indent=2)
-        logMessage(
-            "Members metadata export complete, JSON saved to: {}".format(filePath),
-            self.logFile,
-        )
+            written = writeExportStream(fp, result, memberRecords, compact=self.compact)
+        self.log.info("Members metadata export complete ({} members streamed), JSON saved to: {}", written, filePath)
         return filePath
 
+    def statePath(self):
+        return self.outputDirectory + "/export_state_{}.json".format(modelName(self.doc))
+
+    def buildTracker(self, nodeObjects, nodeMap, hostIndex):
+        """DirtyTracker primed with the last run's state (incremental only)."""
+        settings = {
+            "units": self.unitScale.name,
+            "snap_tolerance_m": SNAP_TOLERANCE_METERS,
+            "host_match_tol_m": HOST_MATCH_TOL_METERS,
+        }
+        if self.consolidate:
+            settings["consolidate_nodes"] = True
+        tracker = DirtyTracker(self.doc, load_state(self.statePath()), settings)
+        return tracker.prepare(nodeObjects, nodeMap, hostIndex)
+
+    def writeColumnar(self, builder, filePath):
+        """Write the .rvcol sidecar from a filled ColumnarBuilder."""
+        with self.timer.stage("writeColumnar"):
+            columnarPath = builder.write(filePath[:-len(".json")] + ".rvcol")
+        self.log.info("Columnar export written to: {}", columnarPath)
+        return columnarPath
+
+    def writeTimings(self, filePath):
+        """Sidecar <export>.timings.json when profiling is on."""
+        if not self.timer.enabled:
+            return None
+        timingsPath = self.timer.write(filePath[:-len(".json")] + ".timings.json")
+        self.log.info("Stage timings written to: {}", timingsPath)
+        return timingsPath
+
+    def snapshotPath(self):
+        return self.outputDirectory + "/snapshot_{model}_{ts}.json".format(
+            model=modelName(self.doc),
+            ts=datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+        )
+
+    def runSnapshot(self):
+        """Revit phase only; the result carries nodes and counts, no members."""
+        self.log.info("Starting analytical snapshot extraction")
+        timer = self.timer = StageTimer(enabled=self.profile)
+        with timer.stage("iterateMembers"):
+            memberElements = self.iterateAnalyticalMembers()
+        with timer.stage("extractSnapshot"):
+            snapshot = extractSnapshot(self.doc, memberElements, scale=self.unitScale, log_file=self.logFile)
+        filePath = self.snapshotPath()
+        with timer.stage("writeSnapshot"):
+            writeSnapshot(snapshot, filePath)
+        self.lastOutputPath = filePath
+        self.log.info("Snapshot written to: {}", filePath)
+        timer.count("members", len(snapshot["members"]))
+        self.writeTimings(filePath)
+        return snapshotResult(snapshot, [])
+
     def export(self):
-        logMessage("Starting analytical members metadata export", self.logFile)
-        nodeMap, nodeObjects, totalNodeCount = self.collectNodes()
-        snapToleranceFeet = metersToInternal(SNAP_TOLERANCE_METERS)
-        memberRecords = []
-        for memberElement in self.iterateAnalyticalMembers():
-            memberRecords.append(self.buildMemberRecord(memberElement, nodeMap, snapToleranceFeet))
+        try:
+            return self.runSnapshot() if self.snapshot else self.runExport()
+        except Exception as ex:
+            self.log.error("Export failed: {}", ex)
+            try:
+                self.log.info("Recent debug lines written to {}", self.log.dump_debug())
+            except Exception:
+                pass
+            raise
+        finally:
+            self.log.flush()
+
+    def runExport(self):
+        self.log.info("Starting analytical members metadata export")
+        self.sectionCache = SectionCache()
+        self.materialResolver = MaterialResolver(self.doc)
+        timer = self.timer = StageTimer(enabled=self.profile)
+        snapToleranceFeet = self.unitScale.meters_to_internal(SNAP_TOLERANCE_METERS)
+        with timer.stage("collectNodes"):
+            nodeMap, nodeObjects, totalNodeCount = self.collectNodes(snapToleranceFeet)
+        with timer.stage("hostIndex"):
+            hostIndex = self.buildHostIndex()
+        with timer.stage("iterateMembers"):
+            memberElements = self.iterateAnalyticalMembers()
+        self.tracker = None
+        if self.incremental:
+            with timer.stage("dirtyTracking"):
+                self.tracker = self.buildTracker(nodeObjects, nodeMap, hostIndex)
+        # endpoints, axes and rotations in one pass; later stages make no per-member geometry calls
+        with timer.stage("memberGeometry"):
+            geometry = self.geometry = self.extractGeometry(memberElements)
+        endpoints = geometry.endpoint_pairs()
+        consolidation = None
+        if self.consolidate:
+            endpoints, consolidation = self.consolidateNodes(memberElements, nodeMap, snapToleranceFeet, endpoints)
+            nodeObjects = consolidation.nodes(nodeObjects, self.unitScale.factor, self.unitScale.name)
+        endpoints, hostMatches = self.matchHosts(memberElements, hostIndex, endpoints, geometry)
+        memberRecords = self.iterMemberRecords(
+            memberElements, nodeMap, snapToleranceFeet, hostIndex, endpoints, consolidation, hostMatches
+        )
+        graph = self.graph = ConnectivityGraph(n.id for n in nodeObjects) if self.topology else None
+        if graph is not None:
+            memberRecords = graph.tee(memberRecords)
+        if not self.stream:
+            memberRecords = list(memberRecords)
         result = ExportResult(
             model=modelName(self.doc),
             exported_at=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            units=UNIT_OUT.lower(),
+            units=self.unitScale.name,
             snap_tolerance_m=SNAP_TOLERANCE_METERS,
-            counts=ExportCounts(members_total=len(memberRecords), nodes_seen=totalNodeCount),
+            # one record per element, so the count is known before streaming
+            counts=ExportCounts(members_total=len(memberElements), nodes_seen=totalNodeCount),
             analytical_nodes=nodeObjects,
-            analytical_members=memberRecords,
+            analytical_members=[] if self.stream else memberRecords,
+            node_consolidation=consolidation.to_dict(SNAP_TOLERANCE_METERS) if consolidation is not None else None,
         )
-        self.writeOutput(result)
+        if graph is not None:
+            if self.stream:
+                # filled as the members stream past, written after them
+                result.topology = graph
+            else:
+                with timer.stage("topology"):
+                    result.topology = graph.to_dict()
+        columnarBuilder = ColumnarBuilder(result, self.logFile) if self.columnar else None
+        if self.stream:
+            if columnarBuilder is not None:
+                memberRecords = columnarBuilder.tee(memberRecords)
+            # build time is folded into this stage when streaming
+            with timer.stage("writeOutputStream"):
+                filePath = self.writeOutputStream(result, memberRecords)
+        else:
+            filePath = self.writeOutput(result)
+            if columnarBuilder is not None:
+                for record in memberRecords:
+                    columnarBuilder.add_member(record)
+        self.lastOutputPath = filePath
+        if columnarBuilder is not None:
+            self.writeColumnar(columnarBuilder, filePath)
+        timer.count("members", result.counts.members_total)
+        if self.tracker is not None:
+            timer.count("reused", self.tracker.reused)
+            self.log.info(self.tracker.summary())
+            self.tracker.save(self.statePath(), filePath)
+        if graph is not None:
+            self.log.info(graph.summary())
+        self.log.info(self.sectionCache.summary())
+        self.log.info(self.materialResolver.summary())
+        self.writeTimings(filePath)
         return result
 
 
-def export_members_with_metadata(doc, output_dir=None):
-    """Legacy helper returns ExportResult."""
-    return ExportAnalyticalModel(doc, output_dir=output_dir).export()
+def export_members_with_metadata(doc, output_dir=None, units=None, options=None, **flags):
+    """Legacy helper returns ExportResult (members empty when streaming or snapshotting)."""
+    return ExportAnalyticalModel(doc, output_dir=output_dir, units=units, options=options, **flags).export()
 
 
 __all__ = ["ExportAnalyticalModel", "export_members_with_metadata"]
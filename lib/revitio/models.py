@@ -1,11 +1,19 @@
-"""Model classes (no dataclasses for old Python)."""
+"""Model classes (no dataclasses for old Python).
+
+Slotted to keep per-instance memory small; constructors keep the lists
+they are given (callers pass fresh lists). from_dict rebuilds each class
+from its to_dict output and returns None for None.
+"""
+import json
 
 
 class Node(object):
+    __slots__ = ("id", "unique_id", "position", "units", "status")
+
     def __init__(self, id, unique_id, position, units="meters", status=None):
         self.id = id
         self.unique_id = unique_id
-        self.position = list(position) if position is not None else [0.0, 0.0, 0.0]
+        self.position = position if position is not None else [0.0, 0.0, 0.0]
         self.units = units
         self.status = status
         if len(self.position) != 3:
@@ -22,11 +30,19 @@ class Node(object):
             d["status"] = self.status
         return d
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d.get("id"), d.get("unique_id"), d.get("position"), d.get("units", "meters"), d.get("status"))
+
 
 class LineGeom(object):
+    __slots__ = ("point_i", "point_j", "units")
+
     def __init__(self, point_i, point_j, units="meters"):
-        self.point_i = list(point_i)
-        self.point_j = list(point_j)
+        self.point_i = point_i
+        self.point_j = point_j
         self.units = units
         if len(self.point_i) != 3 or len(self.point_j) != 3:
             raise ValueError("LineGeom points must have length 3")
@@ -34,8 +50,16 @@ class LineGeom(object):
     def to_dict(self):
         return {"i": self.point_i, "j": self.point_j}
 
+    @classmethod
+    def from_dict(cls, d, units="meters"):
+        if d is None:
+            return None
+        return cls(d["i"], d["j"], units=units)
+
 
 class SectionInfo(object):
+    __slots__ = ("type_id", "type_name", "family_name", "shape")
+
     def __init__(self, type_id, type_name, family_name, shape):
         self.type_id = type_id
         self.type_name = type_name
@@ -50,16 +74,32 @@ class SectionInfo(object):
             "shape": self.shape,
         }
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d.get("type_id"), d.get("type_name"), d.get("family_name"), d.get("shape"))
+
 
 class SectionProperties(object):
+    __slots__ = ("values",)
+
     def __init__(self, values=None):
         self.values = values or {}
 
     def to_dict(self):
         return dict(self.values)
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(values=d)
+
 
 class MaterialRef(object):
+    __slots__ = ("id", "name")
+
     def __init__(self, id, name):
         self.id = id
         self.name = name
@@ -67,11 +107,19 @@ class MaterialRef(object):
     def to_dict(self):
         return {"id": self.id, "name": self.name}
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d.get("id"), d.get("name"))
+
 
 class MaterialInfo(object):
+    __slots__ = ("primary", "all")
+
     def __init__(self, primary, all_list=None):
         self.primary = primary
-        self.all = list(all_list) if all_list else []
+        self.all = all_list or []
 
     def to_dict(self):
         if self.primary is None and not self.all:
@@ -81,8 +129,16 @@ class MaterialInfo(object):
             "all": [m.to_dict() for m in self.all],
         }
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(MaterialRef.from_dict(d.get("primary")), [MaterialRef.from_dict(m) for m in d.get("all") or []])
+
 
 class ReleaseCondition(object):
+    __slots__ = ("fx", "fy", "fz", "mx", "my", "mz")
+
     def __init__(self, fx, fy, fz, mx, my, mz):
         self.fx = bool(fx)
         self.fy = bool(fy)
@@ -94,8 +150,16 @@ class ReleaseCondition(object):
     def to_dict(self):
         return {"fx": self.fx, "fy": self.fy, "fz": self.fz, "mx": self.mx, "my": self.my, "mz": self.mz}
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d.get("fx"), d.get("fy"), d.get("fz"), d.get("mx"), d.get("my"), d.get("mz"))
+
 
 class Releases(object):
+    __slots__ = ("start", "end")
+
     def __init__(self, start, end):
         self.start = start
         self.end = end
@@ -108,12 +172,20 @@ class Releases(object):
             "end": self.end.to_dict() if self.end else None,
         }
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(ReleaseCondition.from_dict(d.get("start")), ReleaseCondition.from_dict(d.get("end")))
+
 
 class LocalAxes(object):
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x, y, z):
-        self.x = list(x)
-        self.y = list(y)
-        self.z = list(z)
+        self.x = x
+        self.y = y
+        self.z = z
         for name, vec in (("x", self.x), ("y", self.y), ("z", self.z)):
             if len(vec) != 3:
                 raise ValueError("Local axis %s must have length 3" % name)
@@ -121,8 +193,20 @@ class LocalAxes(object):
     def to_dict(self):
         return {"x": self.x, "y": self.y, "z": self.z}
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d["x"], d["y"], d["z"])
+
 
 class MemberRecord(object):
+    __slots__ = (
+        "id", "unique_id", "node_i", "node_j", "line", "units", "status", "material",
+        "section", "section_properties", "releases", "local_axes", "structural_role",
+        "cross_section_rotation_rad", "host_id", "host_unique_id",
+    )
+
     def __init__(self, id, unique_id, node_i, node_j, line, units, status, material,
                  section, section_properties, releases=None, local_axes=None,
                  structural_role=None, cross_section_rotation_rad=None,
@@ -178,8 +262,34 @@ class MemberRecord(object):
             d["endpoints"] = self.line.to_dict()
         return d
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        units = d.get("units")
+        return cls(
+            id=d.get("id"),
+            unique_id=d.get("unique_id"),
+            node_i=d.get("nodeI"),
+            node_j=d.get("nodeJ"),
+            line=LineGeom.from_dict(d.get("endpoints"), units=units),
+            units=units,
+            status=d.get("status"),
+            material=MaterialInfo.from_dict(d.get("material")),
+            section=SectionInfo.from_dict(d.get("section")),
+            section_properties=SectionProperties.from_dict(d.get("section_properties")),
+            releases=Releases.from_dict(d.get("releases")),
+            local_axes=LocalAxes.from_dict(d.get("local_axes")),
+            structural_role=d.get("structural_role"),
+            cross_section_rotation_rad=d.get("cross_section_rotation_rad"),
+            host_id=d.get("host_id"),
+            host_unique_id=d.get("host_unique_id"),
+        )
+
 
 class ExportCounts(object):
+    __slots__ = ("members_total", "nodes_seen")
+
     def __init__(self, members_total, nodes_seen):
         self.members_total = members_total
         self.nodes_seen = nodes_seen
@@ -187,10 +297,21 @@ class ExportCounts(object):
     def to_dict(self):
         return {"members_total": self.members_total, "nodes_seen": self.nodes_seen}
 
+    @classmethod
+    def from_dict(cls, d):
+        if d is None:
+            return None
+        return cls(d.get("members_total"), d.get("nodes_seen"))
+
 
 class ExportResult(object):
+    __slots__ = (
+        "model", "exported_at", "units", "snap_tolerance_m", "counts",
+        "analytical_nodes", "analytical_members", "node_consolidation", "topology",
+    )
+
     def __init__(self, model, exported_at, units, snap_tolerance_m, counts,
-                 analytical_nodes, analytical_members):
+                 analytical_nodes, analytical_members, node_consolidation=None, topology=None):
         self.model = model
         self.exported_at = exported_at
         self.units = units
@@ -198,17 +319,46 @@ class ExportResult(object):
         self.counts = counts
         self.analytical_nodes = analytical_nodes
         self.analytical_members = analytical_members
+        # Merge map / virtual nodes when nodes were consolidated (revitio.consolidate)
+        self.node_consolidation = node_consolidation
+        # revitio.topology.ConnectivityGraph (or its dict once loaded) when requested
+        self.topology = topology
 
     def to_dict(self):
-        return {
+        d = {
             "model": self.model,
             "exported_at": self.exported_at,
             "units": self.units,
             "snap_tolerance_m": self.snap_tolerance_m,
             "counts": self.counts.to_dict(),
-            "analytical_nodes": [n.to_dict() for n in self.analytical_nodes],
-            "analytical_members": [m.to_dict() for m in self.analytical_members],
         }
+        if self.node_consolidation is not None:
+            d["node_consolidation"] = self.node_consolidation
+        d["analytical_nodes"] = [n.to_dict() for n in self.analytical_nodes]
+        d["analytical_members"] = [m.to_dict() for m in self.analytical_members]
+        if self.topology is not None:
+            d["topology"] = self.topology if isinstance(self.topology, dict) else self.topology.to_dict()
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            model=d.get("model"),
+            exported_at=d.get("exported_at"),
+            units=d.get("units"),
+            snap_tolerance_m=d.get("snap_tolerance_m"),
+            counts=ExportCounts.from_dict(d.get("counts")),
+            analytical_nodes=[Node.from_dict(n) for n in d.get("analytical_nodes") or []],
+            analytical_members=[MemberRecord.from_dict(m) for m in d.get("analytical_members") or []],
+            node_consolidation=d.get("node_consolidation"),
+            topology=d.get("topology"),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Rehydrate an export JSON written by ExportAnalyticalModel."""
+        with open(path, "r") as fp:
+            return cls.from_dict(json.load(fp))
 
 
 __all__ = [
@@ -1,3 +1,6 @@
+import math
+from array import array
+
 try:
     from Autodesk.Revit.DB import (
         FilteredElementCollector, BuiltInCategory, XYZ
@@ -5,9 +8,116 @@ try:
 except Exception:  # allow outside Revit
     FilteredElementCollector = BuiltInCategory = XYZ = object
 
-from .utils import xyz_to_out, eid_to_int, log_msg, UNIT_OUT
+from .utils import eid_to_int, get_logger, default_unit_scale, SNAP_TOLERANCE_METERS
 from .models import Node
 
+# Cells are padded a hair over the snap tolerance so float rounding in the
+# cell key can never push a point within tolerance two cells away.
+_CELL_PAD = 1.0 + 1e-9
+
+
+class NodeIndex(object):
+    """Uniform grid of node points (internal units).
+
+    Reads like the old id -> XYZ dict (items, get, len, in) so callers
+    that only need the map keep working.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size) * _CELL_PAD if cell_size and cell_size > 0 else 0.0
+        self._inv = 1.0 / self.cell_size if self.cell_size > 0 else 0.0
+        self._points = {}   # id -> XYZ (insertion order kept)
+        self._entries = {}  # id -> (seq, id, x, y, z)
+        self._cells = {}    # (i, j, k) -> [entry]
+        self._seq = 0
+
+    def _key(self, x, y, z):
+        inv = self._inv
+        return (int(math.floor(x * inv)), int(math.floor(y * inv)), int(math.floor(z * inv)))
+
+    def add(self, nid, pt):
+        """Add or replace node point."""
+        old = self._entries.get(nid)
+        if old is not None:
+            seq = old[0]
+            if self._inv:
+                self._cells[self._key(old[2], old[3], old[4])].remove(old)
+        else:
+            seq = self._seq
+            self._seq += 1
+        entry = (seq, nid, pt.X, pt.Y, pt.Z)
+        self._entries[nid] = entry
+        self._points[nid] = pt
+        if self._inv:
+            self._cells.setdefault(self._key(entry[2], entry[3], entry[4]), []).append(entry)
+
+    def closest(self, x, y, z, tol):
+        """Closest node id within tol, same pick as a linear scan."""
+        if not self._inv:
+            return _closest_linear(x, y, z, self._entries.values(), tol)
+        # Cells are at least tol wide (padded), so one ring covers the usual snap
+        rings = max(1, int(math.ceil(tol * self._inv)))
+        ci, cj, ck = self._key(x, y, z)
+        cells = self._cells
+        best_id = None
+        best_d2 = tol * tol
+        best_seq = -1
+        for i in range(ci - rings, ci + rings + 1):
+            for j in range(cj - rings, cj + rings + 1):
+                for k in range(ck - rings, ck + rings + 1):
+                    bucket = cells.get((i, j, k))
+                    if not bucket:
+                        continue
+                    for seq, nid, nx, ny, nz in bucket:
+                        dx = x - nx
+                        dy = y - ny
+                        dz = z - nz
+                        d2 = dx*dx + dy*dy + dz*dz
+                        # Linear scan keeps the last of equal distances
+                        if d2 < best_d2 or (d2 == best_d2 and seq > best_seq):
+                            best_id = nid
+                            best_d2 = d2
+                            best_seq = seq
+        return best_id
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, nid):
+        return nid in self._points
+
+    def __getitem__(self, nid):
+        return self._points[nid]
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def get(self, nid, default=None):
+        return self._points.get(nid, default)
+
+    def keys(self):
+        return self._points.keys()
+
+    def values(self):
+        return self._points.values()
+
+    def items(self):
+        return self._points.items()
+
+
+def _closest_linear(x, y, z, entries, tol):
+    best_id = None
+    best_d2 = tol * tol
+    for _seq, nid, nx, ny, nz in entries:
+        dx = x - nx
+        dy = y - ny
+        dz = z - nz
+        d2 = dx*dx + dy*dy + dz*dz
+        if d2 <= best_d2:
+            best_id = nid
+            best_d2 = d2
+    return best_id
+
 
 def get_node_position(elem):
     try:
@@ -34,37 +144,44 @@ def get_node_position(elem):
     return None
 
 
-def collect_nodes(doc, log_file):
-    """Collect nodes. Return (map, list, total, missing)."""
+def collect_nodes(doc, log_file, tol_ft=None, scale=None):
+    """Collect nodes. Return (index, list, total, missing).
+
+    Index grid is sized from tol_ft (default SNAP_TOLERANCE_METERS);
+    positions are converted with scale (default UNIT_OUT) in one
+    UnitScale.array call.
+    """
     nodes = (
         FilteredElementCollector(doc)
         .OfCategory(BuiltInCategory.OST_AnalyticalNodes)
         .WhereElementIsNotElementType()
         .ToElements()
     )
-    nodes_map = {}
-    out = []
+    if scale is None:
+        scale = default_unit_scale()
+    if tol_ft is None:
+        tol_ft = scale.meters_to_internal(SNAP_TOLERANCE_METERS)
+    log = get_logger(log_file)
+    nodes_map = NodeIndex(tol_ft)
+    kept = []
+    coords = array("d")
     missing = 0
     for n in nodes:
         nid = eid_to_int(n.Id)
         pos = get_node_position(n)
         if pos is None:
             missing += 1
-            log_msg(
-                "Node {} missing position".format(nid if nid is not None else n.UniqueId),
-                log_file,
-            )
+            log.warning("Node {} missing position", nid if nid is not None else n.UniqueId)
             continue
         if nid is not None:
-            nodes_map[nid] = pos
-        out.append(
-            Node(
-                id=nid,
-                unique_id=n.UniqueId,
-                position=xyz_to_out(pos),
-                units=UNIT_OUT.lower(),
-            )
-        )
+            nodes_map.add(nid, pos)
+        kept.append((nid, n.UniqueId))
+        coords.extend((pos.X, pos.Y, pos.Z))
+    scaled = scale.array(coords)
+    out = [
+        Node(id=nid, unique_id=uid, position=scaled[3 * k:3 * k + 3], units=scale.name)
+        for k, (nid, uid) in enumerate(kept)
+    ]
     return nodes_map, out, len(nodes), missing
 
 
@@ -76,7 +193,12 @@ def squared_dist(a, b):
 
 
 def find_closest_node_id(pt, nodes_map, tol_ft):
-    """Closest node id within tol."""
+    """Closest node id within tol.
+
+    Grid lookup when given a NodeIndex, linear scan for a plain dict.
+    """
+    if isinstance(nodes_map, NodeIndex):
+        return nodes_map.closest(pt.X, pt.Y, pt.Z, tol_ft)
     best_id = None
     best_d2 = tol_ft * tol_ft
     for nid, npt in nodes_map.items():
@@ -87,4 +209,4 @@ def find_closest_node_id(pt, nodes_map, tol_ft):
     return best_id
 
 
-__all__ = ["collect_nodes", "find_closest_node_id"]
+__all__ = ["NodeIndex", "collect_nodes", "find_closest_node_id"]
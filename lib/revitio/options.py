@@ -0,0 +1,91 @@
+"""On/off switches of an analytical export.
+
+ExportOptions groups the flags ExportAnalyticalModel used to take one
+keyword at a time. Each flag left as None is read from its
+REVIT_ANALYTICAL_* variable (set and not 0/false/no means on).
+
+A snapshot run only extracts raw data; the export is built later by
+python -m revitio.snapshot. Flags that shape that export therefore
+cannot apply to it and are rejected next to snapshot: stream, columnar
+and incremental have no snapshot equivalent; compact, consolidate and
+topology are given to revitio.snapshot as --compact,
+--consolidate-nodes and --topology instead.
+"""
+import os
+
+# flag -> environment variable
+ENV_VARS = (
+    ("profile", "REVIT_ANALYTICAL_PROFILE"),
+    ("stream", "REVIT_ANALYTICAL_STREAM"),
+    ("compact", "REVIT_ANALYTICAL_COMPACT"),
+    ("columnar", "REVIT_ANALYTICAL_COLUMNAR"),
+    ("incremental", "REVIT_ANALYTICAL_INCREMENTAL"),
+    ("snapshot", "REVIT_ANALYTICAL_SNAPSHOT"),
+    ("consolidate", "REVIT_ANALYTICAL_CONSOLIDATE_NODES"),
+    ("topology", "REVIT_ANALYTICAL_TOPOLOGY"),
+)
+
+# flags a snapshot run cannot honour -> what to do instead
+_NOT_WITH_SNAPSHOT = (
+    ("stream", "drop it"),
+    ("columnar", "drop it"),
+    ("incremental", "drop it"),
+    ("compact", "pass --compact to revitio.snapshot"),
+    ("consolidate", "pass --consolidate-nodes to revitio.snapshot"),
+    ("topology", "pass --topology to revitio.snapshot"),
+)
+
+
+def env_flag(name):
+    val = (os.environ.get(name) or "").strip().lower()
+    return val not in ("", "0", "false", "no")
+
+
+class ExportOptions(object):
+    """Resolved export flags; None arguments come from the environment.
+
+    profile: stage timings beside the JSON. stream: write members as they
+    are built, keep none. compact: JSON without whitespace. columnar:
+    also write a .rvcol (revitio.columnar). incremental: reuse unchanged
+    records of the last export (revitio.incremental). snapshot: write
+    only the raw snapshot (revitio.snapshot). consolidate: merge
+    coincident nodes, virtual nodes for orphan ends (revitio.consolidate).
+    topology: connectivity graph section (revitio.topology).
+    """
+    __slots__ = tuple(name for name, _ in ENV_VARS)
+
+    def __init__(self, profile=None, stream=None, compact=None, columnar=None, incremental=None,
+                 snapshot=None, consolidate=None, topology=None):
+        given = dict(profile=profile, stream=stream, compact=compact, columnar=columnar,
+                     incremental=incremental, snapshot=snapshot, consolidate=consolidate, topology=topology)
+        for name, var in ENV_VARS:
+            value = given[name]
+            setattr(self, name, env_flag(var) if value is None else bool(value))
+        self.validate()
+
+    def validate(self):
+        """Raise ValueError for flag combinations that cannot all apply."""
+        if self.snapshot:
+            clashes = ["{} ({})".format(name, fix) for name, fix in _NOT_WITH_SNAPSHOT if getattr(self, name)]
+            if clashes:
+                raise ValueError("snapshot cannot be combined with: {}".format(", ".join(clashes)))
+        return self
+
+    @classmethod
+    def resolve(cls, options=None, **flags):
+        """ExportOptions from an existing one (or None) with non-None flags overriding."""
+        if options is None:
+            return cls(**flags)
+        merged = options.to_dict()
+        merged.update((k, v) for k, v in flags.items() if v is not None)
+        return cls(**merged)
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+    def __repr__(self):
+        on = [name for name in self.__slots__ if getattr(self, name)]
+        return "ExportOptions({})".format(", ".join(on) or "none")
+
+
+__all__ = ["ExportOptions", "env_flag", "ENV_VARS"]
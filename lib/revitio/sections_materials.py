@@ -35,32 +35,38 @@ def safe_param_str(elem, bip):
     return None
 
 
+# (BuiltInParameter name, UnitTypeId name); names missing from the running
+# API version (or outside Revit) are skipped.
+_SECTION_NUMERIC_PARAM_NAMES = [
+    ("STRUCTURAL_SECTION_AREA", "SquareMeters"),
+    ("STRUCTURAL_SECTION_COMMON_WIDTH", "Meters"),
+    ("STRUCTURAL_SECTION_COMMON_HEIGHT", "Meters"),
+    ("STRUCTURAL_SECTION_COMMON_DIAMETER", "Meters"),
+    ("STRUCTURAL_SECTION_COMMON_PERIMETER", "Meters"),
+    ("STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_STRONG_AXIS", "CubicMeters"),
+    ("STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_WEAK_AXIS", "CubicMeters"),
+    ("STRUCTURAL_SECTION_COMMON_SHEAR_AREA_STRONG_AXIS", "SquareMeters"),
+    ("STRUCTURAL_SECTION_COMMON_SHEAR_AREA_WEAK_AXIS", "SquareMeters"),
+    ("STRUCTURAL_SECTION_COMMON_TORSIONAL_MODULUS", "CubicMeters"),
+    ("STRUCTURAL_SECTION_ISHAPE_WEBHEIGHT", "Meters"),
+    ("STRUCTURAL_SECTION_ISHAPE_WEBTHICKNESS", "Meters"),
+    ("STRUCTURAL_SECTION_FLANGE_THICKNESS", "Meters"),
+    ("STRUCTURAL_SECTION_IWELDED_TOPFLANGEWIDTH", "Meters"),
+    ("STRUCTURAL_SECTION_IWELDED_TOPFLANGETHICKNESS", "Meters"),
+    ("STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGEWIDTH", "Meters"),
+    ("STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGETHICKNESS", "Meters"),
+    ("STRUCTURAL_SECTION_HSS_OUTERFILLET", "Meters"),
+    ("STRUCTURAL_SECTION_HSS_INNERFILLET", "Meters"),
+    ("STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_STRONG_AXIS", "MetersToTheFourthPower"),
+    ("STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_WEAK_AXIS", "MetersToTheFourthPower"),
+    ("STRUCTURAL_SECTION_COMMON_TORSIONAL_MOMENT_OF_INERTIA", "MetersToTheFourthPower"),
+    ("STRUCTURAL_SECTION_COMMON_WARPING_CONSTANT", "MetersToTheSixthPower"),
+]
 _SECTION_NUMERIC_PARAMS = [
-    (BuiltInParameter.STRUCTURAL_SECTION_AREA, UnitTypeId.SquareMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_WIDTH, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_HEIGHT, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_DIAMETER, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_PERIMETER, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_STRONG_AXIS, UnitTypeId.CubicMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_PLASTIC_MODULUS_WEAK_AXIS, UnitTypeId.CubicMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_SHEAR_AREA_STRONG_AXIS, UnitTypeId.SquareMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_SHEAR_AREA_WEAK_AXIS, UnitTypeId.SquareMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_TORSIONAL_MODULUS, UnitTypeId.CubicMeters),
-    (BuiltInParameter.STRUCTURAL_SECTION_ISHAPE_WEBHEIGHT, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_ISHAPE_WEBTHICKNESS, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_FLANGE_THICKNESS, UnitTypeId.Meters) if hasattr(BuiltInParameter, "STRUCTURAL_SECTION_FLANGE_THICKNESS") else None,
-    (BuiltInParameter.STRUCTURAL_SECTION_IWELDED_TOPFLANGEWIDTH, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_IWELDED_TOPFLANGETHICKNESS, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGEWIDTH, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_IWELDED_BOTTOMFLANGETHICKNESS, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_HSS_OUTERFILLET, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_HSS_INNERFILLET, UnitTypeId.Meters),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_STRONG_AXIS, UnitTypeId.MetersToTheFourthPower),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_MOMENT_OF_INERTIA_WEAK_AXIS, UnitTypeId.MetersToTheFourthPower),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_TORSIONAL_MOMENT_OF_INERTIA, UnitTypeId.MetersToTheFourthPower),
-    (BuiltInParameter.STRUCTURAL_SECTION_COMMON_WARPING_CONSTANT, UnitTypeId.MetersToTheSixthPower),
+    (getattr(BuiltInParameter, bip), getattr(UnitTypeId, unit))
+    for bip, unit in _SECTION_NUMERIC_PARAM_NAMES
+    if hasattr(BuiltInParameter, bip) and hasattr(UnitTypeId, unit)
 ]
-_SECTION_NUMERIC_PARAMS = [t for t in _SECTION_NUMERIC_PARAMS if t is not None]
 
 
 def section_info_from_symbol(symbol, shape_str):
@@ -83,26 +89,81 @@ def section_info_from_symbol(symbol, shape_str):
     return type_info, (SectionProperties(values=props) if props else None)
 
 
-def section_info_for_member(doc, member, pi, pj, log_file=None):
-    te = None
+class SectionCache(object):
+    """Run-scoped section lookups keyed by SectionTypeId (and shape).
+
+    Holds the SectionInfo and property dict read from each section type so
+    members sharing a type reuse them. Entries are shared; treat read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def summary(self):
+        return "Section cache: {} types, {} hits, {} misses".format(len(self._entries), self.hits, self.misses)
+
+
+def section_info_for_member(doc, member, pi, pj, log_file=None, cache=None):
+    tid = None
     try:
         tid = member.SectionTypeId if hasattr(member, "SectionTypeId") else None
-        if eid_positive(tid):
-            te = doc.GetElement(tid)
     except Exception:
-        te = None
+        tid = None
     shape = None
     try:
         shape = str(getattr(member, "StructuralSectionShape"))
     except Exception:
         shape = None
+    key = None
+    if cache is not None and eid_positive(tid):
+        key = (eid_to_int(tid), shape)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0], entry[1], None
+    te = None
+    try:
+        if eid_positive(tid):
+            te = doc.GetElement(tid)
+    except Exception:
+        te = None
     if te is not None:
         ti, props = section_info_from_symbol(te, shape)
-        return ti, (props.values if props else None), None
-    return SectionInfo(type_id=None, type_name=None, family_name=None, shape=shape), None, None
+        entry = (ti, (props.values if props else None))
+    else:
+        entry = (SectionInfo(type_id=None, type_name=None, family_name=None, shape=shape), None)
+    if key is not None:
+        cache.put(key, entry)
+    return entry[0], entry[1], None
+
 
+def _material_ref(me):
+    return MaterialRef(id=eid_to_int(me.Id), name=getattr(me, "Name", None))
 
-def material_info(doc, analytical_member, host_elem=None):
+
+def material_info(doc, analytical_member, host_elem=None, resolver=None):
+    """Material from analytical member, else host param/type, else host ids.
+
+    Delegates to a MaterialResolver when given so lookups are memoized.
+    """
+    if resolver is not None:
+        return resolver.resolve(analytical_member, host_elem)
     # try analytical first
     try:
         if hasattr(analytical_member, "MaterialId"):
@@ -110,8 +171,8 @@ def material_info(doc, analytical_member, host_elem=None):
             if eid_positive(mid):
                 me = doc.GetElement(mid)
                 if me:
-                    ref = MaterialRef(id=eid_to_int(me.Id), name=getattr(me, "Name", None))
-                    return MaterialInfo(primary=ref, all=[ref])
+                    ref = _material_ref(me)
+                    return MaterialInfo(primary=ref, all_list=[ref])
     except Exception:
         pass
 
@@ -130,21 +191,115 @@ def material_info(doc, analytical_member, host_elem=None):
         if eid_positive(mat_id):
             me = doc.GetElement(mat_id)
             if me:
-                ref = MaterialRef(id=eid_to_int(me.Id), name=getattr(me, "Name", None))
-                return MaterialInfo(primary=ref, all=[ref])
+                ref = _material_ref(me)
+                return MaterialInfo(primary=ref, all_list=[ref])
         if host_elem is not None:
             ids = host_elem.GetMaterialIds(False) or host_elem.GetMaterialIds(True)
             if ids:
                 mats = [doc.GetElement(i) for i in ids]
                 mats = [m for m in mats if m]
-                refs = [MaterialRef(id=eid_to_int(m.Id), name=getattr(m, "Name", None)) for m in mats]
+                refs = [_material_ref(m) for m in mats]
                 if refs:
-                    return MaterialInfo(primary=refs[0], all=refs)
+                    return MaterialInfo(primary=refs[0], all_list=refs)
     except Exception:
         pass
     return None
 
 
+class MaterialResolver(object):
+    """Memoized material_info for one export run.
+
+    Caches material refs by material id, the type-level
+    STRUCTURAL_MATERIAL_PARAM by host type id, and MaterialInfo by the
+    refs it holds, so members sharing a material and type reuse the same
+    MaterialInfo. `saved` counts API round-trips the caches avoided.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._refs = {}        # material id -> MaterialRef or None
+        self._type_mats = {}   # host type id -> material ElementId or None
+        self._infos = {}       # tuple of material ids -> MaterialInfo
+        self.saved = 0
+
+    def material_ref(self, mat_id):
+        key = eid_to_int(mat_id)
+        ref = self._refs.get(key, self._MISSING)
+        if ref is not self._MISSING:
+            self.saved += 1
+            return ref
+        me = self.doc.GetElement(mat_id)
+        ref = _material_ref(me) if me else None
+        self._refs[key] = ref
+        return ref
+
+    def info_for(self, refs):
+        key = tuple(r.id for r in refs)
+        info = self._infos.get(key)
+        if info is None:
+            info = MaterialInfo(primary=refs[0], all_list=refs)
+            self._infos[key] = info
+        return info
+
+    def type_material_id(self, host_elem):
+        tid = host_elem.GetTypeId()
+        key = eid_to_int(tid)
+        mat_id = self._type_mats.get(key, self._MISSING)
+        if mat_id is not self._MISSING:
+            self.saved += 2  # GetElement + get_Parameter
+            return mat_id
+        mat_id = None
+        sym = self.doc.GetElement(tid)
+        if sym:
+            pt = sym.get_Parameter(BuiltInParameter.STRUCTURAL_MATERIAL_PARAM)
+            if pt and pt.HasValue:
+                mat_id = pt.AsElementId()
+        self._type_mats[key] = mat_id
+        return mat_id
+
+    def resolve(self, analytical_member, host_elem=None):
+        try:
+            if hasattr(analytical_member, "MaterialId"):
+                mid = getattr(analytical_member, "MaterialId")
+                if eid_positive(mid):
+                    ref = self.material_ref(mid)
+                    if ref is not None:
+                        return self.info_for([ref])
+        except Exception:
+            pass
+
+        try:
+            mat_id = None
+            if host_elem is not None:
+                p = host_elem.get_Parameter(BuiltInParameter.STRUCTURAL_MATERIAL_PARAM)
+                if p and p.HasValue:
+                    mat_id = p.AsElementId()
+                if (mat_id is None) or (not eid_positive(mat_id)):
+                    mat_id = self.type_material_id(host_elem)
+            if eid_positive(mat_id):
+                ref = self.material_ref(mat_id)
+                if ref is not None:
+                    return self.info_for([ref])
+            if host_elem is not None:
+                ids = host_elem.GetMaterialIds(False) or host_elem.GetMaterialIds(True)
+                if ids:
+                    refs = [self.material_ref(i) for i in ids]
+                    refs = [r for r in refs if r is not None]
+                    if refs:
+                        return self.info_for(refs)
+        except Exception:
+            pass
+        return None
+
+    def summary(self):
+        return "Material cache: {} materials, {} host types, {} API lookups saved".format(
+            len(self._refs), len(self._type_mats), self.saved
+        )
+
+
 __all__ = [
-    "safe_param_double", "safe_param_str", "section_info_from_symbol", "section_info_for_member", "material_info"
+    "safe_param_double", "safe_param_str", "section_info_from_symbol", "section_info_for_member", "material_info",
+    "SectionCache", "MaterialResolver"
 ]
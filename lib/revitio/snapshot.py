@@ -0,0 +1,417 @@
+"""Two-phase export: raw snapshot extraction, then a pure-Python transform.
+
+extract() is the only part that talks to Revit. It reads, per member,
+endpoints, local axes, section and release data, the direct host and
+the member material, plus node points and every host candidate curve,
+into plain lists (internal feet) that json.dump can write.
+
+transform() turns a snapshot into the same ExportResult the exporter
+builds: node snapping (or consolidation, see revitio.consolidate),
+heuristic host matching, material fallback to the host and record
+assembly, plus the optional topology section (revitio.topology). It needs no Revit, so it can run on any
+CPython, sharded over a ProcessPoolExecutor with workers > 1 (3.7+).
+
+    python -m revitio.snapshot snapshot.json [--out PATH] [--workers N] [--shard-size N] [--compact]
+                                             [--consolidate-nodes] [--topology]
+
+Snapshot layout (format 1):
+    nodes      [id, unique_id, x, y, z] ([id, unique_id, None, None, None,
+               output position] for nodes without an id, never snapped to)
+    hosts      [id, unique_id, material index, curve [ax, ay, az, bx, by, bz] or None]
+    sections   [section dict, section property dict or None]
+    materials  [[material id, name], ...] per distinct MaterialInfo
+    members    [id, unique_id, ends (6 floats) or None, direct host index,
+                section index, member material index, releases dict,
+                local axes dict, structural role, cross section rotation]
+"""
+import sys
+import json
+import datetime
+import argparse
+
+try:
+    from Autodesk.Revit.DB import Curve
+except Exception:  # allow outside Revit
+    Curve = object
+
+from .utils import (
+    UnitScale, SNAP_TOLERANCE_METERS, HOST_MATCH_TOL_METERS, eid_to_int, model_name, get_logger,
+)
+from .nodes import NodeIndex, collect_nodes, find_closest_node_id
+from .consolidate import consolidate
+from .topology import ConnectivityGraph
+from .host_match import HostMatchIndex, BatchHostMatcher, collect_host_candidates
+from .member_geometry import MemberGeometry, Point
+from .sections_materials import section_info_for_member, SectionCache, MaterialResolver
+from .releases import read_releases
+from .jsonstream import write_export_stream
+from .models import (
+    Node, LineGeom, SectionInfo, SectionProperties, MaterialRef, MaterialInfo, Releases, LocalAxes,
+    MemberRecord, ExportCounts, ExportResult,
+)
+
+SNAPSHOT_FORMAT = 1
+
+# member row slots
+(_ID, _UID, _ENDS, _DIRECT_HOST, _SECTION, _MATERIAL, _RELEASES, _AXES, _ROLE, _ROTATION) = range(10)
+
+
+class _Tables(object):
+    """De-duplicated host/section/material rows built during extraction."""
+
+    def __init__(self, doc, resolver):
+        self.doc = doc
+        self.resolver = resolver
+        self.hosts = []
+        self.host_index = {}     # host id -> row
+        self.sections = []
+        self.section_index = {}  # (type id, shape) -> row
+        self.materials = []
+        self.material_index = {}  # ((id, name), ...) -> row
+
+    def material(self, info):
+        if info is None:
+            return None
+        refs = tuple((r.id, r.name) for r in info.all)
+        row = self.material_index.get(refs)
+        if row is None:
+            row = self.material_index[refs] = len(self.materials)
+            self.materials.append([list(r) for r in refs])
+        return row
+
+    def host(self, elem, curve=None):
+        hid = eid_to_int(elem.Id)
+        row = self.host_index.get(hid)
+        if row is None:
+            # same material the exporter would take when this host is picked
+            material = self.material(self.resolver.resolve(None, elem))
+            row = self.host_index[hid] = len(self.hosts)
+            self.hosts.append([hid, elem.UniqueId, material, curve])
+        elif curve is not None:
+            self.hosts[row][3] = curve
+        return row
+
+    def section(self, info, props):
+        key = (info.type_id, info.shape) if info is not None else None
+        row = self.section_index.get(key)
+        if row is None:
+            row = self.section_index[key] = len(self.sections)
+            self.sections.append([info.to_dict() if info is not None else None, props or None])
+        return row
+
+
+def _direct_host(doc, member):
+    """Associated physical element, tested the way buildMemberRecord does."""
+    try:
+        if hasattr(member, 'GetElementId'):
+            pid = member.GetElementId()
+            if pid and getattr(pid, 'IntegerValue', 0) > 0:
+                return doc.GetElement(pid)
+    except Exception:
+        pass
+    return None
+
+
+def extract(doc, members, scale=None, log_file=None):
+    """Snapshot dict for the given AnalyticalMember elements (Revit phase)."""
+    scale = scale or UnitScale()
+    snap_ft = scale.meters_to_internal(SNAP_TOLERANCE_METERS)
+    host_ft = scale.meters_to_internal(HOST_MATCH_TOL_METERS)
+    log = get_logger(log_file)
+    section_cache = SectionCache()
+    tables = _Tables(doc, MaterialResolver(doc))
+
+    node_map, node_objects, total_nodes, _missing = collect_nodes(doc, log_file, snap_ft, scale=scale)
+    nodes = []
+    for node in node_objects:
+        pt = node_map.get(node.id) if node.id is not None else None
+        if pt is None:
+            nodes.append([node.id, node.unique_id, None, None, None, node.position])
+        else:
+            nodes.append([node.id, node.unique_id, pt.X, pt.Y, pt.Z])
+
+    # Host candidates in collector order, as HostMatchIndex.from_document adds them
+    try:
+        candidates = collect_host_candidates(doc)
+    except Exception:
+        candidates = []
+    for inst in candidates:
+        try:
+            loc = getattr(inst, "Location", None)
+            if loc is None or not hasattr(loc, "Curve"):
+                continue
+            crv = loc.Curve
+            if not isinstance(crv, Curve):
+                continue
+            a = crv.GetEndPoint(0)
+            b = crv.GetEndPoint(1)
+            tables.host(inst, [a.X, a.Y, a.Z, b.X, b.Y, b.Z])
+        except Exception:
+            continue
+
+    geometry = MemberGeometry.extract(members, log_file)
+    ends = geometry.ends
+    rows = []
+    for n, member in enumerate(members):
+        uid = member.UniqueId
+        pi, pj = geometry.endpoints(n)
+        if pi is None or pj is None:
+            rows.append([eid_to_int(member.Id), uid, None, None, None, None, None, None, None, None])
+            continue
+        section, props, _ = section_info_for_member(doc, member, pi, pj, log_file, cache=section_cache)
+        host = _direct_host(doc, member)
+        releases = read_releases(member)
+        axes = geometry.local_axes(n)
+        rows.append([
+            eid_to_int(member.Id),
+            uid,
+            list(ends[6 * n:6 * n + 6]),
+            tables.host(host) if host is not None else None,
+            tables.section(section, props),
+            tables.material(tables.resolver.resolve(member, None)),
+            releases.to_dict() if releases else None,
+            axes.to_dict() if axes else None,
+            str(getattr(member, "StructuralRole", None)) if hasattr(member, "StructuralRole") else None,
+            geometry.cross_section_rotation(n),
+        ])
+    log.info("Snapshot: {} members, {} nodes, {} hosts, {} sections, {} materials, {} geometry fallbacks",
+             len(rows), len(nodes), len(tables.hosts), len(tables.sections), len(tables.materials),
+             len(geometry.fallback))
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "model": model_name(doc),
+        "exported_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "units": scale.name,
+        "unit_factor": scale.factor,
+        "snap_tolerance_m": SNAP_TOLERANCE_METERS,
+        "snap_tolerance_ft": snap_ft,
+        "host_match_tol_ft": host_ft,
+        "nodes_seen": total_nodes,
+        "nodes": nodes,
+        "hosts": tables.hosts,
+        "sections": tables.sections,
+        "materials": tables.materials,
+        "members": rows,
+    }
+
+
+def write_snapshot(snapshot, path):
+    with open(path, "w") as fp:
+        json.dump(snapshot, fp, separators=(",", ":"))
+    return path
+
+
+def load_snapshot(path):
+    with open(path, "r") as fp:
+        snapshot = json.load(fp)
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError("Unsupported snapshot format: {}".format(snapshot.get("format")))
+    return snapshot
+
+
+class _Context(object):
+    """Everything but the member rows, rebuilt once per process."""
+
+    def __init__(self, snapshot):
+        self.units = snapshot["units"]
+        self.factor = snapshot["unit_factor"]
+        self.snap_ft = snapshot["snap_tolerance_ft"]
+        self.node_map = NodeIndex(self.snap_ft)
+        for row in snapshot["nodes"]:
+            if row[2] is not None:
+                self.node_map.add(row[0], Point(row[2], row[3], row[4]))
+        self.host_index = HostMatchIndex(snapshot["host_match_tol_ft"])
+        for n, row in enumerate(snapshot["hosts"]):
+            c = row[3]
+            if c is not None:
+                self.host_index.add(n, (c[0], c[1], c[2]), (c[3], c[4], c[5]))
+        self.hosts = snapshot["hosts"]
+        self.materials = [
+            MaterialInfo(primary=refs[0], all_list=refs)
+            for refs in ([MaterialRef(i, name) for i, name in row] for row in snapshot["materials"])
+        ]
+        self.sections = [
+            (SectionInfo.from_dict(info), SectionProperties(values=props) if props else None)
+            for info, props in snapshot["sections"]
+        ]
+
+    def record(self, row, node_ids=None, matched=None):
+        """MemberRecord for a row; matched is a batch host match (host row, -1 for none)."""
+        units = self.units
+        ends = row[_ENDS]
+        if ends is None:
+            return MemberRecord(
+                id=row[_ID], unique_id=row[_UID], node_i=None, node_j=None, line=None, units=units,
+                status="no_curve", material=None, section=None, section_properties=None,
+            )
+        pi = Point(ends[0], ends[1], ends[2])
+        pj = Point(ends[3], ends[4], ends[5])
+        if node_ids is not None:
+            node_i, node_j = node_ids
+        else:
+            node_i = find_closest_node_id(pi, self.node_map, self.snap_ft)
+            node_j = find_closest_node_id(pj, self.node_map, self.snap_ft)
+        host = row[_DIRECT_HOST]
+        if host is None:
+            if matched is None:
+                host = self.host_index.match(ends[0:3], ends[3:6])
+            else:
+                host = matched if matched >= 0 else None
+        material = row[_MATERIAL]
+        if material is None and host is not None:
+            material = self.hosts[host][2]
+        section, props = self.sections[row[_SECTION]]
+        f = self.factor
+        return MemberRecord(
+            id=row[_ID],
+            unique_id=row[_UID],
+            node_i=node_i,
+            node_j=node_j,
+            line=LineGeom([e * f for e in ends[0:3]], [e * f for e in ends[3:6]], units=units),
+            units=units,
+            status="ok" if (node_i is not None and node_j is not None) else ("no_node_i" if node_i is None else "no_node_j"),
+            material=self.materials[material] if material is not None else None,
+            section=section,
+            section_properties=props,
+            releases=Releases.from_dict(row[_RELEASES]),
+            local_axes=LocalAxes.from_dict(row[_AXES]),
+            structural_role=row[_ROLE],
+            cross_section_rotation_rad=row[_ROTATION],
+            host_id=self.hosts[host][0] if host is not None else None,
+            host_unique_id=self.hosts[host][1] if host is not None else None,
+        )
+
+
+_WORKER = []  # per-process _Context
+
+
+def _init_worker(shared):
+    del _WORKER[:]
+    _WORKER.append(_Context(shared))
+
+
+def _records(ctx, rows, node_ids=None, matched=None):
+    if node_ids is None:
+        node_ids = [None] * len(rows)
+    if matched is None:
+        matched = [None] * len(rows)
+    return [ctx.record(row, ids, host) for row, ids, host in zip(rows, node_ids, matched)]
+
+
+def _transform_shard(task):
+    rows, node_ids, matched = task
+    return _records(_WORKER[0], rows, node_ids, matched)
+
+
+def _shards(rows, size, node_ids=None, matched=None):
+    for start in range(0, len(rows), size):
+        stop = start + size
+        yield (rows[start:stop], node_ids[start:stop] if node_ids is not None else None,
+               matched[start:stop] if matched is not None else None)
+
+
+def _match_hosts(snapshot, ctx):
+    """Host row (-1 for none) per member without a direct host, None for the rest; None without NumPy."""
+    matcher = BatchHostMatcher(ctx.host_index)
+    if not matcher.use_numpy:
+        return None
+    rows = snapshot["members"]
+    ends = [
+        (row[_ENDS][0:3], row[_ENDS][3:6]) if row[_ENDS] is not None and row[_DIRECT_HOST] is None else None
+        for row in rows
+    ]
+    hosts = matcher.match_many(ends)
+    return [None if e is None else (-1 if h is None else h) for e, h in zip(ends, hosts)]
+
+
+def _consolidate(snapshot, ctx):
+    endpoints = [
+        None if row[_ENDS] is None else (Point(*row[_ENDS][0:3]), Point(*row[_ENDS][3:6]))
+        for row in snapshot["members"]
+    ]
+    return consolidate(ctx.node_map, endpoints, ctx.snap_ft)
+
+
+def transform(snapshot, workers=0, shard_size=2000, consolidate_nodes=False, topology=False):
+    """ExportResult from a snapshot; workers > 1 shards members over processes."""
+    rows = snapshot["members"]
+    ctx = _Context(snapshot)
+    consolidation = _consolidate(snapshot, ctx) if consolidate_nodes else None
+    node_ids = consolidation.member_nodes if consolidation is not None else None
+    # heuristic hosts for all members in one vectorised pass (NumPy only)
+    matched = _match_hosts(snapshot, ctx)
+    if workers and workers > 1 and len(rows) > shard_size:
+        from concurrent.futures import ProcessPoolExecutor
+        shared = dict((k, v) for k, v in snapshot.items() if k != "members")
+        members = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as pool:
+            for chunk in pool.map(_transform_shard, _shards(rows, shard_size, node_ids, matched)):
+                members.extend(chunk)
+    else:
+        members = _records(ctx, rows, node_ids, matched)
+    result = snapshot_result(snapshot, members, consolidation)
+    if topology:
+        result.topology = ConnectivityGraph.from_result(result).to_dict()
+    return result
+
+
+def snapshot_result(snapshot, members, consolidation=None):
+    """ExportResult with the snapshot's header and nodes around members."""
+    f = snapshot["unit_factor"]
+    nodes = [
+        Node(id=row[0], unique_id=row[1],
+             position=row[5] if row[2] is None else [row[2] * f, row[3] * f, row[4] * f],
+             units=snapshot["units"])
+        for row in snapshot["nodes"]
+    ]
+    if consolidation is not None:
+        nodes = consolidation.nodes(nodes, f, snapshot["units"])
+    return ExportResult(
+        model=snapshot["model"],
+        exported_at=snapshot["exported_at"],
+        units=snapshot["units"],
+        snap_tolerance_m=snapshot["snap_tolerance_m"],
+        counts=ExportCounts(members_total=len(snapshot["members"]), nodes_seen=snapshot["nodes_seen"]),
+        analytical_nodes=nodes,
+        analytical_members=members,
+        node_consolidation=consolidation.to_dict(snapshot["snap_tolerance_m"]) if consolidation is not None else None,
+    )
+
+
+def write_export(result, path, compact=False):
+    """Same bytes as ExportAnalyticalModel.writeOutput."""
+    with open(path, "w") as fp:
+        write_export_stream(fp, result, result.analytical_members, compact=compact)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an analytical export from a Revit snapshot.")
+    parser.add_argument("snapshot")
+    parser.add_argument("--out", help="export JSON path (default members_* beside the snapshot)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0/1 = in-process)")
+    parser.add_argument("--shard-size", type=int, default=2000, help="members per worker task")
+    parser.add_argument("--compact", action="store_true", help="write JSON without whitespace")
+    parser.add_argument("--consolidate-nodes", action="store_true",
+                        help="merge coincident nodes and add virtual nodes at orphan member ends")
+    parser.add_argument("--topology", action="store_true", help="add the connectivity topology section")
+    args = parser.parse_args(argv)
+    snapshot = load_snapshot(args.snapshot)
+    out = args.out
+    if not out:
+        head, _, tail = args.snapshot.replace("\\", "/").rpartition("/")
+        out = (head + "/" if head else "") + "members_" + (tail[len("snapshot_"):] if tail.startswith("snapshot_") else tail)
+    result = transform(snapshot, workers=args.workers, shard_size=args.shard_size,
+                       consolidate_nodes=args.consolidate_nodes, topology=args.topology)
+    write_export(result, out, compact=args.compact)
+    print("{} members, {} nodes -> {}".format(len(result.analytical_members), len(result.analytical_nodes), out))
+    return 0
+
+
+__all__ = [
+    "extract", "transform", "snapshot_result", "write_snapshot", "load_snapshot", "write_export", "SNAPSHOT_FORMAT",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Framing symbol lookup for the section updater.
+
+SymbolIndex keys every structural framing type by element id, by exact
+(family, type) names and by case/whitespace-folded names. Lookups try
+the type id first (accepted when the names agree or are absent). The
+index is cached per document for the session and rebuilt when the set
+of framing type ids changes or the document is not the same one. A
+reused index re-reads only the entries whose Element.VersionGuid
+changed or whose element is no longer valid; without VersionGuid (pre
+2024) a miss or a renamed hit rebuilds it once, so renames that keep
+the ids are picked up too.
+"""
+import difflib
+
+try:
+    from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, BuiltInParameter, Element
+except Exception:  # allow outside Revit
+    FilteredElementCollector = BuiltInCategory = BuiltInParameter = Element = None
+
+from .utils import eid_to_int
+
+
+def _norm(s):
+    """Trim and ensure plain str."""
+    try:
+        if s is None:
+            return ""
+        return s.strip()
+    except Exception:
+        return s or ""
+
+
+def fold(s):
+    """Lower-case with runs of whitespace collapsed."""
+    return " ".join(_norm(s).split()).lower()
+
+
+def get_type_name(sym):
+    """Return the FamilySymbol type name, robust under IronPython."""
+    # 1, Built in parameter is reliable in IronPython
+    try:
+        if BuiltInParameter is not None:
+            p = sym.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM)
+            if p:
+                v = p.AsString()
+                if v:
+                    return _norm(v)
+    except Exception:
+        pass
+    # 2, Static getter avoids IronPython name binding quirks
+    try:
+        if Element is not None:
+            return _norm(Element.Name.__get__(sym))
+    except Exception:
+        pass
+    # 3, Direct attribute last
+    try:
+        return _norm(sym.Name)
+    except Exception:
+        return ""
+
+
+def get_family_name(sym):
+    """Return the Family name for a symbol, robust under IronPython."""
+    # 1, Try parameter if available on the symbol
+    try:
+        if BuiltInParameter is not None:
+            # Not all versions expose SYMBOL_FAMILY_NAME_PARAM, guard it
+            p = sym.get_Parameter(getattr(BuiltInParameter, 'SYMBOL_FAMILY_NAME_PARAM', None))
+            if p:
+                v = p.AsString()
+                if v:
+                    return _norm(v)
+    except Exception:
+        pass
+    # 2, Use the Family object
+    try:
+        fam = getattr(sym, 'Family', None)
+        if fam is not None:
+            try:
+                if Element is not None:
+                    return _norm(Element.Name.__get__(fam))
+            except Exception:
+                pass
+            try:
+                return _norm(fam.Name)
+            except Exception:
+                pass
+    except Exception:
+        pass
+    return ""
+
+
+def framing_type_ids(doc):
+    """Sorted int ids of structural framing types (one collector call, no names)."""
+    ids = (FilteredElementCollector(doc)
+           .OfCategory(BuiltInCategory.OST_StructuralFraming)
+           .WhereElementIsElementType()
+           .ToElementIds())
+    return sorted(eid_to_int(i) for i in ids)
+
+
+def _version(elem):
+    """Element.VersionGuid as text, None where the API lacks it."""
+    try:
+        guid = getattr(elem, "VersionGuid", None)
+    except Exception:
+        return None
+    return str(guid) if guid is not None else None
+
+
+def _valid(obj):
+    try:
+        return bool(getattr(obj, "IsValidObject", True))
+    except Exception:
+        return False
+
+
+def _same_doc(a, b):
+    if a is b:
+        return True
+    if not (_valid(a) and _valid(b)):
+        return False
+    try:
+        return bool(a.Equals(b))
+    except Exception:
+        return False
+
+
+class SymbolIndex(object):
+    """Framing symbols by id, exact names and folded names."""
+
+    def __init__(self, doc, type_ids=None):
+        self.doc = doc
+        self.type_ids = type_ids
+        self.rebuilds = 0
+        self.build()
+
+    def build(self):
+        """(Re)read every framing type's names."""
+        self.by_id = {}
+        self.by_names = {}
+        self.by_folded = {}
+        self.names = {}       # id -> (family, type)
+        self.versions = {}    # id -> VersionGuid text (None when unavailable)
+        self.validated = True  # every entry checked against its VersionGuid this run
+        self.renamed = False  # set when a returned symbol no longer has its indexed names
+        self.fresh = True     # built during this run (a cached index is not)
+        self._verified = set()
+        self._suggestions = {}
+        syms = (FilteredElementCollector(self.doc)
+                .OfCategory(BuiltInCategory.OST_StructuralFraming)
+                .WhereElementIsElementType()
+                .ToElements())
+        for s in syms:
+            try:
+                self.add(s, get_family_name(s), get_type_name(s))
+            except Exception:
+                continue
+
+    def add(self, sym, fam_name, type_name):
+        sid = eid_to_int(sym.Id)
+        self.by_id[sid] = sym
+        self.names[sid] = (fam_name, type_name)
+        self.versions[sid] = _version(sym)
+        if fam_name and type_name:
+            # last duplicate wins, as the old name-only index did
+            self.by_names[(fam_name, type_name)] = sym
+            self.by_folded[(fold(fam_name), fold(type_name))] = sym
+
+    def _drop_names(self, sid, sym):
+        fam_name, type_name = self.names.get(sid, ("", ""))
+        if self.by_names.get((fam_name, type_name)) is sym:
+            del self.by_names[(fam_name, type_name)]
+        folded = (fold(fam_name), fold(type_name))
+        if self.by_folded.get(folded) is sym:
+            del self.by_folded[folded]
+
+    def revalidate(self, doc):
+        """Prepare a cached index for a new run on doc; returns the entries re-read.
+
+        Entries whose element is no longer valid are fetched again, and
+        those whose VersionGuid changed get their names re-read. When an
+        element has no VersionGuid the index cannot vouch for its names,
+        so a miss will rebuild it (see lookup).
+        """
+        self.doc = doc
+        self.fresh = False
+        self.renamed = False
+        self.validated = True
+        self._verified = set()
+        self._suggestions = {}
+        refreshed = 0
+        for sid, sym in list(self.by_id.items()):
+            if not _valid(sym):
+                try:
+                    current = doc.GetElement(sym.Id)
+                except Exception:
+                    current = None
+                if current is None:
+                    self._drop_names(sid, sym)
+                    del self.by_id[sid], self.names[sid], self.versions[sid]
+                    refreshed += 1
+                    continue
+            else:
+                current = sym
+                version = _version(sym)
+                if version is None:
+                    self.validated = False
+                    continue
+                if version == self.versions.get(sid):
+                    continue
+            self._drop_names(sid, sym)
+            try:
+                self.add(current, get_family_name(current), get_type_name(current))
+            except Exception:
+                del self.by_id[sid], self.names[sid], self.versions[sid]
+            refreshed += 1
+        return refreshed
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def _verify(self, sym):
+        """Names of a returned symbol still match the index (checked once per run)."""
+        sid = eid_to_int(sym.Id)
+        if sid in self._verified:
+            return True
+        ok = (get_family_name(sym), get_type_name(sym)) == self.names.get(sid)
+        if ok:
+            self._verified.add(sid)
+        else:
+            self.renamed = True
+        return ok
+
+    def lookup(self, fam_name, type_name, type_id=None):
+        """(symbol, how) with how in type_id/names/normalized, or (None, None).
+
+        A stale hit (symbol renamed since indexing), or a miss on a cached
+        index that could not be checked by VersionGuid, rebuilds it once.
+        """
+        sym, how = self._lookup(fam_name, type_name, type_id)
+        if sym is None and (self.renamed or not (self.fresh or self.validated)):
+            self.rebuilds += 1
+            self.build()
+            sym, how = self._lookup(fam_name, type_name, type_id)
+        return sym, how
+
+    def _lookup(self, fam_name, type_name, type_id):
+        fam_name = _norm(fam_name)
+        type_name = _norm(type_name)
+        if type_id is not None:
+            try:
+                sym = self.by_id.get(int(type_id))
+            except (TypeError, ValueError):
+                sym = None
+            if sym is not None:
+                fam, typ = self.names[eid_to_int(sym.Id)]
+                if (not fam_name and not type_name) or (fold(fam), fold(typ)) == (fold(fam_name), fold(type_name)):
+                    if self._verify(sym):
+                        return sym, "type_id"
+        if fam_name and type_name:
+            sym = self.by_names.get((fam_name, type_name))
+            if sym is not None and self._verify(sym):
+                return sym, "names"
+            sym = self.by_folded.get((fold(fam_name), fold(type_name)))
+            if sym is not None and self._verify(sym):
+                return sym, "normalized"
+        return None, None
+
+    def suggest(self, fam_name, type_name, n=3):
+        """Closest indexed 'family :: type' labels for a missing pair."""
+        key = (fold(fam_name), fold(type_name))
+        hit = self._suggestions.get(key)
+        if hit is None:
+            labels = {}
+            for fam, typ in self.names.values():
+                if fam and typ:
+                    labels.setdefault("{} :: {}".format(fold(fam), fold(typ)), "{} :: {}".format(fam, typ))
+            close = difflib.get_close_matches("{} :: {}".format(*key), list(labels), n=n, cutoff=0.6)
+            hit = self._suggestions[key] = [labels[c] for c in close]
+        return hit
+
+
+_SESSION = {}  # document key -> SymbolIndex
+
+
+def _doc_key(doc):
+    # .NET hash is stable across Python wrappers of the same Document
+    try:
+        ident = doc.GetHashCode()
+    except Exception:
+        ident = id(doc)
+    return (ident, getattr(doc, "PathName", None) or getattr(doc, "Title", None))
+
+
+def symbol_index(doc, refresh=False):
+    """Session-cached SymbolIndex for doc.
+
+    Rebuilt when the framing type ids changed, a rename was seen, or the
+    cached index belongs to another (or a closed) document; otherwise
+    revalidated entry by entry. Returns (index, cached) where cached is
+    True when the previous index was reused.
+    """
+    key = _doc_key(doc)
+    ids = framing_type_ids(doc)
+    index = _SESSION.get(key)
+    if (index is not None and not refresh and not index.renamed and index.type_ids == ids
+            and _same_doc(index.doc, doc)):
+        index.revalidate(doc)
+        return index, True
+    index = _SESSION[key] = SymbolIndex(doc, ids)
+    return index, False
+
+
+def clear_session():
+    _SESSION.clear()
+
+
+__all__ = [
+    "SymbolIndex", "symbol_index", "clear_session", "framing_type_ids",
+    "get_type_name", "get_family_name", "fold",
+]
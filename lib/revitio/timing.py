@@ -0,0 +1,109 @@
+"""Stage timers and counters for the exporter.
+
+Disabled timers hand out a shared no-op context, so instrumented code
+costs one method call per stage.
+"""
+import os
+import json
+import time
+
+_clock = getattr(time, "perf_counter", time.time)
+
+_PERCENTILES = (50, 90, 95, 99)
+
+
+class _NullStage(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage(object):
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.add(self.name, _clock() - self.start)
+        return False
+
+
+def profiling_from_env():
+    """REVIT_ANALYTICAL_PROFILE set and not 0/false/no."""
+    val = (os.environ.get("REVIT_ANALYTICAL_PROFILE") or "").strip().lower()
+    return val not in ("", "0", "false", "no")
+
+
+class StageTimer(object):
+    """Accumulates per-stage seconds, call counts, counters and per-member totals."""
+
+    def __init__(self, enabled=False, slowest=20):
+        self.enabled = bool(enabled)
+        self.slowest = slowest
+        self.totals = {}
+        self.calls = {}
+        self.counters = {}
+        self.member_times = []  # (seconds, member id)
+        self._started = _clock()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def now(self):
+        return _clock() if self.enabled else 0.0
+
+    def add(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def member(self, member_id, seconds):
+        if self.enabled:
+            self.member_times.append((seconds, member_id))
+
+    def to_dict(self):
+        times = sorted(t for t, _ in self.member_times)
+        per_member = {"count": len(times)}
+        if times:
+            n = len(times)
+            for p in _PERCENTILES:
+                # nearest-rank percentile
+                per_member["p{}".format(p)] = times[max(0, min(n - 1, int(-(-p * n // 100)) - 1))]
+            per_member["max"] = times[-1]
+            per_member["mean"] = sum(times) / n
+        slowest = sorted(self.member_times, key=lambda x: x[0], reverse=True)[:self.slowest]
+        return {
+            "wall_s": _clock() - self._started,
+            "stages": dict(
+                (name, {"total_s": self.totals[name], "calls": self.calls.get(name, 0)})
+                for name in self.totals
+            ),
+            "counters": dict(self.counters),
+            "per_member_s": per_member,
+            "slowest_members": [{"id": mid, "seconds": t} for t, mid in slowest],
+        }
+
+    def write(self, path):
+        with open(path, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+        return path
+
+
+__all__ = ["StageTimer", "profiling_from_env"]
@@ -0,0 +1,194 @@
+"""Member-node connectivity in compressed sparse row form.
+
+Node ids are mapped to dense indices 0..N-1 in analytical_nodes order.
+member_ends holds the two node indices of each member (-1 for a missing
+end); node_offsets/node_members list the members incident to each node
+(node n owns node_members[node_offsets[n]:node_offsets[n + 1]]), one
+entry per member even when both ends share the node.
+
+Queries: connected components (members joined through shared nodes),
+node valence, dangling members (an end without a node or on a node no
+other member uses) and duplicate members (same unordered node pair).
+ConnectivityGraph.to_dict() is the export's optional "topology" section.
+"""
+from array import array
+
+
+class ConnectivityGraph(object):
+    """Dense-index CSR graph of members and nodes.
+
+    Fill it with add_member (or tee over a record stream), then query;
+    the CSR arrays are built on first use.
+    """
+
+    def __init__(self, node_ids):
+        self.node_ids = list(node_ids)
+        self.index = dict((nid, n) for n, nid in enumerate(self.node_ids))
+        self.member_ids = []
+        self.member_ends = array("i")
+        self.node_offsets = None
+        self.node_members = None
+
+    @classmethod
+    def from_result(cls, result):
+        graph = cls(n.id for n in result.analytical_nodes)
+        for record in result.analytical_members:
+            graph.add_member(record)
+        return graph
+
+    def add_member(self, record):
+        index = self.index
+        self.member_ids.append(record.id)
+        self.member_ends.append(index.get(record.node_i, -1) if record.node_i is not None else -1)
+        self.member_ends.append(index.get(record.node_j, -1) if record.node_j is not None else -1)
+        self.node_offsets = None
+
+    def tee(self, records):
+        """Pass records through, adding each one."""
+        for record in records:
+            self.add_member(record)
+            yield record
+
+    def build(self):
+        """Fill node_offsets/node_members from member_ends (counting sort)."""
+        n_nodes = len(self.node_ids)
+        ends = self.member_ends
+        counts = array("i", [0]) * (n_nodes + 1)
+        for m in range(len(self.member_ids)):
+            a = ends[2 * m]
+            b = ends[2 * m + 1]
+            if a >= 0:
+                counts[a + 1] += 1
+            if b >= 0 and b != a:
+                counts[b + 1] += 1
+        for n in range(n_nodes):
+            counts[n + 1] += counts[n]
+        offsets = array("i", counts)
+        fill = array("i", counts)
+        members = array("i", [0]) * offsets[n_nodes]
+        for m in range(len(self.member_ids)):
+            a = ends[2 * m]
+            b = ends[2 * m + 1]
+            if a >= 0:
+                members[fill[a]] = m
+                fill[a] += 1
+            if b >= 0 and b != a:
+                members[fill[b]] = m
+                fill[b] += 1
+        self.node_offsets = offsets
+        self.node_members = members
+        return self
+
+    def _csr(self):
+        if self.node_offsets is None:
+            self.build()
+        return self.node_offsets, self.node_members
+
+    def valence(self, n=None):
+        """Members at dense node n, or an array of all node valences."""
+        offsets, _ = self._csr()
+        if n is not None:
+            return offsets[n + 1] - offsets[n]
+        return array("i", (offsets[k + 1] - offsets[k] for k in range(len(self.node_ids))))
+
+    def members_at(self, n):
+        offsets, members = self._csr()
+        return members[offsets[n]:offsets[n + 1]]
+
+    def components(self):
+        """(labels, count): component label per member, -1 for members with no node."""
+        offsets, incident = self._csr()
+        ends = self.member_ends
+        labels = array("i", [-1]) * len(self.member_ids)
+        count = 0
+        for start in range(len(self.member_ids)):
+            if labels[start] != -1 or (ends[2 * start] < 0 and ends[2 * start + 1] < 0):
+                continue
+            labels[start] = count
+            stack = [start]
+            while stack:
+                m = stack.pop()
+                for node in (ends[2 * m], ends[2 * m + 1]):
+                    if node < 0:
+                        continue
+                    for k in range(offsets[node], offsets[node + 1]):
+                        other = incident[k]
+                        if labels[other] == -1:
+                            labels[other] = count
+                            stack.append(other)
+            count += 1
+        return labels, count
+
+    def dangling_members(self):
+        """Dense indices of members with an end missing or on a node of valence 1."""
+        offsets, _ = self._csr()
+        ends = self.member_ends
+        out = []
+        for m in range(len(self.member_ids)):
+            for node in (ends[2 * m], ends[2 * m + 1]):
+                if node < 0 or offsets[node + 1] - offsets[node] == 1:
+                    out.append(m)
+                    break
+        return out
+
+    def duplicate_members(self):
+        """Lists of dense member indices sharing an unordered node pair."""
+        ends = self.member_ends
+        pairs = {}
+        for m in range(len(self.member_ids)):
+            a = ends[2 * m]
+            b = ends[2 * m + 1]
+            if a < 0 or b < 0:
+                continue
+            pairs.setdefault((a, b) if a <= b else (b, a), []).append(m)
+        return [group for group in pairs.values() if len(group) > 1]
+
+    def summary(self):
+        _, count = self.components()
+        return "Topology: {} nodes, {} members, {} components, {} dangling members, {} duplicate pairs".format(
+            len(self.node_ids), len(self.member_ids), count, len(self.dangling_members()),
+            len(self.duplicate_members()))
+
+    def to_dict(self):
+        offsets, incident = self._csr()
+        ids = self.member_ids
+        node_ids = self.node_ids
+        labels, count = self.components()
+        sizes = [0] * count
+        for label in labels:
+            if label >= 0:
+                sizes[label] += 1
+        # largest component first; the rest are floating substructures
+        order = sorted(range(count), key=lambda c: (-sizes[c], c))
+        rank = dict((c, r) for r, c in enumerate(order))
+        floating = [[] for _ in order[1:]]
+        for m, label in enumerate(labels):
+            if label >= 0 and rank[label] > 0:
+                floating[rank[label] - 1].append(ids[m])
+        valence = self.valence()
+        histogram = {}
+        for v in valence:
+            histogram[v] = histogram.get(v, 0) + 1
+        return {
+            "nodes": len(node_ids),
+            "members": len(ids),
+            "components": count,
+            "component_sizes": [sizes[c] for c in order],
+            "floating_members": floating,
+            "isolated_nodes": [node_ids[n] for n, v in enumerate(valence) if v == 0],
+            "valence_histogram": dict((str(v), histogram[v]) for v in sorted(histogram)),
+            "dangling_members": [ids[m] for m in self.dangling_members()],
+            "duplicate_members": [
+                [node_ids[self.member_ends[2 * g[0]]], node_ids[self.member_ends[2 * g[0] + 1]], [ids[m] for m in g]]
+                for g in self.duplicate_members()
+            ],
+            "csr": {
+                "node_ids": node_ids,
+                "member_ends": list(self.member_ends),
+                "node_offsets": list(offsets),
+                "node_members": list(incident),
+            },
+        }
+
+
+__all__ = ["ConnectivityGraph"]
@@ -1,9 +1,21 @@
 import os
+import sys
+import time
+import atexit
 import datetime
+import collections
 
-from Autodesk.Revit.DB import UnitUtils, UnitTypeId
+try:
+    from Autodesk.Revit.DB import UnitUtils, UnitTypeId
+except Exception:  # allow outside Revit
+    UnitUtils = UnitTypeId = object
 
-UNIT_OUT = "meters"  # or feet
+try:  # optional, only used by the bulk array path
+    import numpy as np
+except Exception:
+    np = None
+
+UNIT_OUT = "meters"  # default output unit, see UnitScale
 SNAP_TOLERANCE_METERS = 0.015  # 15mm
 HOST_MATCH_TOL_METERS = 0.05   # 50mm
 
@@ -76,11 +88,159 @@ def ensure_output_dir(custom_path=None):
     return chosen
 
 
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+_LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+_LEVEL_TAGS = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+
+def level_from_env(default=INFO):
+    """REVIT_ANALYTICAL_LOG_LEVEL (debug/info/warning/error) or default."""
+    name = (os.environ.get("REVIT_ANALYTICAL_LOG_LEVEL") or "").strip().lower()
+    return _LEVELS.get(name, default)
+
+
+class RunLogger(object):
+    """Buffered, levelled log writer.
+
+    Lines below `level` are dropped, except debug lines which always land
+    in an in-memory ring (last `ring_size`) for post-mortem dumps. The file
+    buffer is written once it holds `flush_lines` lines, when
+    `flush_seconds` passed since the last write, and on flush()/close().
+    With echo, emitted lines are also printed (console-only when path is None).
+    """
+
+    def __init__(self, path=None, level=None, echo=False, prefix="",
+                 flush_lines=500, flush_seconds=2.0, ring_size=1000):
+        self.path = path
+        self.level = level_from_env() if level is None else level
+        self.echo = echo
+        self.prefix = prefix
+        self.flush_lines = flush_lines
+        self.flush_seconds = flush_seconds
+        self.ring = collections.deque(maxlen=ring_size)
+        self._buffer = []
+        self._last_flush = time.time()
+
+    def is_enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, msg, *args):
+        now = time.time()
+        if level == DEBUG:
+            # keep the raw args; formatting is deferred until dumped
+            self.ring.append((now, msg, args))
+        if level < self.level:
+            return
+        if args:
+            msg = msg.format(*args)
+        if self.echo:
+            try:
+                print(self.prefix + msg)
+            except Exception:
+                pass
+        if self.path:
+            ts = datetime.datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+            if level == INFO:
+                self._buffer.append("[{}] {}\n".format(ts, msg))
+            else:
+                self._buffer.append("[{}] {}: {}\n".format(ts, _LEVEL_TAGS.get(level, level), msg))
+            if len(self._buffer) >= self.flush_lines or now - self._last_flush >= self.flush_seconds:
+                self.flush()
+
+    def debug(self, msg, *args):
+        self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(ERROR, msg, *args)
+
+    def flush(self):
+        self._last_flush = time.time()
+        if not self._buffer or not self.path:
+            self._buffer = []
+            return
+        lines = self._buffer
+        self._buffer = []
+        try:
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+        except Exception as ex:
+            try:
+                sys.stderr.write("log write failed ({}): {}\n".format(self.path, ex))
+            except Exception:
+                pass
+
+    def close(self):
+        self.flush()
+
+    def recent_debug(self):
+        """Ring contents as formatted lines (oldest first)."""
+        out = []
+        for ts, msg, args in list(self.ring):
+            try:
+                text = msg.format(*args) if args else msg
+            except Exception:
+                text = "{} {}".format(msg, args)
+            out.append("[{}] {}".format(datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"), text))
+        return out
+
+    def dump_debug(self, path=None):
+        """Write the debug ring next to the log (or to path); returns path."""
+        if path is None:
+            if not self.path:
+                return None
+            path = os.path.splitext(self.path)[0] + ".debug.log"
+        with open(path, "w") as f:
+            for line in self.recent_debug():
+                f.write(line + "\n")
+        return path
+
+
+_LOGGERS = {}
+
+
+def get_logger(target=None, **options):
+    """Shared RunLogger for a log path (a RunLogger passes through).
+
+    level/echo/prefix given here are applied on every call, so a later
+    caller can change them on the shared logger; omitted ones are kept.
+    """
+    if isinstance(target, RunLogger):
+        return target
+    logger = _LOGGERS.get(target)
+    if logger is None:
+        logger = RunLogger(path=target, **options)
+        _LOGGERS[target] = logger
+        return logger
+    if "level" in options:
+        level = options["level"]
+        logger.level = level_from_env() if level is None else level
+    if "echo" in options:
+        logger.echo = options["echo"]
+    if "prefix" in options:
+        logger.prefix = options["prefix"]
+    return logger
+
+
+def flush_loggers():
+    for logger in list(_LOGGERS.values()):
+        logger.flush()
+
+
+atexit.register(flush_loggers)
+
+
 def log_msg(msg, logfile):
-    """Append timestamped line."""
-    ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(logfile, "a") as f:
-        f.write("[{}] {}\n".format(ts, msg))
+    """Append timestamped line (buffered, see RunLogger)."""
+    get_logger(logfile).info(msg)
 
 
 def eid_to_int(eid):
@@ -105,20 +265,115 @@ def eid_positive(eid):
     return v is not None and v > 0
 
 
-def xyz_to_out(xyz):
+# Output unit -> (UnitTypeId name, units per internal foot)
+_UNITS = {
+    "meters": ("Meters", 0.3048),
+    "centimeters": ("Centimeters", 30.48),
+    "millimeters": ("Millimeters", 304.8),
+    "feet": ("Feet", 1.0),
+    "inches": ("Inches", 12.0),
+}
+
+
+def _internal_factor(unit_name):
+    """Units per internal foot; asks UnitUtils once, constant outside Revit."""
+    type_name, fallback = _UNITS[unit_name]
+    try:
+        return float(UnitUtils.ConvertFromInternalUnits(1.0, getattr(UnitTypeId, type_name)))
+    except Exception:
+        return fallback
+
+
+_WARNED_UNITS = set()
+
+
+def _env_unit():
+    """REVIT_ANALYTICAL_UNITS (else UNIT_OUT); an unknown name warns once and gives meters."""
+    name = (os.environ.get("REVIT_ANALYTICAL_UNITS") or UNIT_OUT).strip().lower()
+    if name in _UNITS:
+        return name
+    if name not in _WARNED_UNITS:
+        _WARNED_UNITS.add(name)
+        try:
+            sys.stderr.write("REVIT_ANALYTICAL_UNITS={} is not supported (use one of {}); using meters\n".format(
+                name, ", ".join(sorted(_UNITS))))
+        except Exception:
+            pass
+    return "meters"
+
+
+class UnitScale(object):
+    """Linear internal (feet) <-> output unit factors for one run.
+
+    Resolved once so coordinate conversion is plain multiplication
+    instead of a UnitUtils interop call per axis.
+    """
+
+    def __init__(self, name=None):
+        if name:
+            name = name.strip().lower()
+            if name not in _UNITS:
+                raise ValueError("Unsupported output unit: {} (use one of {})".format(name, ", ".join(sorted(_UNITS))))
+        else:
+            name = _env_unit()
+        self.name = name
+        self.factor = 1.0 if name == "feet" else _internal_factor(name)
+        m_per_ft = self.factor if name == "meters" else _internal_factor("meters")
+        self.internal_per_meter = 1.0 / m_per_ft
+
+    def xyz(self, xyz):
+        """XYZ to [x, y, z] in out units."""
+        f = self.factor
+        return [xyz.X * f, xyz.Y * f, xyz.Z * f]
+
+    def points(self, pts):
+        """XYZ (or x, y, z sequences) to list of [x, y, z] in one pass."""
+        f = self.factor
+        out = []
+        append = out.append
+        for p in pts:
+            try:
+                append([p.X * f, p.Y * f, p.Z * f])
+            except AttributeError:
+                append([p[0] * f, p[1] * f, p[2] * f])
+        return out
+
+    def array(self, coords):
+        """Scale a coordinate array in one call.
+
+        A NumPy array comes back as a NumPy array; a flat float sequence
+        (list, array('d')) as a flat list, multiplied by NumPy when it is
+        importable.
+        """
+        if np is not None:
+            if isinstance(coords, np.ndarray):
+                return coords * self.factor
+            return (np.asarray(coords, dtype=float) * self.factor).tolist()
+        f = self.factor
+        return [c * f for c in coords]
+
+    def meters_to_internal(self, val_m):
+        return val_m * self.internal_per_meter
+
+
+_DEFAULT_SCALE = []
+
+
+def default_unit_scale():
+    """Shared UnitScale for UNIT_OUT (legacy helpers)."""
+    if not _DEFAULT_SCALE:
+        _DEFAULT_SCALE.append(UnitScale(UNIT_OUT))
+    return _DEFAULT_SCALE[0]
+
+
+def xyz_to_out(xyz, scale=None):
     """XYZ to list in out units."""
-    if UNIT_OUT.lower() == "meters":
-        return [
-            UnitUtils.ConvertFromInternalUnits(xyz.X, UnitTypeId.Meters),
-            UnitUtils.ConvertFromInternalUnits(xyz.Y, UnitTypeId.Meters),
-            UnitUtils.ConvertFromInternalUnits(xyz.Z, UnitTypeId.Meters),
-        ]
-    return [xyz.X, xyz.Y, xyz.Z]
+    return (scale or default_unit_scale()).xyz(xyz)
 
 
 def meters_to_internal(val_m):
     """Meters to internal units."""
-    return UnitUtils.ConvertToInternalUnits(val_m, UnitTypeId.Meters)
+    return default_unit_scale().meters_to_internal(val_m)
 
 
 def model_name(document):
@@ -138,6 +393,7 @@ def model_name(document):
 
 __all__ = [
     "UNIT_OUT", "SNAP_TOLERANCE_METERS", "HOST_MATCH_TOL_METERS",
-    "ensure_output_dir", "log_msg", "eid_to_int", "eid_positive",
-    "xyz_to_out", "meters_to_internal", "model_name"
+    "ensure_output_dir", "DEBUG", "INFO", "WARNING", "ERROR", "RunLogger", "get_logger",
+    "flush_loggers", "level_from_env", "log_msg", "eid_to_int", "eid_positive",
+    "UnitScale", "default_unit_scale", "xyz_to_out", "meters_to_internal", "model_name"
 ]
@@ -0,0 +1,18 @@
+"""pytest setup: make lib/revitio importable (plain CPython, no Revit).
+
+The fake Revit API from benchmarks/fakerevit.py is installed before any
+revitio import, so exporter tests can run on synthetic models.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB = os.path.join(ROOT, "lib")
+BENCHMARKS = os.path.join(ROOT, "benchmarks")
+for _p in (BENCHMARKS, LIB):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import fakerevit  # noqa: E402
+
+fakerevit.install()
@@ -0,0 +1,60 @@
+"""Manifest parsing and cloud path handling for revitio.batch."""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import fakerevit as fr
+from revitio.batch import read_manifest, is_cloud_path, open_model, BatchExport
+
+
+class ReadManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.absolute = os.path.join(self.dir, "abs", "b.rvt")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as fp:
+            fp.write(text)
+        return path
+
+    def test_text_manifest_joins_only_relative_file_paths(self):
+        path = self.write("models.txt", "\n".join([
+            "# comment", "", "sub/a.rvt", self.absolute, "RSN://srv/proj/model.rvt",
+            "BIM 360://Project/model.rvt",
+        ]))
+        self.assertEqual([e["path"] for e in read_manifest(path)], [
+            os.path.join(self.dir, "sub/a.rvt"), self.absolute, "RSN://srv/proj/model.rvt",
+            "BIM 360://Project/model.rvt",
+        ])
+
+    def test_json_manifest_entries(self):
+        path = self.write("models.json", json.dumps({"models": [
+            {"path": "a.rvt", "output_dir": "out"}, "RSN://srv/b.rvt", {"path": None},
+            {"path": "c.rvt", "output_dir": self.absolute},
+        ]}))
+        self.assertEqual(read_manifest(path), [
+            {"path": os.path.join(self.dir, "a.rvt"), "output_dir": os.path.join(self.dir, "out")},
+            {"path": "RSN://srv/b.rvt", "output_dir": None},
+            {"path": os.path.join(self.dir, "c.rvt"), "output_dir": self.absolute},
+        ])
+
+    def test_cloud_paths_are_rejected(self):
+        self.assertTrue(is_cloud_path("BIM 360://Project/model.rvt"))
+        self.assertTrue(is_cloud_path("Autodesk Docs://Project/model.rvt"))
+        self.assertFalse(is_cloud_path("RSN://srv/proj/model.rvt"))
+        self.assertFalse(is_cloud_path(self.absolute))
+        app = fr.Application()
+        with self.assertRaises(ValueError):
+            open_model(app, "BIM 360://Project/model.rvt")
+        batch = BatchExport(app, ["BIM 360://Project/model.rvt"], output_dir=os.path.join(self.dir, "out"))
+        record, = batch.run()
+        self.assertEqual(record["status"], "failed")
+        self.assertIn("cloud model paths", record["error"])
+
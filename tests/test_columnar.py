@@ -0,0 +1,111 @@
+"""The .rvcol round trip rebuilds the ExportResult, optional sections included."""
+import os
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+
+from revitio.columnar import write_columnar, load_columnar
+from revitio import utils
+from revitio.consolidate import consolidate
+from revitio.nodes import NodeIndex
+from revitio.topology import ConnectivityGraph
+from revitio.models import (
+    Node, LineGeom, LocalAxes, MemberRecord, ExportCounts, ExportResult,
+)
+
+XYZ = namedtuple("XYZ", "X Y Z")
+
+TOL = 0.05
+POINTS = [(1, XYZ(0.0, 0.0, 0.0)), (2, XYZ(10.0, 0.0, 0.0)), (3, XYZ(10.01, 0.0, 0.0)), (4, XYZ(10.0, 10.0, 0.0))]
+ENDS = [
+    (XYZ(0.0, 0.0, 0.0), XYZ(10.0, 0.0, 0.0)),
+    (XYZ(10.01, 0.0, 0.0), XYZ(10.0, 10.0, 0.0)),
+    (XYZ(10.0, 10.0, 0.0), XYZ(20.0, 10.0, 0.0)),  # orphan end -> virtual node
+    (XYZ(30.0, 0.0, 0.0), XYZ(30.0, 0.0, 5.0)),    # floating member
+    None,                                           # no curve
+]
+
+
+def sample_result():
+    index = NodeIndex(TOL)
+    for nid, pt in POINTS:
+        index.add(nid, pt)
+    consolidation = consolidate(index, ENDS, TOL)
+    nodes = consolidation.nodes(
+        [Node(id=nid, unique_id="n{}".format(nid), position=[pt.X, pt.Y, pt.Z], units="feet") for nid, pt in POINTS],
+        1.0, "feet")
+    members = []
+    for n, ends in enumerate(ENDS):
+        mid = 100 + n
+        if ends is None:
+            members.append(MemberRecord(mid, "m{}".format(mid), None, None, None, "feet", "no_curve",
+                                        None, None, None))
+            continue
+        node_i, node_j = consolidation.node_ids(n)
+        members.append(MemberRecord(
+            mid, "m{}".format(mid), node_i, node_j,
+            LineGeom(list(ends[0]), list(ends[1]), units="feet"), "feet", "ok", None, None, None,
+            local_axes=LocalAxes([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]),
+            cross_section_rotation_rad=0.0,
+        ))
+    return ExportResult(
+        model="Sample", exported_at="2026-01-01 00:00:00", units="feet", snap_tolerance_m=0.015,
+        counts=ExportCounts(members_total=len(members), nodes_seen=len(POINTS)),
+        analytical_nodes=nodes, analytical_members=members,
+        node_consolidation=consolidation.to_dict(0.015),
+    )
+
+
+class ColumnarRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "sample.rvcol")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def round_trip(self, result):
+        write_columnar(result, self.path)
+        return load_columnar(self.path)
+
+    def test_plain_export(self):
+        result = sample_result()
+        result.node_consolidation = None
+        loaded = self.round_trip(result)
+        self.assertIsNone(loaded.node_consolidation)
+        self.assertEqual(loaded.to_dict(), result.to_dict())
+
+    def test_node_consolidation(self):
+        result = sample_result()
+        self.assertEqual(result.node_consolidation["merged"], [[3, 2]])
+        loaded = self.round_trip(result)
+        self.assertEqual(loaded.node_consolidation, result.node_consolidation)
+        self.assertEqual(loaded.to_dict(), result.to_dict())
+
+    def test_topology(self):
+        result = sample_result()
+        graph = ConnectivityGraph.from_result(result)
+        for topology in (graph, graph.to_dict()):  # graph object as a streamed export leaves it
+            result.topology = topology
+            loaded = self.round_trip(result)
+            self.assertEqual(loaded.topology, graph.to_dict())
+            self.assertEqual(list(loaded.topology), list(graph.to_dict()))
+            self.assertEqual(loaded.to_dict(), result.to_dict())
+        self.assertEqual(loaded.topology["components"], 2)
+
+
+    def test_missing_node_is_written_as_none(self):
+        result = sample_result()
+        result.node_consolidation = None
+        result.analytical_members[0].node_j = 999
+        log_file = os.path.join(self.dir, "columnar.log")
+        write_columnar(result, self.path, log_file)
+        utils.get_logger(log_file).flush()
+        loaded = load_columnar(self.path)
+        self.assertIsNone(loaded.analytical_members[0].node_j)
+        self.assertEqual(loaded.analytical_members[0].node_i, result.analytical_members[0].node_i)
+        with open(log_file) as f:
+            self.assertIn("node 999 missing", f.read())
+        utils._LOGGERS.pop(log_file, None)
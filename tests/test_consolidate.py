@@ -0,0 +1,99 @@
+"""Node consolidation: union-find, clustering against pairwise distance, virtual nodes."""
+import random
+import unittest
+from collections import namedtuple
+
+from revitio.consolidate import UnionFind, cluster_points, consolidate
+from revitio.nodes import NodeIndex
+from revitio.models import Node
+
+XYZ = namedtuple("XYZ", "X Y Z")
+
+TOL = 0.05
+
+
+def components(uf):
+    groups = {}
+    for n in range(len(uf)):
+        groups.setdefault(uf.find(n), set()).add(n)
+    return sorted(sorted(g) for g in groups.values())
+
+
+def brute_components(points, tol):
+    """Single-linkage clusters by checking every pair."""
+    uf = UnionFind(len(points))
+    for a in range(len(points)):
+        for b in range(a):
+            d2 = sum((points[a][k] - points[b][k]) ** 2 for k in range(3))
+            if d2 <= tol * tol:
+                uf.union(a, b)
+    return components(uf)
+
+
+class UnionFindTest(unittest.TestCase):
+
+    def test_union_and_find(self):
+        uf = UnionFind(6)
+        uf.union(0, 1)
+        uf.union(2, 3)
+        uf.union(1, 3)
+        self.assertEqual(uf.union(3, 0), uf.find(2))  # already joined
+        self.assertEqual(components(uf), [[0, 1, 2, 3], [4], [5]])
+        self.assertEqual(uf.size[uf.find(0)], 4)
+
+    def test_cluster_points_matches_pairwise(self):
+        rng = random.Random(11)
+        for tol in (TOL, 0.3, 1.0):
+            points = []
+            for _ in range(400):
+                if points and rng.random() < 0.4:
+                    base = rng.choice(points)
+                    points.append(tuple(c + rng.uniform(-tol, tol) for c in base))
+                else:
+                    points.append((rng.uniform(-20, 20) * tol, rng.uniform(-20, 20) * tol, rng.uniform(0, 4) * tol))
+            self.assertEqual(components(cluster_points(points, tol)), brute_components(points, tol))
+
+    def test_chain_is_one_cluster(self):
+        points = [(k * TOL * 0.9, 0.0, 0.0) for k in range(10)]
+        self.assertEqual(components(cluster_points(points, TOL)), [list(range(10))])
+        self.assertEqual(len(components(cluster_points(points, 0))), 10)
+
+
+class ConsolidateTest(unittest.TestCase):
+
+    def run_consolidate(self, index_type):
+        points = [(1, XYZ(0.0, 0.0, 0.0)), (5, XYZ(10.0, 0.0, 0.0)), (3, XYZ(10.03, 0.0, 0.0)),
+                  (4, XYZ(10.0, 10.0, 0.0))]
+        ends = [
+            (XYZ(0.0, 0.0, 0.0), XYZ(10.0, 0.0, 0.0)),
+            (XYZ(10.03, 0.0, 0.0), XYZ(10.0, 10.0, 0.0)),
+            (XYZ(10.0, 10.0, 0.0), XYZ(20.0, 10.0, 0.0)),    # orphan end
+            (XYZ(20.02, 10.0, 0.0), XYZ(30.0, 10.0, 0.0)),   # shares it, plus its own orphan
+            None,                                            # no curve
+            (XYZ(0.0, 0.0, 0.0), None),                      # missing end
+        ]
+        if index_type is NodeIndex:
+            node_map = NodeIndex(TOL)
+            for nid, pt in points:
+                node_map.add(nid, pt)
+        else:
+            node_map = dict(points)
+        return points, consolidate(node_map, ends, TOL)
+
+    def test_merges_and_virtual_nodes(self):
+        for index_type in (NodeIndex, dict):
+            points, result = self.run_consolidate(index_type)
+            self.assertEqual(result.merged, {5: 3})
+            self.assertEqual(result.canonical, {1: 1, 5: 3, 3: 3, 4: 4})
+            self.assertEqual(result.orphan_ends, 3)
+            self.assertEqual([(v[0], v[4]) for v in result.virtual], [(-1, 2), (-2, 1)])
+            self.assertAlmostEqual(result.virtual[0][1], 20.01)
+            self.assertEqual(result.member_nodes, [(1, 3), (3, 4), (4, -1), (-1, -2), None, None])
+            self.assertEqual(result.node_ids(3), (-1, -2))
+
+            nodes = result.nodes([Node(id=nid, unique_id=str(nid), position=[p.X, p.Y, p.Z], units="feet")
+                                  for nid, p in points], 2.0, "feet")
+            self.assertEqual([n.id for n in nodes], [1, 3, 4, -1, -2])
+            self.assertEqual(nodes[-1].status, "virtual")
+            self.assertEqual(nodes[-1].position, [60.0, 20.0, 0.0])
+            self.assertEqual(result.to_dict(0.015)["merged"], [[5, 3]])
@@ -0,0 +1,104 @@
+"""ExportDiff classification and changeset on two hand-made exports."""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from revitio.diff import ExportDiff, index_export
+
+W12 = {"family_name": "W Shapes", "type_name": "W12x26", "type_id": 11}
+W14 = {"family_name": "W Shapes", "type_name": "W14x30", "type_id": 12}
+STEEL = {"primary": {"id": 5, "name": "Steel"}, "all": [{"id": 5, "name": "Steel"}]}
+
+
+def member(uid, i, j, section=W12, host_id=None, host_uid=None, material=STEEL):
+    return {
+        "id": int(uid[1:]), "unique_id": uid, "nodeI": None, "nodeJ": None, "units": "meters", "status": "ok",
+        "material": material, "section": section, "section_properties": None, "releases": None,
+        "local_axes": None, "structural_role": "Beam", "cross_section_rotation_rad": 0.0,
+        "host_id": host_id, "host_unique_id": host_uid,
+        "endpoints": {"i": list(i), "j": list(j), "units": "meters"},
+    }
+
+
+def export(members):
+    return {
+        "model": "Frame", "exported_at": "2026-01-01 00:00:00", "units": "meters", "snap_tolerance_m": 0.015,
+        "counts": {"members_total": len(members), "nodes_seen": 1},
+        "node_consolidation": {"merged": [[2, 1]], "virtual": []},
+        "analytical_nodes": [{"id": 1, "unique_id": "n1", "position": [0.0, 0.0, 0.0], "units": "meters"}],
+        "analytical_members": members,
+        "topology": {"components": 1, "csr": {"node_offsets": [0, 1]}},
+    }
+
+
+OLD = [
+    member("m1", (0, 0, 0), (6, 0, 0)),
+    member("m2", (6, 0, 0), (12, 0, 0)),
+    member("m3", (0, 0, 0), (0, 6, 0)),
+    member("m4", (0, 6, 0), (6, 6, 0), host_id=204, host_uid="h4"),
+    member("m5", (6, 6, 0), (12, 6, 0)),
+    member("m6", (0, 0, 3), (6, 0, 3)),
+]
+NEW = [
+    member("m1", (0, 0, 0), (6, 0, 0)),                       # unchanged
+    member("m2", (6, 0, 0), (12.01, 0, 0)),                   # shift within tolerance
+    member("m3", (0, 0, 0), (0, 6.5, 0)),                     # moved
+    member("m4", (0, 6, 0), (6, 6, 0), W14, 204, "h4"),       # resectioned, hosted
+    member("m5", (6, 6, 0), (12, 6, 0), W14),                 # resectioned, no host
+    member("m7", (0, 0, 6), (6, 0, 6)),                       # added; m6 removed
+]
+
+
+class ExportDiffTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.old = self.write("old.json", export(OLD))
+        self.new = self.write("new.json", export(NEW))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, data):
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as fp:
+            json.dump(data, fp)
+        return path
+
+    def test_index_keeps_only_header_scalars(self):
+        header, index = index_export(self.new)
+        self.assertEqual(sorted(header), ["counts", "exported_at", "model", "snap_tolerance_m", "units"])
+        self.assertEqual(sorted(index), ["m1", "m2", "m3", "m4", "m5", "m7"])
+
+    def test_classification(self):
+        diff = ExportDiff(self.old, self.new)
+        self.assertAlmostEqual(diff.tolerance, 0.015)
+        self.assertEqual(diff.added, ["m7"])
+        self.assertEqual(diff.removed, ["m6"])
+        self.assertEqual([uid for uid, _ in diff.moved], ["m3"])
+        self.assertAlmostEqual(diff.moved[0][1], 0.5)
+        self.assertEqual([uid for uid, _, _ in diff.resectioned], ["m4", "m5"])
+        self.assertEqual(diff.counts(), {
+            "added": 1, "removed": 1, "moved": 1, "resectioned": 2,
+            "rematerialed": 0, "rereleased": 0, "unchanged": 2,
+        })
+        # a wider tolerance swallows the move
+        self.assertEqual(ExportDiff(self.old, self.new, tolerance=1.0).moved, [])
+
+    def test_changeset_has_hosted_resections_only(self):
+        diff = ExportDiff(self.old, self.new)
+        path = os.path.join(self.dir, "changeset.json")
+        self.assertEqual(diff.write_changeset(path), 1)
+        with open(path) as fp:
+            data = json.load(fp)
+        self.assertEqual(data, {"analytical_members": [
+            {"id": 4, "unique_id": "m4", "host_id": 204, "host_unique_id": "h4", "section": W14},
+        ]})
+
+    def test_units_must_match(self):
+        data = export(NEW)
+        data["units"] = "feet"
+        with self.assertRaises(ValueError):
+            ExportDiff(self.old, self.write("feet.json", data))
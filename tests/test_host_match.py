@@ -0,0 +1,113 @@
+"""BatchHostMatcher against HostMatchIndex.match and the collector scan on a synthetic frame."""
+import random
+import shutil
+import tempfile
+import unittest
+
+import fakerevit as fr
+import synthetic
+from revitio import host_match
+from revitio.host_match import HostMatchIndex, BatchHostMatcher, find_physical_host_for_member
+from revitio.members_exporter import ExportAnalyticalModel
+from revitio.utils import meters_to_internal, HOST_MATCH_TOL_METERS
+
+TOL_FT = meters_to_internal(HOST_MATCH_TOL_METERS)
+
+
+def frame_with_ties():
+    """Frame plus exact duplicates of a few beams and two hosts equally far from a probe line."""
+    doc = synthetic.build_frame(3, 2, 2, seed=3)
+    framing = fr.BuiltInCategory.OST_StructuralFraming
+    beams = [e for e in doc.elements() if isinstance(e, fr.FamilyInstance) and e.category is framing]
+    for host in beams[:4]:
+        curve = host.Location.Curve
+        fr.FamilyInstance(doc, host.Symbol, fr.Line.CreateBound(curve.GetEndPoint(0), curve.GetEndPoint(1)), framing)
+    sym = beams[0].Symbol
+    # binary fractions so both scores are exactly equal; the later one in the document loses
+    for y in (-0.0625, 0.0625):
+        fr.FamilyInstance(doc, sym, fr.Line.CreateBound(fr.XYZ(100.0, y, 0.0), fr.XYZ(120.0, y, 0.0)), framing)
+    return doc
+
+
+def queries(doc, rng):
+    out = [(fr.XYZ(100.0, 0.0, 0.0), fr.XYZ(120.0, 0.0, 0.0)), (fr.XYZ(1.0, 1.0, 1.0), fr.XYZ(1.0, 1.0, 1.0))]
+    for m in doc.elements():
+        if not isinstance(m, fr.AnalyticalMember):
+            continue
+        a, b = m.GetCurve().GetEndPoint(0), m.GetCurve().GetEndPoint(1)
+        out.append((a, b))
+        for _ in range(3):
+            r = rng.choice((0.5, 2.0, 4.0)) * TOL_FT
+            out.append((
+                fr.XYZ(a.X + rng.uniform(-r, r), a.Y + rng.uniform(-r, r), a.Z + rng.uniform(-r, r)),
+                fr.XYZ(b.X + rng.uniform(-r, r), b.Y + rng.uniform(-r, r), b.Z + rng.uniform(-r, r)),
+            ))
+    return out
+
+
+def host_id(host):
+    return None if host is None else host.Id.Value
+
+
+class BatchHostMatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.np = host_match.np
+        self.doc = frame_with_ties()
+        self.index = HostMatchIndex.from_document(self.doc)
+        self.ends = queries(self.doc, random.Random(9))
+        self.expected = [host_id(self.index.match((a.X, a.Y, a.Z), (b.X, b.Y, b.Z))) for a, b in self.ends]
+
+    def tearDown(self):
+        host_match.np = self.np
+
+    def test_index_matches_collector_scan(self):
+        scanned = [host_id(find_physical_host_for_member(self.doc, a, b)) for a, b in self.ends]
+        self.assertEqual(scanned, self.expected)
+        self.assertGreater(sum(h is not None for h in self.expected), len(self.expected) // 3)
+
+    def test_ties_go_to_first_indexed(self):
+        probe = self.expected[0]
+        framing = [e for e in self.doc.elements() if isinstance(e, fr.FamilyInstance)
+                   and e.category is fr.BuiltInCategory.OST_StructuralFraming]
+        self.assertEqual(probe, framing[-2].Id.Value)
+        batch = BatchHostMatcher(self.index).match_many(self.ends[:1])
+        self.assertEqual(host_id(batch[0]), probe)
+        beam = framing[0].Location.Curve
+        a, b = beam.GetEndPoint(0), beam.GetEndPoint(1)
+        self.assertEqual(host_id(BatchHostMatcher(self.index).match_many([(a, b)])[0]), framing[0].Id.Value)
+
+    def test_numpy_matches_index(self):
+        matcher = BatchHostMatcher(self.index, chunk_size=97)
+        self.assertTrue(matcher.use_numpy)
+        self.assertEqual([host_id(h) for h in matcher.match_many(self.ends)], self.expected)
+        flat = [(a.X, a.Y, a.Z, b.X, b.Y, b.Z) for a, b in self.ends] + [(float("nan"),) * 6]
+        self.assertEqual([host_id(h) for h in matcher.match_array(flat)], self.expected + [None])
+        skip = [n % 2 == 1 for n in range(len(flat))]
+        self.assertEqual([host_id(h) for h in matcher.match_array(flat, skip=skip)],
+                         [None if s else e for s, e in zip(skip, self.expected + [None])])
+
+    def test_without_numpy(self):
+        self.assertEqual([host_id(h) for h in BatchHostMatcher(self.index, use_numpy=False).match_many(self.ends)],
+                         self.expected)
+        host_match.np = None
+        matcher = BatchHostMatcher(self.index)
+        self.assertFalse(matcher.use_numpy)
+        self.assertEqual([host_id(h) for h in matcher.match_many(self.ends)], self.expected)
+
+    def test_export_same_with_and_without_numpy(self):
+        out = tempfile.mkdtemp()
+        try:
+            def run():
+                exporter = ExportAnalyticalModel(self.doc, output_dir=out, stream=False, snapshot=False,
+                                                 incremental=False, profile=True)
+                d = exporter.export().to_dict()
+                d.pop("exported_at")
+                return d, exporter.timer.counters
+            batched, counters = run()
+            self.assertGreater(counters.get("host_direct", 0), 0)
+            self.assertGreater(counters.get("host_heuristic", 0), 0)
+            host_match.np = None
+            self.assertEqual(run()[0], batched)
+        finally:
+            shutil.rmtree(out)
@@ -0,0 +1,94 @@
+"""Incremental re-export on a synthetic frame matches a fresh full export."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import fakerevit as fr
+import synthetic
+from revitio.members_exporter import ExportAnalyticalModel
+
+FT_PER_M = 1.0 / 0.3048
+
+
+def export(doc, out, incremental):
+    exporter = ExportAnalyticalModel(doc, output_dir=out, stream=False, columnar=False, snapshot=False,
+                                     incremental=incremental, consolidate=False, topology=False)
+    result = exporter.export()
+    d = result.to_dict()
+    d.pop("exported_at")
+    return d, exporter.tracker
+
+
+def edit(doc):
+    """Re-type two linked hosts, move a node and a member end, rename frame_with_special's material."""
+    t = fr.Transaction(doc, "edit")
+    t.Start()
+    framing = fr.BuiltInCategory.OST_StructuralFraming
+    beam_types = [e for e in doc.elements() if isinstance(e, fr.FamilySymbol) and e.category is framing]
+    linked = [e for e in doc.elements() if isinstance(e, fr.FamilyInstance) and e.category is framing
+              and e._analytical]
+    for host in linked[:2]:
+        host.ChangeTypeId(beam_types[(beam_types.index(host.Symbol) + 1) % len(beam_types)].Id)
+    node = [e for e in doc.elements() if isinstance(e, fr.AnalyticalNode)][7]
+    p = node.Location.Point
+    node.Location.Point = fr.XYZ(p.X + 0.5, p.Y, p.Z)
+    node._touch()
+    member = [e for e in doc.elements() if isinstance(e, fr.AnalyticalMember)][-1]
+    a, b = member.GetCurve().GetEndPoint(0), member.GetCurve().GetEndPoint(1)
+    member._curve = fr.Line.CreateBound(a, fr.XYZ(b.X, b.Y, b.Z + 1.0))
+    member._touch()
+    special = [e for e in doc.elements() if isinstance(e, fr.Material) and e.Name == "Steel S355"][0]
+    special._name = "Steel S460"
+    special._touch()
+    t.Commit()
+
+
+def frame_with_special():
+    """3x3x2 frame; one member uses its own material so renaming it dirties only that one."""
+    doc = synthetic.build_frame(3, 3, 2, seed=5)
+    special = fr.Material(doc, "Steel S355")
+    [e for e in doc.elements() if isinstance(e, fr.AnalyticalMember)][4].MaterialId = special.Id
+    return doc
+
+
+class IncrementalExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.version_guid = fr.Element.VersionGuid
+
+    def tearDown(self):
+        fr.Element.VersionGuid = self.version_guid
+        shutil.rmtree(self.dir)
+
+    def check(self):
+        doc = frame_with_special()
+        inc_dir = os.path.join(self.dir, "incremental")
+        full_dir = os.path.join(self.dir, "full")
+        first, tracker = export(doc, inc_dir, True)
+        self.assertEqual(tracker.full_reason, "no previous state")
+        self.assertEqual(first, export(doc, full_dir, False)[0])
+
+        unchanged, tracker = export(doc, inc_dir, True)
+        self.assertEqual(unchanged, first)
+        self.assertEqual(tracker.reused, len(first["analytical_members"]))
+
+        edit(doc)
+        incremental, tracker = export(doc, inc_dir, True)
+        full = export(doc, full_dir, False)[0]
+        self.assertNotEqual(full, first)
+        self.assertEqual(incremental, full)
+        self.assertIsNone(tracker.full_reason)
+        self.assertGreater(tracker.reused, 0)
+        for reason in ("member", "node", "material"):
+            self.assertIn(reason, tracker.rebuilt)
+        return tracker
+
+    def test_version_guid(self):
+        self.check()
+
+    def test_parameter_hash_without_version_guid(self):
+        fr.Element.VersionGuid = property(lambda self: None)
+        self.check()
+
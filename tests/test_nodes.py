@@ -0,0 +1,144 @@
+"""NodeIndex against a brute-force linear scan on synthetic point clouds."""
+import random
+import unittest
+from collections import namedtuple
+
+from revitio.nodes import NodeIndex, find_closest_node_id, _CELL_PAD
+from revitio.utils import SNAP_TOLERANCE_METERS
+
+XYZ = namedtuple("XYZ", "X Y Z")
+
+FT_PER_M = 1.0 / 0.3048
+SNAP_FT = SNAP_TOLERANCE_METERS * FT_PER_M
+TOLERANCES = [SNAP_FT, 0.001 * FT_PER_M, 0.25 * FT_PER_M, 1.0]
+
+
+def linear_closest(pt, points, tol):
+    """The pre-index scan: last node of the closest distance within tol."""
+    best_id = None
+    best_d2 = tol * tol
+    for nid, npt in points:
+        dx = pt.X - npt.X
+        dy = pt.Y - npt.Y
+        dz = pt.Z - npt.Z
+        d2 = dx*dx + dy*dy + dz*dz
+        if d2 <= best_d2:
+            best_id = nid
+            best_d2 = d2
+    return best_id
+
+
+def build(points, tol):
+    index = NodeIndex(tol)
+    plain = {}
+    for nid, pt in points:
+        index.add(nid, pt)
+        plain[nid] = pt
+    return index, plain
+
+
+def random_cloud(rng, tol, count, extent):
+    """Clustered points: some near-coincident, some on exact cell edges."""
+    cell = tol * _CELL_PAD
+    points = []
+    for nid in range(count):
+        kind = rng.random()
+        if kind < 0.2 and points:
+            base = rng.choice(points)[1]
+            pt = XYZ(base.X + rng.uniform(-tol, tol), base.Y + rng.uniform(-tol, tol), base.Z)
+        elif kind < 0.35:
+            pt = XYZ(rng.randint(-20, 20) * cell, rng.randint(-20, 20) * cell, rng.randint(-3, 3) * cell)
+        else:
+            pt = XYZ(rng.uniform(-extent, extent), rng.uniform(-extent, extent), rng.uniform(0, extent * 0.2))
+        points.append((nid + 1, pt))
+    return points
+
+
+def queries(rng, points, tol, count, extent):
+    cell = tol * _CELL_PAD
+    out = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.5:
+            p = rng.choice(points)[1]
+            r = rng.uniform(0, 1.5 * tol)
+            out.append(XYZ(p.X + rng.uniform(-r, r), p.Y + rng.uniform(-r, r), p.Z + rng.uniform(-r, r)))
+        elif kind < 0.7:
+            # exactly tol away along an axis, on the edge of reach
+            p = rng.choice(points)[1]
+            out.append(XYZ(p.X + tol, p.Y, p.Z))
+        elif kind < 0.85:
+            out.append(XYZ(rng.randint(-20, 20) * cell, rng.randint(-20, 20) * cell, 0.0))
+        else:
+            out.append(XYZ(rng.uniform(-extent, extent), rng.uniform(-extent, extent), rng.uniform(0, extent * 0.2)))
+    return out
+
+
+class NodeIndexTest(unittest.TestCase):
+
+    def assert_same(self, points, tol, pts, query_tol=None):
+        query_tol = tol if query_tol is None else query_tol
+        index, plain = build(points, tol)
+        for pt in pts:
+            expected = linear_closest(pt, points, query_tol)
+            self.assertEqual(index.closest(pt.X, pt.Y, pt.Z, query_tol), expected, (tol, query_tol, pt))
+            self.assertEqual(find_closest_node_id(pt, index, query_tol), expected)
+            self.assertEqual(find_closest_node_id(pt, plain, query_tol), expected)
+
+    def test_random_clouds(self):
+        for seed, tol in enumerate(TOLERANCES):
+            rng = random.Random(seed)
+            extent = tol * 60
+            points = random_cloud(rng, tol, 1000, extent)
+            self.assert_same(points, tol, queries(rng, points, tol, 1500, extent))
+
+    def test_query_tolerance_wider_than_cells(self):
+        rng = random.Random(42)
+        points = random_cloud(rng, SNAP_FT, 800, SNAP_FT * 40)
+        pts = queries(rng, points, SNAP_FT, 1500, SNAP_FT * 40)
+        for factor in (0.5, 1.0, 2.5, 4.0):
+            self.assert_same(points, SNAP_FT, pts, SNAP_FT * factor)
+
+    def test_ties_keep_last_added(self):
+        # exact binary fractions so the distances compare equal
+        for tol in (0.5, 1.0, 2.0):
+            points = []
+            nid = 0
+            for x in (-0.25, 0.25):
+                for y in (-0.25, 0.25):
+                    for z in (-0.25, 0.25):
+                        nid += 1
+                        points.append((nid, XYZ(x, y, z)))
+            points.append((100, XYZ(0.25, 0.25, 0.25)))  # coincident duplicate
+            points.append((101, XYZ(-0.25, -0.25, -0.25)))
+            pts = [XYZ(0.0, 0.0, 0.0), XYZ(0.25, 0.25, 0.25), XYZ(-0.25, 0.0, 0.0), XYZ(0.0, 0.25, -0.25)]
+            self.assert_same(points, tol, pts)
+            # reversed insertion flips the tie winner in both
+            self.assert_same(list(reversed(points)), tol, pts)
+
+    def test_points_on_cell_edges(self):
+        for tol in TOLERANCES:
+            cell = tol * _CELL_PAD
+            points = [(n + 1, XYZ(i * cell, j * cell, 0.0))
+                      for n, (i, j) in enumerate((i, j) for i in range(-3, 4) for j in range(-3, 4))]
+            pts = [XYZ(i * cell * 0.5, j * cell * 0.5, k * tol) for i in range(-7, 8)
+                   for j in range(-7, 8) for k in (0, 1)]
+            self.assert_same(points, tol, pts)
+
+    def test_replaced_node_moves(self):
+        tol = SNAP_FT
+        index = NodeIndex(tol)
+        index.add(1, XYZ(0.0, 0.0, 0.0))
+        index.add(2, XYZ(10.0, 0.0, 0.0))
+        index.add(1, XYZ(20.0, 0.0, 0.0))
+        self.assertIsNone(index.closest(0.0, 0.0, 0.0, tol))
+        self.assertEqual(index.closest(20.0, 0.0, 0.0, tol), 1)
+        self.assertEqual(len(index), 2)
+
+    def test_zero_tolerance_index_scans(self):
+        rng = random.Random(7)
+        points = random_cloud(rng, SNAP_FT, 300, 2.0)
+        index, _ = build(points, 0)
+        for pt in queries(rng, points, SNAP_FT, 500, 2.0):
+            self.assertEqual(index.closest(pt.X, pt.Y, pt.Z, SNAP_FT), linear_closest(pt, points, SNAP_FT))
+
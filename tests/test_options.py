@@ -0,0 +1,64 @@
+"""ExportOptions: environment fallback, overrides and rejected combinations."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import synthetic
+from revitio.options import ExportOptions, ENV_VARS
+from revitio.members_exporter import ExportAnalyticalModel
+
+
+class ExportOptionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = dict((var, os.environ.pop(var, None)) for _, var in ENV_VARS)
+
+    def tearDown(self):
+        for var, value in self.env.items():
+            os.environ.pop(var, None)
+            if value is not None:
+                os.environ[var] = value
+
+    def test_environment_fills_unset_flags(self):
+        os.environ["REVIT_ANALYTICAL_STREAM"] = "1"
+        os.environ["REVIT_ANALYTICAL_COMPACT"] = "no"
+        os.environ["REVIT_ANALYTICAL_TOPOLOGY"] = " True "
+        options = ExportOptions(topology=False)
+        self.assertTrue(options.stream)
+        self.assertFalse(options.compact)
+        self.assertFalse(options.topology)  # argument wins over the variable
+        self.assertEqual(sorted(options.to_dict()), sorted(name for name, _ in ENV_VARS))
+
+    def test_resolve_overrides(self):
+        base = ExportOptions(stream=True, columnar=True)
+        merged = ExportOptions.resolve(base, columnar=False, topology=True, compact=None)
+        self.assertEqual((merged.stream, merged.columnar, merged.topology, merged.compact), (True, False, True, False))
+        self.assertTrue(base.columnar)
+        with self.assertRaises(TypeError):
+            ExportOptions.resolve(base, streaming=True)
+
+    def test_snapshot_rejects_export_flags(self):
+        ExportOptions(snapshot=True, profile=True)
+        for name in ("stream", "columnar", "incremental", "compact", "consolidate", "topology"):
+            with self.assertRaises(ValueError) as ctx:
+                ExportOptions(snapshot=True, **{name: True})
+            self.assertIn(name, str(ctx.exception))
+        os.environ["REVIT_ANALYTICAL_INCREMENTAL"] = "1"
+        with self.assertRaises(ValueError):
+            ExportOptions(snapshot=True)
+
+    def test_exporter_takes_options_object(self):
+        out = tempfile.mkdtemp()
+        try:
+            doc = synthetic.build_frame(1, 1, 1)
+            options = ExportOptions(stream=True, compact=True, columnar=True)
+            exporter = ExportAnalyticalModel(doc, output_dir=out, options=options, columnar=False)
+            self.assertEqual((exporter.stream, exporter.compact, exporter.columnar), (True, True, False))
+            exporter.export()
+            self.assertEqual(sorted(os.path.splitext(f)[1] for f in os.listdir(out) if f.startswith("members_")),
+                             [".json"])
+            with self.assertRaises(ValueError):
+                ExportAnalyticalModel(doc, output_dir=out, snapshot=True, incremental=True)
+        finally:
+            shutil.rmtree(out)
@@ -0,0 +1,92 @@
+"""SymbolIndex lookups, the rename check and the session cache on a synthetic frame."""
+import unittest
+
+import fakerevit as fr
+import synthetic
+from revitio import symbols
+from revitio.symbols import SymbolIndex, symbol_index, clear_session, get_type_name
+
+
+def framing_types(doc):
+    framing = fr.BuiltInCategory.OST_StructuralFraming
+    return [e for e in doc.elements() if isinstance(e, fr.FamilySymbol) and e.category is framing]
+
+
+def rename(doc, sym, name):
+    t = fr.Transaction(doc, "rename")
+    t.Start()
+    sym.set_param(fr.BuiltInParameter.SYMBOL_NAME_PARAM, name)
+    sym._name = name
+    sym._touch()
+    t.Commit()
+
+
+class SymbolIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_session()
+        self.doc = synthetic.build_frame(1, 1, 1)
+        self.sym = framing_types(self.doc)[1]  # W Shapes :: W14x30
+        self.version_guid = fr.Element.VersionGuid
+
+    def tearDown(self):
+        fr.Element.VersionGuid = self.version_guid
+        clear_session()
+
+    def test_lookup_order(self):
+        index = SymbolIndex(self.doc)
+        sid = self.sym.Id.Value
+        self.assertEqual(index.lookup("W Shapes", "W14x30", sid), (self.sym, "type_id"))
+        self.assertEqual(index.lookup("", "", sid), (self.sym, "type_id"))
+        self.assertEqual(index.lookup("W Shapes", "W14x30"), (self.sym, "names"))
+        # a type id whose names disagree falls through to the names
+        self.assertEqual(index.lookup("W Shapes", "W14x30", sid + 1), (self.sym, "names"))
+        self.assertEqual(index.lookup("  w   shapes ", "w14X30 "), (self.sym, "normalized"))
+        self.assertEqual(index.lookup("W Shapes", "W99x1"), (None, None))
+        self.assertEqual(index.suggest("W Shapes", "W14x31")[0], "W Shapes :: W14x30")
+
+    def test_verify_catches_rename(self):
+        index = SymbolIndex(self.doc)
+        self.assertTrue(index._verify(self.sym))
+        other = framing_types(self.doc)[2]
+        rename(self.doc, other, "W16x99")
+        self.assertFalse(index._verify(other))
+        self.assertTrue(index.renamed)
+        # the stale name misses and rebuilds; the new one is then found
+        self.assertEqual(index.lookup("W Shapes", "W16x36"), (None, None))
+        self.assertEqual(index.rebuilds, 1)
+        self.assertEqual(index.lookup("W Shapes", "W16x99"), (other, "names"))
+
+    def test_session_cache_revalidates_by_version(self):
+        index, cached = symbol_index(self.doc)
+        self.assertFalse(cached)
+        rename(self.doc, self.sym, "W14x31")
+        again, cached = symbol_index(self.doc)
+        self.assertTrue(cached)
+        self.assertIs(again, index)
+        self.assertEqual(again.lookup("w shapes", "w14x31"), (self.sym, "normalized"))
+        self.assertEqual(again.lookup("W Shapes", "W14x30"), (None, None))
+        self.assertEqual(again.rebuilds, 0)
+        self.assertEqual(get_type_name(self.sym), "W14x31")
+
+    def test_session_cache_without_version_guid_rebuilds_on_miss(self):
+        fr.Element.VersionGuid = property(lambda self: None)
+        index, _ = symbol_index(self.doc)
+        self.sym.set_param(fr.BuiltInParameter.SYMBOL_NAME_PARAM, "W14x31")
+        again, cached = symbol_index(self.doc)
+        self.assertTrue(cached)
+        self.assertFalse(again.validated)
+        self.assertEqual(again.lookup("W Shapes", "W14x31"), (self.sym, "names"))
+        self.assertEqual(again.rebuilds, 1)
+
+    def test_cache_is_per_document(self):
+        index, _ = symbol_index(self.doc)
+        other = synthetic.build_frame(1, 1, 1, title=self.doc.Title)
+        other.PathName = self.doc.PathName
+        self.assertNotEqual(symbols._doc_key(other), symbols._doc_key(self.doc))
+        # same key but another document object (e.g. reopened) is not reused
+        symbols._SESSION[symbols._doc_key(other)] = index
+        fresh, cached = symbol_index(other)
+        self.assertFalse(cached)
+        self.assertIsNot(fresh, index)
+        self.assertIs(fresh.doc, other)
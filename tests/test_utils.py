@@ -0,0 +1,87 @@
+"""utils: UnitScale conversion and unit names, shared loggers."""
+import os
+import random
+import unittest
+from array import array
+
+from revitio import utils
+from revitio.utils import UnitScale
+
+
+class UnitScaleArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.flat = array("d", (rng.uniform(-500.0, 500.0) for _ in range(3 * 200)))
+        self.points = [tuple(self.flat[k:k + 3]) for k in range(0, len(self.flat), 3)]
+        self.np = utils.np
+
+    def tearDown(self):
+        utils.np = self.np
+
+    def expected(self, scale):
+        return [c for p in scale.points(self.points) for c in p]
+
+    def test_flat_sequences(self):
+        for name in ("meters", "millimeters", "feet", "inches"):
+            scale = UnitScale(name)
+            for coords in (self.flat, list(self.flat)):
+                result = scale.array(coords)
+                self.assertIsInstance(result, list)
+                self.assertEqual(result, self.expected(scale))
+
+    def test_without_numpy(self):
+        utils.np = None
+        scale = UnitScale("centimeters")
+        self.assertEqual(scale.array(self.flat), self.expected(scale))
+
+    def test_numpy_in_numpy_out(self):
+        if self.np is None:
+            self.skipTest("numpy not installed")
+        scale = UnitScale("meters")
+        result = scale.array(self.np.frombuffer(self.flat, dtype=float).reshape(-1, 3))
+        self.assertEqual(result.shape, (200, 3))
+        self.assertEqual(result.ravel().tolist(), self.expected(scale))
+
+
+
+class UnitScaleNameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = os.environ.get("REVIT_ANALYTICAL_UNITS")
+
+    def tearDown(self):
+        if self.env is None:
+            os.environ.pop("REVIT_ANALYTICAL_UNITS", None)
+        else:
+            os.environ["REVIT_ANALYTICAL_UNITS"] = self.env
+
+    def test_env_unit(self):
+        os.environ["REVIT_ANALYTICAL_UNITS"] = " Millimeters "
+        self.assertEqual(UnitScale().name, "millimeters")
+
+    def test_unknown_env_unit_falls_back_to_meters(self):
+        os.environ["REVIT_ANALYTICAL_UNITS"] = "furlongs"
+        self.assertEqual(UnitScale().name, "meters")
+
+    def test_unknown_argument_raises(self):
+        self.assertRaises(ValueError, UnitScale, "furlongs")
+
+
+class GetLoggerTest(unittest.TestCase):
+
+    def tearDown(self):
+        utils._LOGGERS.pop("test-get-logger.log", None)
+
+    def test_options_apply_on_every_call(self):
+        first = utils.get_logger("test-get-logger.log", level=utils.WARNING)
+        self.assertEqual(first.level, utils.WARNING)
+        self.assertFalse(first.echo)
+        again = utils.get_logger("test-get-logger.log", level=utils.DEBUG, echo=True)
+        self.assertIs(again, first)
+        self.assertEqual(first.level, utils.DEBUG)
+        self.assertTrue(first.echo)
+        # omitted options are left alone
+        utils.get_logger("test-get-logger.log")
+        self.assertEqual(first.level, utils.DEBUG)
+        self.assertTrue(first.echo)